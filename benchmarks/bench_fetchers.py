@@ -0,0 +1,150 @@
+"""
+Benchmarks fetcher variants against a local HydraServer stand-in.
+
+Each variant fetches the same evaluation from a synthetic jobset, or from a
+jobset recorded with `ftpvl-mirror`, served with the given latency, bandwidth,
+error rate and page size. The wall time of each variant and the number of
+requests it sent are printed, so changes to concurrency and caching can be
+compared reproducibly without a network.
+
+Run from the repository root with ftpvl installed, for example using
+`pip install -e .`:
+    python benchmarks/bench_fetchers.py --builds 200 --latency 0.05 --repeat 3
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+from ftpvl.cache import BuildCache
+from ftpvl.fetchers import AsyncHydraFetcher, HydraFetcher
+from ftpvl.mirror import HydraMirror
+from ftpvl.testing import HydraServer
+
+
+def get_variants(args: argparse.Namespace, server: HydraServer, tmpdir: str) -> Dict[str, Callable]:
+    """
+    Returns a function for each variant that fetches the evaluation.
+    """
+    common = {
+        "eval_num": args.eval_num,
+        "base_url": server.base_url,
+        "retries": 10,
+        "backoff_factor": 0.01,
+    }
+
+    def sequential():
+        HydraFetcher(args.project, args.jobset, **common).get_evaluation()
+
+    def threaded():
+        HydraFetcher(
+            args.project, args.jobset, max_workers=args.workers, **common
+        ).get_evaluation()
+
+    def asynchronous():
+        AsyncHydraFetcher(
+            args.project, args.jobset, max_concurrency=args.workers, **common
+        ).get_evaluation()
+
+    cache_path = os.path.join(tmpdir, "cache")
+
+    def cached_cold():
+        BuildCache(cache_path).clear()
+        HydraFetcher(
+            args.project, args.jobset, max_workers=args.workers,
+            cache=BuildCache(cache_path), **common
+        ).get_evaluation()
+
+    def cached_warm():
+        HydraFetcher(
+            args.project, args.jobset, max_workers=args.workers,
+            cache=BuildCache(cache_path), **common
+        ).get_evaluation()
+
+    mirror_path = os.path.join(tmpdir, "mirror")
+
+    def mirror_sync():
+        HydraMirror(
+            mirror_path, args.project, args.jobset, max_workers=args.workers,
+            retries=10, backoff_factor=0.01, base_url=server.base_url
+        ).sync()
+
+    def mirror_read():
+        HydraFetcher(
+            args.project, args.jobset, eval_num=args.eval_num, mirror=mirror_path
+        ).get_evaluation()
+
+    return {
+        "sequential": sequential,
+        f"threaded ({args.workers} workers)": threaded,
+        f"async ({args.workers} requests)": asynchronous,
+        "cache, cold": cached_cold,
+        "cache, warm": cached_warm,
+        "mirror, sync": mirror_sync,
+        "mirror, read": mirror_read,
+    }
+
+
+def run_variant(server: HydraServer, variant: Callable, repeat: int) -> List[float]:
+    """
+    Runs the variant `repeat` times and returns the wall time of each run.
+    The server statistics are reset before each run.
+    """
+    times = []
+    for _ in range(repeat):
+        server.reset_stats()
+        start = time.perf_counter()
+        variant()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark fetchers against a HydraServer.")
+    parser.add_argument("--mirror", default=None, help="replay a jobset recorded in this mirror")
+    parser.add_argument("--project", default="dusty")
+    parser.add_argument("--jobset", default="fpga-tool-perf")
+    parser.add_argument("--evals", type=int, default=5, help="number of synthetic evals")
+    parser.add_argument("--builds", type=int, default=100, help="synthetic builds per eval")
+    parser.add_argument("--eval-num", type=int, default=0, help="relative eval to fetch")
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds per response")
+    parser.add_argument("--bandwidth", type=float, default=None, help="bytes per second")
+    parser.add_argument("--error-rate", type=float, default=0, help="fraction of 503 responses")
+    parser.add_argument("--page-size", type=int, default=10, help="evals per page")
+    parser.add_argument("--workers", type=int, default=8, help="concurrent requests")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per variant")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    knobs = {
+        "latency": args.latency,
+        "bandwidth": args.bandwidth,
+        "error_rate": args.error_rate,
+        "page_size": args.page_size,
+    }
+    if args.mirror is not None:
+        server = HydraServer.from_mirror(
+            args.mirror, args.project, args.jobset, seed=args.seed, **knobs
+        )
+    else:
+        server = HydraServer.synthetic(
+            num_evals=args.evals, builds_per_eval=args.builds, seed=args.seed,
+            project=args.project, jobset=args.jobset, **knobs
+        )
+
+    print(f"{'variant':<24} {'median (s)':>10} {'min (s)':>10} {'requests':>9} {'errors':>7}")
+    with server, tempfile.TemporaryDirectory() as tmpdir:
+        for name, variant in get_variants(args, server, tmpdir).items():
+            times = run_variant(server, variant, args.repeat)
+            stats = server.get_stats()
+            requests = stats["evals"] + stats["build"] + stats["meta_json"] + stats["errors"]
+            print(
+                f"{name:<24} {statistics.median(times):>10.3f} {min(times):>10.3f}",
+                f"{requests:>9} {stats['errors']:>7}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+""" Caches store downloaded test results on disk so they are only fetched once. """
+from collections import OrderedDict
+import gzip
+import hashlib
+import json
+import lzma
+import os
+import tempfile
+import threading
+from typing import Any, Union
+
+
+def write_atomic(path: str, data: bytes) -> None:
+    """
+    Writes data to path such that readers never see a partial file: the data
+    is written to a temporary file in the same directory, which then replaces
+    path.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+class BuildCache:
+    """
+    Represents a persistent, on-disk cache of decoded JSON responses, such as
+    the build info and meta.json files of finished Hydra builds, and the evals
+    pages of a jobset along with the headers needed to revalidate them.
+
+    Entries are stored in files named by the hash of their key, optionally
+    compressed. When the total size of the entries exceeds `max_size`, the
+    least recently used entries are evicted. The cache also keeps a negative
+    cache that records keys that are known to have no usable result, such as
+    builds that failed, so that they do not need to be requested again.
+
+    Parameters
+    ----------
+    path : str
+        The directory used to store the cache. It is created if it does not
+        exist.
+    max_size : int, optional
+        The maximum total size in bytes of all entries, or None for no limit,
+        by default 256 MiB
+    compression : str, optional
+        The compression used for new entries, one of None, "gzip" or "lzma",
+        by default None
+
+    Examples
+    --------
+    >>> cache = BuildCache("~/.cache/ftpvl", compression="gzip")
+    >>> fetcher = HydraFetcher("dusty", "fpga-tool-perf", cache=cache)
+    """
+
+    _SUFFIXES = {
+        None: ".json",
+        "gzip": ".json.gz",
+        "lzma": ".json.xz",
+    }
+
+    def __init__(
+        self,
+        path: str,
+        max_size: int = 256 * 1024 * 1024,
+        compression: str = None
+    ) -> None:
+        if compression not in self._SUFFIXES:
+            raise ValueError(f"Unsupported compression {compression}.")
+
+        self.path = os.path.expanduser(path)
+        self.max_size = max_size
+        self.compression = compression
+
+        self._entries_path = os.path.join(self.path, "entries")
+        self._negative_path = os.path.join(self.path, "negative.json")
+        os.makedirs(self._entries_path, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._entries = self._scan_entries() # filename -> size, in LRU order
+        self._negative = self._load_negative()
+
+    def _scan_entries(self) -> 'OrderedDict[str, int]':
+        """
+        Returns the sizes of the entries on disk, ordered from least to most
+        recently used.
+        """
+        found = []
+        for entry in os.scandir(self._entries_path):
+            if entry.is_file() and not entry.name.startswith("."):
+                stat = entry.stat()
+                found.append((stat.st_mtime, entry.name, stat.st_size))
+        found.sort()
+        return OrderedDict((name, size) for _, name, size in found)
+
+    def _load_negative(self) -> dict:
+        """
+        Returns the negative cache stored on disk.
+        """
+        try:
+            with open(self._negative_path, "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.decoder.JSONDecodeError):
+            return {}
+
+    @staticmethod
+    def _hash_key(key: str) -> str:
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    def _encode(self, value: Any) -> bytes:
+        data = json.dumps(value).encode("utf-8")
+        if self.compression == "gzip":
+            return gzip.compress(data)
+        if self.compression == "lzma":
+            return lzma.compress(data)
+        return data
+
+    @staticmethod
+    def _decode(filename: str, data: bytes) -> Any:
+        if filename.endswith(".gz"):
+            data = gzip.decompress(data)
+        elif filename.endswith(".xz"):
+            data = lzma.decompress(data)
+        return json.loads(data.decode("utf-8"))
+
+    def get(self, key: str) -> Any:
+        """
+        Returns the value stored for key, or None if the key is not cached.
+        Marks the entry as recently used.
+        """
+        key_hash = self._hash_key(key)
+        for suffix in self._SUFFIXES.values():
+            filename = key_hash + suffix
+            with self._lock:
+                if filename not in self._entries:
+                    continue
+                self._entries.move_to_end(filename)
+
+            entry_path = os.path.join(self._entries_path, filename)
+            try:
+                with open(entry_path, "rb") as f:
+                    value = self._decode(filename, f.read())
+                os.utime(entry_path) # persist recency for future instances
+                return value
+            except FileNotFoundError:
+                # evicted by another thread
+                return None
+        return None
+
+    def put(self, key: str, value: Any) -> None:
+        """
+        Stores a JSON-serializable value for key, evicting the least recently
+        used entries if the cache is larger than max_size.
+        """
+        key_hash = self._hash_key(key)
+        filename = key_hash + self._SUFFIXES[self.compression]
+        data = self._encode(value)
+        write_atomic(os.path.join(self._entries_path, filename), data)
+
+        with self._lock:
+            # remove entries for the same key stored with other compressions
+            for suffix in self._SUFFIXES.values():
+                other = key_hash + suffix
+                if other != filename and other in self._entries:
+                    self._remove_entry(other)
+            self._entries[filename] = len(data)
+            self._entries.move_to_end(filename)
+            self._evict()
+
+    def _remove_entry(self, filename: str) -> None:
+        """
+        Removes an entry from disk. Must be called while holding the lock.
+        """
+        del self._entries[filename]
+        try:
+            os.remove(os.path.join(self._entries_path, filename))
+        except FileNotFoundError:
+            pass
+
+    def _evict(self) -> None:
+        """
+        Evicts least recently used entries until the cache is no larger than
+        max_size. Must be called while holding the lock.
+        """
+        if self.max_size is None:
+            return
+        total_size = sum(self._entries.values())
+        while total_size > self.max_size and len(self._entries) > 0:
+            filename, size = next(iter(self._entries.items()))
+            self._remove_entry(filename)
+            total_size -= size
+
+    def get_negative(self, key: str) -> Union[str, None]:
+        """
+        Returns the reason recorded for a key in the negative cache, or None if
+        the key is not in the negative cache.
+        """
+        with self._lock:
+            return self._negative.get(key)
+
+    def put_negative(self, key: str, reason: str) -> None:
+        """
+        Records in the negative cache that key has no usable result.
+        """
+        with self._lock:
+            self._negative[key] = reason
+            data = json.dumps(self._negative).encode("utf-8")
+            write_atomic(self._negative_path, data)
+
+    def get_size(self) -> int:
+        """
+        Returns the total size in bytes of all entries in the cache.
+        """
+        with self._lock:
+            return sum(self._entries.values())
+
+    def clear(self) -> None:
+        """
+        Removes all entries and the negative cache.
+        """
+        with self._lock:
+            for filename in list(self._entries):
+                self._remove_entry(filename)
+            self._negative = {}
+            try:
+                os.remove(self._negative_path)
+            except FileNotFoundError:
+                pass
+
+
+class Checkpoint:
+    """
+    Represents a checkpoint file that records the result of each build of an
+    evaluation as soon as it is downloaded, so that an interrupted download
+    can be resumed. Only final results should be recorded, since recorded
+    builds are not downloaded again.
+
+    Results are appended to the file as JSON lines, so a download that is
+    interrupted while writing loses at most the result being written.
+
+    Parameters
+    ----------
+    path : str
+        The path of the checkpoint file. Its directory is created if it does
+        not exist.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = os.path.expanduser(path)
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+    def load(self) -> dict:
+        """
+        Returns a dictionary mapping each recorded build number to its result,
+        or an empty dictionary if there is no checkpoint.
+        """
+        results = {}
+        try:
+            with open(self.path, "r") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.decoder.JSONDecodeError:
+                        continue # partially written line
+                    results[record["build"]] = record["result"]
+        except FileNotFoundError:
+            pass
+        return results
+
+    def record(self, build_num: int, result: Any) -> None:
+        """
+        Appends the JSON-serializable result of a build to the checkpoint.
+        """
+        line = json.dumps({"build": build_num, "result": result}) + "\n"
+        with self._lock:
+            with open(self.path, "a") as f:
+                f.write(line)
+
+    def remove(self) -> None:
+        """
+        Removes the checkpoint file, if it exists.
+        """
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
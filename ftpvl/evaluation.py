@@ -1,9 +1,12 @@
 """ Evaluations store the test results from a single execution of the test suite. """
 
 from functools import reduce
-from typing import List, Union
+from typing import Any, Dict, Iterable, List, Tuple, Union
+import numpy as np
 import pandas as pd
 
+import ftpvl.helpers as Helpers
+
 class Evaluation():
     """
     A collection of test results from a single evaluation of a piece
@@ -22,6 +25,9 @@ class Evaluation():
     def __init__(self, df: pd.DataFrame, eval_id: int = None):
         self._df = df
         self._eval_id = eval_id
+        self._indexes = {}
+        self._sorted_by = ()
+        self._index_unique = None
 
     def get_df(self) -> pd.DataFrame:
         """
@@ -29,6 +35,80 @@ class Evaluation():
         """
         return self._df.copy()
 
+    def get_df_view(self) -> pd.DataFrame:
+        """
+        Returns a read-only view of the Pandas DataFrame that represents the
+        evaluation, without copying its data. This is used by processors and
+        visualizers, which would otherwise copy the whole dataframe at every
+        step of a pipeline.
+
+        The view is a shallow copy, so adding, replacing or dropping columns
+        and changing the index of the view do not affect the evaluation. Values
+        must not be modified in place, for example using `.loc`, `.iloc` or
+        `.values`. Use get_df() to get a copy that can be modified freely.
+        """
+        return self._df.copy(deep=False)
+
+    def get_index(self, keys: Union[str, List[str]]) -> Dict[Any, np.ndarray]:
+        """
+        Returns a hash index of the test results by the values of one or more
+        index levels or columns, such as project, toolchain or board, mapping
+        each value to the positions of its rows in ascending order. With
+        several keys, each value is a tuple with a value for each key.
+
+        The index is built the first time it is requested and cached. The
+        dataframe of an Evaluation does not change, since get_df() returns a
+        copy and processors return new Evaluations, so the cached index stays
+        valid for the lifetime of the Evaluation.
+
+        Args
+        -------
+            keys: the name, or list of names, of the index levels or columns
+
+        Returns:
+            a dict mapping each value to an array of row positions
+        """
+        cache_key = keys if isinstance(keys, str) else tuple(keys)
+        if cache_key not in self._indexes:
+            grouper = keys if isinstance(keys, str) else list(keys)
+            self._indexes[cache_key] = self._df.groupby(
+                grouper, sort=False, dropna=False, observed=True
+            ).indices
+        return self._indexes[cache_key]
+
+    def get_sorted_by(self) -> Tuple:
+        """
+        Returns the names of the index levels that the rows are known to be
+        sorted by, in the order they are sorted by, or an empty tuple if the
+        order is unknown.
+
+        The order is recorded by SortIndex, and kept by processors that keep
+        the order of the rows, such as StandardizeTypes, Normalize and the
+        filters. SortIndex does nothing if the rows are already sorted, and
+        the filters use binary search on the first sorted level.
+        """
+        return self._sorted_by
+
+    def is_index_unique(self) -> bool:
+        """
+        Returns True if no two rows have the same index. This is computed the
+        first time it is needed, and kept by processors that keep the index
+        or select rows from it.
+        """
+        if self._index_unique is None:
+            self._index_unique = bool(self._df.index.is_unique)
+        return self._index_unique
+
+    def _keep_index_order(self, source: 'Evaluation', dropped_level: str = None) -> 'Evaluation':
+        """
+        Records that the rows are in the order of the rows of source, with
+        one of its index levels possibly dropped, and returns self. Used by
+        processors that keep or select rows without reordering them.
+        """
+        self._sorted_by = tuple(x for x in source.get_sorted_by() if x != dropped_level)
+        self._index_unique = source._index_unique
+        return self
+
     def get_eval_id(self) -> Union[int, None]:
         """
         Returns the ID number of the evaluation if specified, otherwise None
@@ -41,23 +121,171 @@ class Evaluation():
         """
         return Evaluation(self.get_df(), self.get_eval_id())
 
-    def process(self, pipeline: List['Processor']) -> 'Evaluation':
+    def to_arrow(self) -> Any:
+        """
+        Returns a pyarrow Table of the dataframe. The index levels and dtypes
+        are stored in the pandas metadata of the schema, and the eval_id is
+        stored in the `ftpvl` metadata, so that from_arrow() restores an
+        identical Evaluation.
+
+        Requires pyarrow.
+
+        Returns:
+            a pyarrow.Table
+        """
+        pa = Helpers.import_pyarrow()
+        table = pa.Table.from_pandas(self._df)
+        return Helpers.set_arrow_metadata(table, {"eval_id": self._eval_id})
+
+    @staticmethod
+    def from_arrow(table: Any) -> 'Evaluation':
+        """
+        Returns an Evaluation of a pyarrow Table created by to_arrow(). Tables
+        from other sources are supported, and have an eval_id of None.
+
+        Args
+        -------
+            table: a pyarrow.Table
+
+        Returns:
+            an Evaluation with the dataframe and eval_id stored in the table
+        """
+        eval_id = Helpers.get_arrow_metadata(table.schema).get("eval_id")
+        return Evaluation(table.to_pandas(), eval_id)
+
+    def to_parquet(self, path: str, compression: str = "snappy") -> None:
+        """
+        Writes the Evaluation to a Parquet file, preserving the eval_id, index
+        levels and dtypes. The file can be loaded using ParquetFetcher.
+
+        Requires pyarrow.
+
+        Args
+        -------
+            path: the path of the Parquet file
+            compression: the compression codec used by pyarrow, by default
+                "snappy"
+        """
+        pa = Helpers.import_pyarrow()
+        pa.parquet.write_table(self.to_arrow(), path, compression=compression)
+
+    def get_memory_usage(self) -> int:
+        """
+        Returns the number of bytes used by the dataframe, including the
+        contents of string columns
+        """
+        return int(self._df.memory_usage(deep=True).sum())
+
+    def compact(self, verbose: bool = False) -> 'Evaluation':
+        """
+        Returns a new Evaluation that stores each column with the smallest
+        dtype that represents it without loss, such as parsed numeric strings,
+        downcast numbers and categorical strings.
+
+        Args
+        -------
+            verbose: if True, prints the memory usage before and after
+
+        Returns:
+            an Evaluation with the same values using less memory
+        """
+        compacted = Evaluation(Helpers.compact_df(self._df), self.get_eval_id())
+        if verbose:
+            before = self.get_memory_usage()
+            after = compacted.get_memory_usage()
+            print(
+                f"Memory usage: {before} bytes before, {after} bytes after",
+                f"({before / max(after, 1):.1f}x smaller)"
+            )
+        return compacted
+
+    def process(self, pipeline: List['Processor'], lazy: bool = False) -> 'Evaluation':
         """
         Executes each processor in the pipeline and returns a new Evaluation.
 
+        If lazy is True, a LazyEvaluation is returned instead, and the
+        pipeline is only run the first time the result is used. The pipeline
+        is rewritten before it is run, such as by merging casts and selecting
+        the rows kept by FilterByIndex before expensive processors, so it
+        does less work than running each processor in order. See
+        ftpvl.plan.Plan for the rewrites. The result is the same, except that
+        rows with equal index values may be sorted in a different order.
+
         Args
         -------
             pipeline: a list of Processors to process the Evaluation in order
+            lazy: if True, returns a LazyEvaluation that runs the rewritten
+                pipeline when it is used, by default False
 
         Returns:
             an Evaluation instance that was processed by the pipeline
         """
+        if lazy:
+            # imported here since ftpvl.plan imports this module
+            from ftpvl.plan import LazyEvaluation
+            return LazyEvaluation(self, pipeline)
         return reduce(lambda r, p: p.process(r), pipeline, self)
 
+    @staticmethod
+    def concat(evals: Iterable['Evaluation']) -> 'Evaluation':
+        """
+        Returns an Evaluation of the test results of several Evaluations,
+        concatenated in a single pass. This takes linear time, unlike adding
+        many Evaluations using sum(), which copies the growing result at every
+        step.
+
+        The dataframe has the union of the columns of the Evaluations, with
+        missing values where an Evaluation does not have a column. If the
+        Evaluations have eval_ids, a categorical `eval_id` column is added as
+        the first column, recording the eval_id of each test result, with the
+        same dtype as the `eval_id` column of EvaluationStore.query().
+        Evaluations that already have an `eval_id` column, such as previously
+        concatenated Evaluations, keep its values. Named index levels are
+        kept, otherwise the index is reset.
+
+        Args
+        -------
+            evals: the Evaluations to concatenate, in order
+
+        Returns:
+            an Evaluation of the concatenated test results, without an
+            eval_id
+
+        Raises:
+            ValueError: if there are no Evaluations to concatenate
+        """
+        evals = list(evals)
+        if len(evals) == 0:
+            raise ValueError("Unable to concatenate zero Evaluations.")
+        dfs = [x.get_df_view() for x in evals]
+
+        # the source eval_id of each row, per Evaluation
+        sources = [
+            df["eval_id"] if "eval_id" in df.columns else x.get_eval_id()
+            for x, df in zip(evals, dfs)
+        ]
+        ignore_index = all(name is None for df in dfs for name in df.index.names)
+        new_df = pd.concat(dfs, ignore_index=ignore_index, sort=False)
+
+        if any(x is not None for x in sources):
+            provenance = pd.Categorical(np.concatenate([
+                x.to_numpy(dtype=object) if isinstance(x, pd.Series)
+                else np.full(len(df), x, dtype=object)
+                for x, df in zip(sources, dfs)
+            ]))
+            if "eval_id" in new_df.columns:
+                new_df["eval_id"] = provenance
+            else:
+                new_df.insert(0, "eval_id", provenance)
+        return Evaluation(new_df)
+
     def __add__(self, other: 'Evaluation') -> 'Evaluation':
         """
         Magic method for concatenating two Evaluations, returning an Evaluation
-        with dataframe (self + other).
+        with dataframe (self + other). The eval_id of each test result is kept
+        in an `eval_id` column, see concat().
+
+        To concatenate many Evaluations, use concat() instead of sum().
 
         Args
         ------
@@ -68,8 +296,7 @@ class Evaluation():
         """
         if not isinstance(other, Evaluation):
             raise TypeError(f"can only concatenate Evaluation (not {type(other).__name__}) to Evaluation")
-        new_df = pd.concat([self.get_df(), other.get_df()], ignore_index=True)
-        return Evaluation(new_df)
+        return Evaluation.concat([self, other])
 
     def __radd__(self, other: 'Evaluation') -> 'Evaluation':
         """
@@ -83,7 +310,8 @@ class Evaluation():
         Returns:
             a new Evaluation that consists of the two Evaluations concatenated
         """
-        # handle default start value of sum() is `0`
+        # handle default start value of sum() is `0`, keeping the eval_id of
+        # each test result like sums of several Evaluations
         if other == 0:
-            return self.get_copy()
+            return Evaluation.concat([self])
         return self.__add__(other)
\ No newline at end of file
@@ -1,13 +1,173 @@
 """ Fetchers are responsible for ingesting and standardizing data for future processing. """
+import ast
+import asyncio
+import bz2
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
+import fnmatch
+import gzip
 import json
-from typing import Any, Dict, List
+import lzma
+import os
+import random
+import re
+import tarfile
+import time
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Tuple, Union
+import zipfile
 
+import numpy as np
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
 
 import ftpvl.helpers as Helpers
+from ftpvl.cache import BuildCache, Checkpoint
 from ftpvl.evaluation import Evaluation
+from ftpvl.mirror import HydraMirror
+
+# openers of compressed files by extension, which accept paths or file objects
+_COMPRESSION_OPENERS = {
+    ".gz": gzip.open,
+    ".bz2": bz2.open,
+    ".xz": lzma.open,
+}
+
+# the epoch timestamps that pd.read_json() tries to read as dates, starting
+# from a year after the epoch in seconds, and the units it tries in order
+_JSON_MIN_STAMP = 31536000
+_JSON_STAMP_UNITS = ("s", "ms", "us", "ns")
+
+# the integer representation of NaT
+_INT64_NAT = np.iinfo(np.int64).min
+
+
+def _is_json_date_column(name: Any) -> bool:
+    """
+    Returns True if pd.read_json() tries to read a column as dates by default,
+    based on its name.
+    """
+    if not isinstance(name, str):
+        return False
+    name = name.lower()
+    return (
+        name.endswith(("_at", "_time"))
+        or name in ("modified", "date", "datetime")
+        or name.startswith("timestamp")
+    )
+
+
+def _convert_json_dates(
+    data: Union[pd.Series, pd.Index]
+) -> Union[pd.Series, pd.Index, None]:
+    """
+    Returns the decoded JSON values converted to dates as pd.read_json() does,
+    or None if they are not dates.
+    """
+    if len(data) == 0:
+        return None
+    new_data = data
+    if new_data.dtype == object:
+        try:
+            new_data = data.astype("int64")
+        except OverflowError:
+            return None
+        except (TypeError, ValueError):
+            pass
+
+    # numbers before the minimum timestamp are not dates
+    if issubclass(new_data.dtype.type, np.number):
+        values = np.asarray(new_data)
+        in_range = pd.isna(values) | (values > _JSON_MIN_STAMP) | (values == _INT64_NAT)
+        if not in_range.all():
+            return None
+
+    for unit in _JSON_STAMP_UNITS:
+        try:
+            return pd.to_datetime(new_data, errors="raise", unit=unit)
+        except (ValueError, OverflowError, TypeError):
+            continue
+    return None
+
+
+def _convert_json_values(data: Union[pd.Series, pd.Index]) -> Union[pd.Series, pd.Index]:
+    """
+    Returns the decoded JSON values with the dtype that pd.read_json() infers
+    for them: numbers in strings are parsed, and floats that are all integers
+    are stored as integers.
+    """
+    if data.dtype == object:
+        try:
+            data = data.astype("float64")
+        except (TypeError, ValueError):
+            pass
+
+    if len(data) > 0 and data.dtype in (np.float64, object):
+        try:
+            new_data = data.astype("int64")
+            if (new_data == data).all():
+                data = new_data
+        except (TypeError, ValueError, OverflowError):
+            pass
+    return data
+
+
+def _create_json_df(columns: Dict[str, Dict]) -> pd.DataFrame:
+    """
+    Returns the dataframe that pd.read_json() reads from a JSON object in the
+    column-oriented format written by DataFrame.to_json(), given the decoded
+    object. The index, dates and dtypes are inferred as pd.read_json() does.
+    """
+    df = pd.DataFrame(columns)
+
+    index = _convert_json_dates(df.index)
+    df.index = _convert_json_values(df.index if index is None else index)
+
+    new_columns = {}
+    for name, column in df.items():
+        if _is_json_date_column(name):
+            column = _convert_json_dates(column)
+            if column is None:
+                column = df[name]
+        new_columns[name] = _convert_json_values(column)
+    return pd.DataFrame(new_columns, index=df.index)
+
+
+def _flatten_meta_json(meta_json: Dict, plan: Union[dict, None]) -> Dict:
+    """
+    Returns the flattened meta.json file, containing only the keys selected by
+    the extraction plan, or every key if the plan is None.
+    """
+    if plan is None:
+        return Helpers.flatten(meta_json)
+    return Helpers.extract(meta_json, plan)
+
+
+def _create_flattened_df(data: List[Dict], plan: Union[dict, None]) -> pd.DataFrame:
+    """
+    Returns a dataframe with a row for each flattened meta.json file,
+    containing only the keys selected by the extraction plan, or every key if
+    the plan is None. The columns are built directly from the values of each
+    key instead of from a dictionary for each row.
+    """
+    return pd.DataFrame(Helpers.flatten_columns(data, plan), index=pd.RangeIndex(len(data)))
+
+
+def _load_meta_json(path: str, plan: Union[dict, None]) -> Union[Dict, None]:
+    """
+    Returns the flattened meta.json file at the path, or None if it cannot be
+    read or decoded. Used as the worker of LocalDirectoryFetcher's process
+    pool, so that decoding and flattening happen in parallel.
+    """
+    try:
+        with open(path, "r") as f:
+            meta_json = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(meta_json, dict):
+        return None
+    return _flatten_meta_json(meta_json, plan)
 
 
 class Fetcher:
@@ -16,10 +176,18 @@ class Fetcher:
 
     Fetchers allow the user to retrieve test data from a data source and output
     as an Evaluation for use by other tools in the library.
+
+    Parameters
+    ----------
+    compact : bool, optional
+        If True, the dataframe of each Evaluation is stored with compact,
+        lossless dtypes: numeric strings are parsed, numbers are downcast,
+        and low-cardinality string columns are categorical. By default False
     """
 
-    def __init__(self):
+    def __init__(self, compact: bool = False):
         self._abs_eval_id = None
+        self.compact = compact
 
     def _download(self) -> Any:
         """
@@ -39,10 +207,237 @@ class Fetcher:
         """
         data = self._download()
         preprocessed_df = self._preprocess(data)
-        return Evaluation(preprocessed_df, eval_id=self._abs_eval_id)
+        return self._create_evaluation(preprocessed_df, self._abs_eval_id)
+
+    def _create_evaluation(self, df: pd.DataFrame, eval_id: Union[int, None]) -> Evaluation:
+        """
+        Returns an Evaluation of the preprocessed dataframe, compacting the
+        dataframe if `compact` is True.
+        """
+        if self.compact:
+            df = Helpers.compact_df(df)
+        return Evaluation(df, eval_id=eval_id)
+
+    def get_evaluation_iter(self, chunk_size: int = 10) -> Iterator[Evaluation]:
+        """
+        Yields partial Evaluations that grow as data is fetched. The last
+        Evaluation yielded contains all of the fetched data.
+
+        Fetchers that cannot fetch data incrementally yield a single, complete
+        Evaluation.
+
+        Parameters
+        ----------
+        chunk_size : int, optional
+            The number of test results fetched between partial Evaluations,
+            by default 10
+        """
+        yield self.get_evaluation()
+
+
+class MetaJSONFetcher(Fetcher):
+    """
+    This is a superclass for fetchers of meta.json files produced by
+    fpga-tool-perf, such as HydraFetcher and LocalDirectoryFetcher.
+
+    Subclasses implement `_download()`, which returns a list of decoded
+    meta.json files. These are flattened, the mapping is applied, the actual
+    frequency is found using the clock names, and legacy Icebreaker
+    frequencies are converted from MHz.
+
+    Parameters
+    ----------
+    mapping : dict, optional
+        A dictionary mapping input column names to output
+        column names, if needed for remapping, by default None
+    hydra_clock_names : list, optional
+        An optional ordered list of strings used in finding
+        the actual frequency for each build result, by default None
+    compact : bool, optional
+        If True, the Evaluation is stored with compact, lossless dtypes. See
+        Fetcher. By default False
+    """
+
+    def __init__(
+        self,
+        mapping: dict = None,
+        hydra_clock_names: list = None,
+        compact: bool = False
+    ) -> None:
+        super().__init__(compact=compact)
+        self.mapping = mapping
+        self.hydra_clock_names = hydra_clock_names
+
+    def _check_legacy_icebreaker(self, df: pd.DataFrame) -> pd.Series:
+        """
+        Returns a boolean series that is True for each row that is from a test
+        on an Icebreaker board before Jul 31, 2020.
+
+        This is useful because these legacy tests recorded frequency in MHz
+        instead of Hz, while all other boards record in Hz. This flag can be
+        used to check if the units need to be changed.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            a dataframe with a row for each decoded and flattened meta.json
+            file
+
+        Returns
+        -------
+        pd.Series
+            True for each row that is an icebreaker board before Aug 1, 2020.
+            False otherwise.
+        """
+        if "date" not in df.columns or "board" not in df.columns:
+            missing = pd.Series(True, index=df.index)
+            is_legacy = pd.Series(False, index=df.index)
+        else:
+            missing = df["date"].isna() | df["board"].isna()
+            # format: 2020-07-17T22:12:41
+            timestamps = pd.to_datetime(df["date"], format="%Y-%m-%dT%H:%M:%S")
+            is_legacy = (timestamps < datetime(2020, 7, 31)) & (df["board"] == "icebreaker")
+
+        if missing.any():
+            print(
+                "Warning: Unable to find date and board in meta.json for",
+                f"{missing.sum()} builds, required for supporting legacy Icebreaker."
+            )
+        return is_legacy & ~missing # Assume not legacy icebreaker
+
+    def _preprocess(self, data: List[Dict]) -> pd.DataFrame:
+        """
+        Using data from _download(), processes and standardizes the data and
+        returns a Pandas DataFrame.
+        """
+        plan = self._get_extraction_plan()
+        # rows are only flattened one by one as needed to order the columns
+        return self._preprocess_flattened_df(
+            _create_flattened_df(data, plan), (_flatten_meta_json(x, plan) for x in data)
+        )
+
+    def _preprocess_flattened(self, flattened_data: List[Dict]) -> pd.DataFrame:
+        """
+        Processes and standardizes flattened meta.json files and returns a
+        Pandas DataFrame.
+        """
+        return self._preprocess_flattened_df(
+            _create_flattened_df(flattened_data, None), flattened_data
+        )
+
+    def _preprocess_flattened_df(
+        self,
+        flattened_df: pd.DataFrame,
+        flattened_data: Iterable[Dict] = None,
+        drop_empty: bool = True
+    ) -> pd.DataFrame:
+        """
+        Processes and standardizes a dataframe with a row for each flattened
+        meta.json file and returns a Pandas DataFrame.
+
+        Processing is done on whole columns instead of row by row: the clock
+        columns are resolved once, the legacy Icebreaker unit fix is a
+        vectorized mask, and the mapping is a single projection.
+
+        If the flattened rows of the dataframe are given, the columns are
+        ordered as they first appear in the rows. Otherwise, they are ordered
+        as in the dataframe. Columns without any values are dropped, unless
+        `drop_empty` is False.
+        """
+        if self.mapping is None:
+            processed_df = flattened_df
+        else:
+            processed_df = flattened_df[list(self.mapping.keys())].rename(columns=self.mapping)
+
+        # find frequency in MHz of each row, if it has one
+        actual_freq = Helpers.get_actual_freq_column(flattened_df, self.hydra_clock_names)
+        has_freq = pd.Series(False, index=flattened_df.index)
+        if actual_freq is not None:
+            has_freq = actual_freq.notna() & (actual_freq != 0)
+        if has_freq.any():
+            legacy_icestorm = self._check_legacy_icebreaker(flattened_df)
+            freq = actual_freq
+            if not legacy_icestorm.all():
+                # convert hz to mhz, legacy freq in MHz needs no change
+                freq = (actual_freq / 1_000_000).where(~legacy_icestorm, actual_freq)
+            if "freq" in processed_df.columns:
+                freq = freq.where(has_freq, processed_df["freq"])
+            else:
+                freq = freq.where(has_freq)
+            processed_df["freq"] = freq
+
+        if self.mapping is not None:
+            for col in flattened_df.columns:
+                if col.startswith("versions."):
+                    processed_df[col] = flattened_df[col]
+
+        if flattened_data is None:
+            # a single row with every column has the order of the dataframe
+            column_order = self._get_column_order(
+                [dict.fromkeys(flattened_df.columns)], [bool(has_freq.any())],
+                processed_df.columns
+            )
+        else:
+            column_order = self._get_column_order(
+                flattened_data, has_freq.tolist(), processed_df.columns
+            )
+        if drop_empty:
+            # checking each column is much faster than dropna() on a frame of
+            # mostly strings
+            column_order = [
+                col for col in column_order if processed_df[col].notna().values.any()
+            ]
+        return processed_df[column_order]
+
+    def _get_extraction_plan(self) -> Union[dict, None]:
+        """
+        Returns a plan for Helpers.extract() that selects the keys needed to
+        preprocess a meta.json file using the mapping: the mapped keys, the
+        actual frequency of each clock, the versions, and the date and board
+        used to detect legacy Icebreaker tests. Returns None if there is no
+        mapping, since every key is needed.
+        """
+        if self.mapping is None:
+            return None
+        keys = list(self.mapping.keys())
+        keys.extend(["max_freq.*.actual", "versions", "date", "board"])
+        return Helpers.get_extraction_plan(keys)
+
+    def _get_column_order(
+        self,
+        flattened_data: Iterable[Dict],
+        has_freq: List[bool],
+        columns: pd.Index
+    ) -> List[str]:
+        """
+        Returns the columns in the order in which they first appear in the
+        processed rows, which is the order of a dataframe built row by row.
+
+        Rows are only inspected until every column has been seen, which is
+        usually after the first row.
+        """
+        remaining = set(columns)
+        order = []
+        for row, row_has_freq in zip(flattened_data, has_freq):
+            if self.mapping is None:
+                keys = list(row.keys())
+            else:
+                keys = list(self.mapping.values())
+            if row_has_freq:
+                keys.append("freq")
+            if self.mapping is not None:
+                keys.extend(key for key in row if key.startswith("versions."))
+
+            for key in keys:
+                if key in remaining:
+                    order.append(key)
+                    remaining.remove(key)
+            if len(remaining) == 0:
+                break
+        return order + [col for col in columns if col in remaining]
 
 
-class HydraFetcher(Fetcher):
+class HydraFetcher(MetaJSONFetcher):
     """
     Represents a downloader and preprocessor of test results from
     `hydra.vtr.tools`.
@@ -68,6 +463,48 @@ class HydraFetcher(Fetcher):
     hydra_clock_names : list, optional
         An optional ordered list of strings used in finding
         the actual frequency for each build result, by default None
+    max_workers : int, optional
+        The maximum number of builds to download concurrently. If greater than
+        1, builds are downloaded using a thread pool that shares a single
+        keep-alive HTTP session. The order of the builds in the resulting
+        Evaluation is not affected. By default 1
+    cache : BuildCache, optional
+        A persistent cache used to store the build info and meta.json files of
+        finished builds, so that they are only downloaded once. Failed builds
+        and builds without a meta.json file are also remembered and skipped
+        without a request. Evals pages are stored with their ETag and
+        Last-Modified headers and revalidated using conditional requests.
+        By default None
+    retries : int, optional
+        The number of times a request is retried after a connection error or a
+        429 or 5xx response, by default 3
+    backoff_factor : float, optional
+        The base delay in seconds between retries. The delay before retry `n`
+        is chosen uniformly at random between 0 and `backoff_factor * 2**n`,
+        by default 0.5
+    timeout : float or Tuple[float, float], optional
+        The number of seconds to wait for Hydra to accept a connection and to
+        send data, passed to every request. A request that times out is
+        retried like a connection error. Either a single number for both, or
+        a (connect, read) tuple, by default (5, 60)
+    checkpoint_dir : str, optional
+        A directory used to store a checkpoint file for each evaluation being
+        downloaded. Each downloaded build is recorded in the checkpoint, so
+        that if `get_evaluation()` fails, calling it again only downloads the
+        missing builds. The checkpoint is removed once the evaluation is
+        downloaded. By default None
+    compact : bool, optional
+        If True, the Evaluation is stored with compact, lossless dtypes. See
+        Fetcher. By default False
+    mirror : str, optional
+        The directory of a HydraMirror of the jobset. If specified, the evals
+        and builds are read from the mirror instead of from Hydra, no requests
+        are sent, and `cache` is not used. Builds that are not in the mirror
+        are skipped. By default None
+    base_url : str, optional
+        The URL of the Hydra server, which can be changed to fetch from
+        another Hydra instance or from a stand-in server such as
+        `ftpvl.testing.HydraServer`, by default "https://hydra.vtr.tools"
     """
 
     def __init__(
@@ -77,30 +514,198 @@ class HydraFetcher(Fetcher):
         eval_num: int = 0,
         absolute_eval_num: bool = False,
         mapping: dict = None,
-        hydra_clock_names: list = None
+        hydra_clock_names: list = None,
+        max_workers: int = 1,
+        cache: BuildCache = None,
+        retries: int = 3,
+        backoff_factor: float = 0.5,
+        timeout: Union[float, Tuple[float, float]] = (5, 60),
+        checkpoint_dir: str = None,
+        compact: bool = False,
+        mirror: str = None,
+        base_url: str = "https://hydra.vtr.tools"
     ) -> None:
-        super().__init__() # inits self._abs_eval_id
+        # inits self._abs_eval_id
+        super().__init__(
+            mapping=mapping, hydra_clock_names=hydra_clock_names, compact=compact
+        )
         self.project = project
         self.jobset = jobset
         self.eval_num = eval_num
         self.absolute_eval_num = absolute_eval_num
-        self.mapping = mapping
-        self.hydra_clock_names = hydra_clock_names
+        self.base_url = base_url.rstrip("/")
+        self.max_workers = max_workers
+        self.cache = cache if mirror is None else None
+        self.mirror = mirror
+        self._mirror = None
+        if mirror is not None:
+            self._mirror = HydraMirror(mirror, project, jobset)
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.timeout = timeout
+        self.checkpoint_dir = checkpoint_dir
+        self._session = self._create_session()
+        self._eval_index = None
+        self._eval_index_key = f"evals-index/{project}/{jobset}"
+
+    def _create_session(self) -> requests.Session:
+        """
+        Returns a requests Session that keeps connections to Hydra alive
+        between requests and accepts gzip-encoded responses.
+
+        The connection pool is sized so that every download thread can hold
+        its own connection.
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=max(self.max_workers, 1))
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({
+            "Content-Type": "application/json",
+            "Accept-Encoding": "gzip",
+            "Connection": "keep-alive",
+        })
+        return session
+
+    def request(self, url: str, headers: dict = None) -> requests.Response:
+        """
+        Sends a GET request to Hydra using the shared session and returns the
+        response. HydraMirror uses this to download from Hydra with the same
+        connection pooling, timeout and retries as the fetcher.
+
+        Requests that fail with a connection error, a timeout, or a 429 or 5xx
+        status code are retried up to `retries` times, using exponential
+        backoff with full jitter between attempts. The last response is
+        returned even if it has an error status code.
+
+        Raises
+        ------
+        requests.exceptions.ConnectionError
+            Raised if the last attempt fails with a connection error.
+        requests.exceptions.Timeout
+            Raised if the last attempt times out.
+        """
+        for attempt in range(self.retries + 1):
+            try:
+                resp = self._session.get(url, headers=headers, timeout=self.timeout)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if attempt == self.retries:
+                    raise
+            else:
+                retryable = resp.status_code == 429 or resp.status_code >= 500
+                if not retryable or attempt == self.retries:
+                    return resp
+            time.sleep(random.uniform(0, self.backoff_factor * 2 ** attempt))
 
-    def _get_builds(self, eval_num: int, params: str = "") -> List[int]:
+    def _get_evals_page(self, params: str = "") -> dict:
         """
-        Recursive function that returns a list of build numbers given an eval_num
-        and whether it is an absolute eval num.
+        Returns the decoded evals page of the jobset.
+
+        If a cache is used, the ETag and Last-Modified headers of the response
+        are stored along with the page, and used to revalidate the page the
+        next time it is requested. If the server responds with 304 Not
+        Modified, the cached page is returned.
 
         Parameters
         ----------
-        eval_num : int
-            An integer that specifies the evaluation to download. Functionality
-            differs depending on whether `absolute_eval_num` is True
         params : str
             A string of query parameters used when fetching the evaluations.
             Most commonly used for pagination. By default, "".
 
+        Returns
+        -------
+        dict
+            The decoded evals page
+
+        Raises
+        ------
+        ConnectionError
+            Raised if the HTTP request to get the evaluations fails.
+        """
+        if self._mirror is not None:
+            # the mirror stores the whole listing as a single page
+            return self._mirror.get_evals_page()
+
+        url = f"{self.base_url}/jobset/{self.project}/{self.jobset}/evals{params}"
+        cache_key = f"evals/{url}"
+
+        cached = None
+        headers = {}
+        if self.cache is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                if cached.get("etag"):
+                    headers["If-None-Match"] = cached["etag"]
+                if cached.get("last_modified"):
+                    headers["If-Modified-Since"] = cached["last_modified"]
+
+        resp = self.request(url, headers=headers)
+        if resp.status_code == 304 and cached is not None:
+            return cached["body"]
+        if resp.status_code != 200:
+            raise ConnectionError("Unable to get evals from server.")
+        evals_json = resp.json()
+
+        etag = resp.headers.get("ETag")
+        last_modified = resp.headers.get("Last-Modified")
+        if self.cache is not None and (etag or last_modified):
+            self.cache.put(cache_key, {
+                "etag": etag,
+                "last_modified": last_modified,
+                "body": evals_json,
+            })
+        return evals_json
+
+    def get_evals_page_num(self, page: int) -> dict:
+        """
+        Returns the decoded evals page with the given 1-based page number,
+        from the mirror or cache if they are used. See `_get_evals_page()`.
+        """
+        return self._get_evals_page("" if page == 1 else f"?page={page}")
+
+    def _get_eval_index(self) -> dict:
+        """
+        Returns the index that maps eval IDs of the jobset to their position
+        in the evals listing, loading it from the cache if possible.
+
+        Positions count from the first eval on the first page. The index also
+        records the ID of the eval at position 0 when it was built, so that
+        positions can be corrected after new evals are added.
+        """
+        if self._eval_index is None:
+            cached = None
+            if self.cache is not None:
+                cached = self.cache.get(self._eval_index_key)
+            self._eval_index = cached or {"head_id": None, "positions": {}}
+        return self._eval_index
+
+    def _update_eval_index(self, page: int, page_size: int, evals_json: dict) -> None:
+        """
+        Records the positions of the evals on a page in the eval index.
+        """
+        index = self._get_eval_index()
+        for i, eval_data in enumerate(evals_json["evals"]):
+            # JSON object keys are always strings
+            index["positions"][str(eval_data["id"])] = (page - 1) * page_size + i
+
+    def _get_builds(self, eval_num: int) -> List[int]:
+        """
+        Returns a list of build numbers given an eval_num and whether it is an
+        absolute eval num.
+
+        Evals pages are addressed directly instead of being walked one after
+        another. A relative eval_num is mapped to its page using the page size,
+        and an absolute eval_num is found by binary searching the pages, since
+        eval IDs are monotonic. The positions of all evals seen are recorded in
+        an eval index, which is persisted in the cache if one is used, so later
+        lookups of the same eval usually need a single extra request.
+
+        Parameters
+        ----------
+        eval_num : int
+            An integer that specifies the evaluation to download. Functionality
+            differs depending on whether `absolute_eval_num` is True
+
         Returns
         -------
         List[int]
@@ -113,41 +718,156 @@ class HydraFetcher(Fetcher):
         IndexError
             Raised if the relative eval_num is not valid.
         ValueError
-            Raised if the eval_num has no associated builds.
+            Raised if the absolute eval_num cannot be found.
         """
-        resp = requests.get(
-            f"https://hydra.vtr.tools/jobset/{self.project}/{self.jobset}/evals{params}",
-            headers={"Content-Type": "application/json"},
-        )
-        if resp.status_code != 200:
-            raise ConnectionError("Unable to get evals from server.")
-        evals_json = resp.json()
+        eval_data = self._get_evals([eval_num])[0]
+        self._abs_eval_id = eval_data["id"] # set absolute id for eval
+        return eval_data["builds"]
+
+    def _get_evals(self, eval_nums: List[int]) -> List[dict]:
+        """
+        Returns the eval data of each eval_num, in order, resolving all of them
+        in a single pass over the evals pages. Each page is fetched at most
+        once, however many of the evals it contains.
+
+        Parameters
+        ----------
+        eval_nums : List[int]
+            Integers that specify the evaluations to find. Functionality
+            differs depending on whether `absolute_eval_num` is True
+
+        Returns
+        -------
+        List[dict]
+            The eval data of each eval_num, including its `id` and `builds`
+
+        Raises
+        ------
+        ConnectionError
+            Raised if the HTTP request to get the evaluations fails.
+        IndexError
+            Raised if a relative eval_num is not valid.
+        ValueError
+            Raised if an absolute eval_num cannot be found.
+        """
+        pages = {1: self.get_evals_page_num(1)}
+        first_evals = pages[1]["evals"]
+        page_size = len(first_evals)
+        last_page = Helpers.get_page_num(pages[1].get("last")) or 1
+
+        results = []
+        for eval_num in eval_nums:
+            if page_size == 0:
+                eval_data = None
+            elif self.absolute_eval_num:
+                eval_data = self._find_absolute_eval(eval_num, pages, page_size, last_page)
+            else:
+                eval_data = self._find_relative_eval(eval_num, pages, page_size, last_page)
+            results.append(eval_data)
+
+        # persist positions of evals seen in this lookup
+        index = self._get_eval_index()
+        if page_size > 0:
+            index["head_id"] = first_evals[0]["id"]
+            for page, evals_json in pages.items():
+                self._update_eval_index(page, page_size, evals_json)
+            if self.cache is not None:
+                self.cache.put(self._eval_index_key, index)
+
+        for eval_num, eval_data in zip(eval_nums, results):
+            if eval_data is None:
+                if self.absolute_eval_num:
+                    raise ValueError(f"Unable to find absolute eval_num {eval_num}")
+                raise IndexError(f"Unable to find relative eval_num {eval_num}")
+        return results
 
-        if self.absolute_eval_num:
-            self._abs_eval_id = eval_num # set absolute id for eval
-            for eval_data in evals_json["evals"]:
+    def _find_relative_eval(
+        self,
+        eval_num: int,
+        pages: Dict[int, dict],
+        page_size: int,
+        last_page: int
+    ) -> Union[dict, None]:
+        """
+        Returns the eval data of a relative eval_num by jumping straight to the
+        page that contains it, or None if it does not exist. Fetched pages are
+        added to `pages`.
+        """
+        if eval_num < 0:
+            return None
+        page = eval_num // page_size + 1
+        if page > last_page:
+            return None
+        if page not in pages:
+            pages[page] = self.get_evals_page_num(page)
+
+        evals = pages[page]["evals"]
+        if eval_num % page_size >= len(evals):
+            return None
+        return evals[eval_num % page_size]
+
+    def _find_absolute_eval(
+        self,
+        eval_num: int,
+        pages: Dict[int, dict],
+        page_size: int,
+        last_page: int
+    ) -> Union[dict, None]:
+        """
+        Returns the eval data of an absolute eval_num, or None if it does not
+        exist. Fetched pages are added to `pages`.
+
+        The eval index is used to guess the page of the eval first. Otherwise,
+        the pages are binary searched, which takes O(log pages) requests.
+        """
+        def find_in_page(page: int) -> Union[dict, None]:
+            if page not in pages:
+                pages[page] = self.get_evals_page_num(page)
+            for eval_data in pages[page]["evals"]:
                 if eval_data["id"] == eval_num:
-                    return eval_data["builds"]
-            if "next" in evals_json:
-                return self._get_builds(
-                    eval_num,
-                    evals_json["next"] # query param for next page
-                )
-            else: # if couldn't find ID and there is no next page
-                raise ValueError(f"Unable to find absolute eval_num {eval_num}")
-
-        else: # if not absolute eval number
-            if eval_num >= len(evals_json["evals"]):
-                # check if there is a next page
-                if "next" in evals_json:
-                    return self._get_builds(
-                        eval_num - len(evals_json["evals"]),
-                        evals_json["next"] # query param for next page
-                    )
-                else:
-                    raise IndexError(f"Unable to find relative eval_num {self.eval_num}")
-            self._abs_eval_id = evals_json["evals"][eval_num]["id"] # set absolute id for eval
-            return evals_json["evals"][eval_num]["builds"]
+                    return eval_data
+            return None
+
+        eval_data = find_in_page(1)
+        if eval_data is not None or last_page == 1:
+            return eval_data
+
+        # guess page using eval index, shifted by the number of evals added
+        # before the previous head of the listing
+        index = self._get_eval_index()
+        position = index["positions"].get(str(eval_num))
+        first_ids = [eval_obj["id"] for eval_obj in pages[1]["evals"]]
+        if position is not None and index["head_id"] in first_ids:
+            position += first_ids.index(index["head_id"])
+            page = position // page_size + 1
+            if page <= last_page:
+                eval_data = find_in_page(page)
+                if eval_data is not None:
+                    return eval_data
+
+        # binary search pages, using the direction of the listing
+        if len(first_ids) > 1:
+            descending = first_ids[0] > first_ids[-1]
+        else:
+            find_in_page(last_page)
+            last_ids = [eval_obj["id"] for eval_obj in pages[last_page]["evals"]]
+            descending = len(last_ids) == 0 or first_ids[0] > last_ids[0]
+
+        low, high = 1, last_page
+        while low <= high:
+            mid = (low + high) // 2
+            eval_data = find_in_page(mid)
+            if eval_data is not None:
+                return eval_data
+
+            ids = [eval_obj["id"] for eval_obj in pages[mid]["evals"]]
+            if len(ids) == 0 or min(ids) < eval_num < max(ids):
+                return None # ids are monotonic, so eval does not exist
+            if (eval_num > max(ids)) == descending:
+                high = mid - 1
+            else:
+                low = mid + 1
+        return None
 
     def _download(self) -> List[Dict]:
         """
@@ -176,119 +896,888 @@ class HydraFetcher(Fetcher):
         # get build numbers from eval_num
         build_nums = self._get_builds(self.eval_num)
 
-        # fetch build info and download 'meta.json'
-        data = []
-        for build_num in build_nums:
-            # get build info
-            resp = requests.get(
-                f"https://hydra.vtr.tools/build/{build_num}",
-                headers={"Content-Type": "application/json"},
-            )
-            if resp.status_code != 200:
-                raise Exception(f"Unable to get build {build_num}, got status code {resp.status_code}.")
-            
-            decoded = None
-            try:
-                decoded = resp.json()
-            except json.decoder.JSONDecodeError as err:
-                raise Exception(f"Unable to decode build {build_num} JSON file, {str(err)}")
-                
-            # check if build was successful
-            if decoded.get("buildstatus") != 0:
-                print(f"Warning: Build {build_num} failed with non-zero exit. Skipping...")
-                continue
-
-            # check if meta.json exists
-            meta_json_id = None
-            for product_id, product_desc in decoded.get("buildproducts", {}).items():
-                if product_desc.get("name", "") == "meta.json":
-                    meta_json_id = product_id
-            
-            if meta_json_id is None:
-                print(f"Warning: Build {build_num} does not contain meta.json file. Skipping...")
-                continue
-            
-            # download meta.json
-            resp = requests.get(
-                f"https://hydra.vtr.tools/build/{build_num}/download/{meta_json_id}/meta.json",
-                headers={"Content-Type": "application/json"},
-            )
-            if resp.status_code != 200:
-                print(
-                    "Warning:",
-                    f"Unable to get build {build_num} meta.json file.",
-                )
-                continue
-            try:
-                data.append(resp.json())
-            except json.decoder.JSONDecodeError:
-                print("Warning:", f"Unable to decode build {build_num}")
+        # fetch build info and download 'meta.json', resuming from checkpoint
+        checkpoint = None
+        if self.checkpoint_dir is not None:
+            filename = f"{self.project}-{self.jobset}-{self._abs_eval_id}.jsonl"
+            checkpoint = Checkpoint(os.path.join(self.checkpoint_dir, filename))
+        results = self._download_builds(build_nums, checkpoint)
 
+        data = [result for result in results if result is not None]
         if len(data) == 0:
             raise ValueError(f"Unable to get any successful builds from eval_num {self.eval_num}.")
 
+        if checkpoint is not None:
+            checkpoint.remove()
         return data
 
-    def _check_legacy_icebreaker(self, row):
+    def _download_builds(
+        self,
+        build_nums: List[int],
+        checkpoint: Checkpoint = None
+    ) -> List[Union[Dict, None]]:
         """
-        Returns True if row is from a test on an Icebreaker board before Jul 31,
-        2020.
+        Returns the result of `_download_build()` for each build number, in
+        order. Builds are downloaded concurrently if max_workers is greater
+        than 1.
 
-        This is useful because these legacy tests recorded frequency in MHz
-        instead of Hz, while all other boards record in Hz. This flag can be
-        used to check if the units need to be changed.
+        If a checkpoint is given, builds recorded in it are not downloaded
+        again, and every build with a final result is recorded in it as soon
+        as it finishes. Builds whose meta.json file could not be downloaded
+        are not recorded, so they are downloaded again when resuming.
+        """
+        done = checkpoint.load() if checkpoint is not None else {}
 
-        Parameters
-        ----------
-        row : dict
-            a dictionary that is the result of decoding a meta.json file
+        def download(build_num: int) -> Union[Dict, None]:
+            if build_num in done:
+                return done[build_num]
+            result, final = self._fetch_build(build_num)
+            if checkpoint is not None and final:
+                checkpoint.record(build_num, result)
+            return result
 
-        Returns
-        -------
-        bool
-            Returns true if row is icebreaker board before Aug 1, 2020. False
-            otherwise.
-        """
-        date = None
-        board = None
-        try:
-            date = row["date"] # format: 2020-07-17T22:12:41
-            board = row["board"]
-            timestamp = datetime.strptime(date, "%Y-%m-%dT%H:%M:%S")
-            return timestamp < datetime(2020, 7, 31) and board == "icebreaker"
-        except KeyError:
-            print("Warning: Unable to find date and board in meta.json, required for supporting legacy Icebreaker.")
-            return False # Assume not legacy icebreaker
+        if self.max_workers > 1:
+            # executor.map() yields results in the order of build_nums
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                return list(executor.map(download, build_nums))
+        return [download(build_num) for build_num in build_nums]
 
-    def _preprocess(self, data: List[Dict]) -> pd.DataFrame:
+    def _iter_builds(
+        self,
+        build_nums: List[int],
+        queue_size: int = None
+    ) -> Iterator[Union[Dict, None]]:
         """
-        Using data from _download(), processes and standardizes the data and
-        returns a Pandas DataFrame.
+        Yields the result of `_download_build()` for each build number, in
+        order, as soon as it is available.
+
+        If max_workers is greater than 1, builds are downloaded concurrently,
+        but at most `queue_size` downloads are queued ahead of the consumer,
+        so a slow consumer does not cause all results to be held in memory.
+
+        Parameters
+        ----------
+        build_nums : List[int]
+            The build numbers to download
+        queue_size : int, optional
+            The maximum number of downloads that are queued or finished but not
+            yet yielded, by default twice max_workers
         """
-        flattened_data = [Helpers.flatten(x) for x in data]
+        if self.max_workers <= 1:
+            for build_num in build_nums:
+                yield self._download_build(build_num)
+            return
 
-        processed_data = []
-        for row in flattened_data:
-            legacy_icestorm = self._check_legacy_icebreaker(row)
-            processed_row = {}
-            if self.mapping is None:
-                processed_row = row
+        if queue_size is None:
+            queue_size = self.max_workers * 2
+        build_iter = iter(build_nums)
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            try:
+                for build_num in build_iter:
+                    pending.append(executor.submit(self._download_build, build_num))
+                    if len(pending) >= queue_size:
+                        break
+                while len(pending) > 0:
+                    result = pending.popleft().result()
+                    for build_num in build_iter:
+                        pending.append(executor.submit(self._download_build, build_num))
+                        break
+                    yield result
+            finally:
+                # consumer stopped early or a download failed
+                for future in pending:
+                    future.cancel()
+
+    def _get_meta_json_id(self, build_num: int) -> Union[str, None]:
+        """
+        Fetches the build info of a build and returns the product ID of its
+        meta.json file, or None if the build failed or has no meta.json file.
+
+        Parameters
+        ----------
+        build_num : int
+            The build number to fetch
+
+        Returns
+        -------
+        Union[str, None]
+            The product ID of the meta.json file, or None if the build should
+            be skipped
+
+        Raises
+        ------
+        Exception
+            Raised if the build info cannot be fetched or decoded.
+        """
+        build_key = f"build/{build_num}"
+        decoded = None
+        if self.cache is not None:
+            reason = self.cache.get_negative(build_key)
+            if reason is not None:
+                print(f"Warning: Build {build_num} {reason}. Skipping...")
+                return None
+            decoded = self.cache.get(build_key)
+
+        # only finished builds are cached, since they never change
+        cacheable = False
+        if decoded is None:
+            resp = self.request(f"{self.base_url}/build/{build_num}")
+            if resp.status_code != 200:
+                raise Exception(f"Unable to get build {build_num}, got status code {resp.status_code}.")
+
+            try:
+                decoded = resp.json()
+            except json.decoder.JSONDecodeError as err:
+                raise Exception(f"Unable to decode build {build_num} JSON file, {str(err)}")
+            cacheable = self.cache is not None and decoded.get("finished", 1) == 1
+
+        meta_json_id, reason = Helpers.find_meta_json_product(decoded)
+        if reason is not None:
+            print(f"Warning: Build {build_num} {reason}. Skipping...")
+            if cacheable:
+                self.cache.put_negative(build_key, reason)
+            return None
+
+        if cacheable:
+            self.cache.put(build_key, decoded)
+        return meta_json_id
+
+    def _get_meta_json(self, build_num: int, meta_json_id: str) -> Union[Dict, None]:
+        """
+        Downloads and decodes the meta.json file of a build, returning None if
+        it could not be downloaded or decoded.
+
+        Parameters
+        ----------
+        build_num : int
+            The build number that the meta.json file belongs to
+        meta_json_id : str
+            The product ID of the meta.json file
+
+        Returns
+        -------
+        Union[Dict, None]
+            The decoded meta.json file, or None if the build should be skipped
+        """
+        meta_key = f"meta/{build_num}/{meta_json_id}"
+        if self.cache is not None:
+            cached = self.cache.get(meta_key)
+            if cached is not None:
+                return cached
+
+        resp = self.request(
+            f"{self.base_url}/build/{build_num}/download/{meta_json_id}/meta.json"
+        )
+        if resp.status_code != 200:
+            print(
+                "Warning:",
+                f"Unable to get build {build_num} meta.json file.",
+            )
+            return None
+        try:
+            decoded = resp.json()
+        except json.decoder.JSONDecodeError:
+            print("Warning:", f"Unable to decode build {build_num}")
+            return None
+
+        if self.cache is not None:
+            self.cache.put(meta_key, decoded)
+        return decoded
+
+    def _get_mirrored_build(self, build_num: int) -> Union[Dict, None]:
+        """
+        Returns the meta.json file of a build from the mirror, or None if the
+        build is not in the mirror, failed, or has no meta.json file.
+        """
+        build_info = self._mirror.get_build(build_num)
+        if build_info is None:
+            reason = "is not in the mirror"
+        else:
+            _, reason = Helpers.find_meta_json_product(build_info)
+        if reason is not None:
+            print(f"Warning: Build {build_num} {reason}. Skipping...")
+            return None
+        return self._mirror.get_meta_json(build_num)
+
+    def _fetch_build(self, build_num: int) -> Tuple[Union[Dict, None], bool]:
+        """
+        Returns the result of `_download_build()` for a build, and whether the
+        result is final: True if the meta.json file was downloaded, or if the
+        build failed or has no meta.json file, and False if the meta.json
+        file could not be downloaded now but may be later.
+
+        Raises
+        ------
+        Exception
+            Raised if the build info cannot be fetched or decoded.
+        """
+        if self._mirror is not None:
+            result = self._get_mirrored_build(build_num)
+            # mirrored builds are read locally, so only record found builds
+            return result, result is not None
+        meta_json_id = self._get_meta_json_id(build_num)
+        if meta_json_id is None:
+            return None, True
+        result = self._get_meta_json(build_num, meta_json_id)
+        return result, result is not None
+
+    def _download_build(self, build_num: int) -> Union[Dict, None]:
+        """
+        Returns the decoded meta.json file of a build, or None if the build
+        failed, has no meta.json file, or its meta.json file could not be
+        downloaded.
+
+        Raises
+        ------
+        Exception
+            Raised if the build info cannot be fetched or decoded.
+        """
+        return self._fetch_build(build_num)[0]
+
+    def get_evaluation(self) -> Evaluation:
+        return super().get_evaluation()
+
+    def get_evaluations(self, eval_nums: Iterable[int]) -> List[Evaluation]:
+        """
+        Returns an Evaluation for each eval_num, in order.
+
+        All evals are resolved in a single pass over the evals pages, and each
+        distinct build is downloaded only once, even if it belongs to several
+        of the evals. Builds are downloaded concurrently if max_workers is
+        greater than 1.
+
+        Parameters
+        ----------
+        eval_nums : Iterable[int]
+            The evaluations to fetch, for example `range(20)` for the latest
+            20 evaluations. Interpreted as absolute eval IDs if
+            `absolute_eval_num` is True, otherwise as relative eval numbers.
+
+        Returns
+        -------
+        List[Evaluation]
+            An Evaluation for each eval_num, with its eval ID set
+
+        Raises
+        ------
+        ConnectionError
+            Raised if the HTTP request to get the evaluations fails.
+        IndexError
+            Raised if a relative eval_num is not valid.
+        ValueError
+            Raised if an absolute eval_num cannot be found, or if all builds in
+            one of the evals failed.
+        """
+        evals = self._get_evals(list(eval_nums))
+
+        # download each distinct build once, keeping first-seen order
+        build_nums = list(dict.fromkeys(
+            build_num for eval_data in evals for build_num in eval_data["builds"]
+        ))
+        downloaded = dict(zip(build_nums, self._download_builds(build_nums)))
+
+        evaluations = []
+        for eval_data in evals:
+            data = [
+                downloaded[build_num] for build_num in eval_data["builds"]
+                if downloaded[build_num] is not None
+            ]
+            if len(data) == 0:
+                raise ValueError(f"Unable to get any successful builds from eval {eval_data['id']}.")
+            evaluations.append(self._create_evaluation(self._preprocess(data), eval_data["id"]))
+        return evaluations
+
+    def get_evaluation_iter(
+        self,
+        chunk_size: int = 10,
+        queue_size: int = None
+    ) -> Iterator[Evaluation]:
+        """
+        Yields partial Evaluations that grow as builds are downloaded. The last
+        Evaluation yielded contains all builds of the evaluation.
+
+        Downloaded meta.json files are preprocessed every `chunk_size` builds,
+        so only one chunk of decoded meta.json files is held in memory at a
+        time. This allows results to be shown before the whole evaluation has
+        been downloaded. The columns of the last Evaluation are in the same
+        order as in `get_evaluation()`.
+
+        Each partial Evaluation holds a new dataframe of every build processed
+        so far, so the rows are copied once per partial Evaluation. Use a
+        larger `chunk_size` for large evaluations to copy them fewer times.
+
+        Parameters
+        ----------
+        chunk_size : int, optional
+            The number of successful builds between partial Evaluations, by
+            default 10
+        queue_size : int, optional
+            The maximum number of concurrent downloads queued ahead of the
+            consumer, by default twice max_workers
+
+        Raises
+        ------
+        ConnectionError
+            Raised if `hydra.vtr.tools` returns a non-200 status code when
+            fetching evals.
+
+        IndexError
+            Raised if the specified eval_num is invalid due to it being too
+            large.
+
+        ValueError
+            Raised if all builds in a given eval failed.
+        """
+        build_nums = self._get_builds(self.eval_num)
+
+        # the builds processed so far, with the columns in the order they
+        # first appear, including columns without any values yet
+        processed_df = None
+        has_values = None
+        chunk = []
+        for result in self._iter_builds(build_nums, queue_size):
+            if result is not None:
+                chunk.append(result)
+            if len(chunk) >= chunk_size:
+                processed_df, has_values = self._append_chunk(processed_df, has_values, chunk)
+                chunk = []
+                yield self._create_partial_evaluation(processed_df, has_values)
+
+        if len(chunk) > 0:
+            processed_df, has_values = self._append_chunk(processed_df, has_values, chunk)
+            yield self._create_partial_evaluation(processed_df, has_values)
+
+        if processed_df is None:
+            raise ValueError(f"Unable to get any successful builds from eval_num {self.eval_num}.")
+
+    def _append_chunk(
+        self,
+        processed_df: Union[pd.DataFrame, None],
+        has_values: Union[pd.Series, None],
+        chunk: List[Dict]
+    ) -> Tuple[pd.DataFrame, pd.Series]:
+        """
+        Preprocesses a chunk of decoded meta.json files and appends it to the
+        builds processed so far. Returns the new dataframe, and whether each
+        of its columns has any values.
+
+        Columns are only dropped when a partial Evaluation is created, since
+        a column without values in the first chunks may have values later.
+        New columns are added after the existing ones, in the order they
+        first appear in the chunk, so the columns are in the same order as
+        in `get_evaluation()`.
+        """
+        plan = self._get_extraction_plan()
+        chunk_df = self._preprocess_flattened_df(
+            _create_flattened_df(chunk, plan),
+            (_flatten_meta_json(x, plan) for x in chunk),
+            drop_empty=False
+        )
+        chunk_has_values = chunk_df.notna().any()
+        if processed_df is None:
+            return chunk_df, chunk_has_values
+
+        processed_df = pd.concat([processed_df, chunk_df], ignore_index=True, sort=False)
+        has_values = (
+            has_values.reindex(processed_df.columns, fill_value=False)
+            | chunk_has_values.reindex(processed_df.columns, fill_value=False)
+        )
+        return processed_df, has_values
+
+    def _create_partial_evaluation(
+        self,
+        processed_df: pd.DataFrame,
+        has_values: pd.Series
+    ) -> Evaluation:
+        """
+        Returns an Evaluation of the builds processed so far, without the
+        columns that do not have any values yet.
+        """
+        if not has_values.all():
+            processed_df = processed_df.loc[:, has_values.values]
+        return self._create_evaluation(processed_df, self._abs_eval_id)
+
+
+class AsyncHydraFetcher(HydraFetcher):
+    """
+    Represents an asyncio-based downloader and preprocessor of test results
+    from `hydra.vtr.tools`.
+
+    Behaves like HydraFetcher, but exposes the coroutine
+    `get_evaluation_async()`, which does not block the event loop while
+    downloading. This allows multiple jobsets to be fetched at once, for
+    example using `asyncio.gather()`. Blocking HTTP requests are run in a
+    thread pool, and at most `max_concurrency` requests are in flight at any
+    time.
+
+    Parameters
+    ----------
+    project : str
+        The project name to use when fetching from Hydra
+    jobset : str
+        The jobset name to use when fetching from Hydra
+    eval_num : int, optional
+        An integer that specifies the evaluation to download. Functionality
+        differs depending on whether `absolute_eval_num` is True, by default 0
+    absolute_eval_num : bool, optional
+        Flag that specifies if the eval_num is an absolute identifier instead of
+        a relative identifier, by default False. See HydraFetcher.
+    mapping : dict, optional
+        A dictionary mapping input column names to output
+        column names, if needed for remapping, by default None
+    hydra_clock_names : list, optional
+        An optional ordered list of strings used in finding
+        the actual frequency for each build result, by default None
+    max_concurrency : int, optional
+        The maximum number of HTTP requests in flight at once, by default 8
+    cache : BuildCache, optional
+        A persistent cache of finished builds, by default None. See
+        HydraFetcher.
+    retries : int, optional
+        The number of times a failed request is retried, by default 3
+    backoff_factor : float, optional
+        The base delay in seconds between retries, by default 0.5. See
+        HydraFetcher.
+    timeout : float or Tuple[float, float], optional
+        The connect and read timeouts of each request in seconds, by default
+        (5, 60). See HydraFetcher.
+    compact : bool, optional
+        If True, the Evaluation is stored with compact, lossless dtypes. See
+        Fetcher. By default False
+    base_url : str, optional
+        The URL of the Hydra server, by default "https://hydra.vtr.tools". See
+        HydraFetcher.
+    """
+
+    def __init__(
+        self,
+        project: str,
+        jobset: str,
+        eval_num: int = 0,
+        absolute_eval_num: bool = False,
+        mapping: dict = None,
+        hydra_clock_names: list = None,
+        max_concurrency: int = 8,
+        cache: BuildCache = None,
+        retries: int = 3,
+        backoff_factor: float = 0.5,
+        timeout: Union[float, Tuple[float, float]] = (5, 60),
+        compact: bool = False,
+        base_url: str = "https://hydra.vtr.tools"
+    ) -> None:
+        super().__init__(
+            project,
+            jobset,
+            eval_num=eval_num,
+            absolute_eval_num=absolute_eval_num,
+            mapping=mapping,
+            hydra_clock_names=hydra_clock_names,
+            max_workers=max_concurrency,
+            cache=cache,
+            retries=retries,
+            backoff_factor=backoff_factor,
+            timeout=timeout,
+            compact=compact,
+            base_url=base_url
+        )
+        self.max_concurrency = max_concurrency
+
+    @staticmethod
+    async def _run_bounded(
+        semaphore: asyncio.Semaphore,
+        executor: ThreadPoolExecutor,
+        func: Callable,
+        *args
+    ) -> Any:
+        """
+        Runs a blocking function in the executor once the semaphore allows
+        another request to be in flight, and returns its result.
+        """
+        async with semaphore:
+            loop = asyncio.get_event_loop()
+            return await loop.run_in_executor(executor, func, *args)
+
+    async def _download_build_async(
+        self,
+        semaphore: asyncio.Semaphore,
+        executor: ThreadPoolExecutor,
+        build_num: int
+    ) -> Union[Dict, None]:
+        """
+        Coroutine version of `_download_build()`. The build info and the
+        meta.json file are fetched as two separately bounded requests.
+        """
+        meta_json_id = await self._run_bounded(
+            semaphore, executor, self._get_meta_json_id, build_num
+        )
+        if meta_json_id is None:
+            return None
+        return await self._run_bounded(
+            semaphore, executor, self._get_meta_json, build_num, meta_json_id
+        )
+
+    async def _download_async(self) -> List[Dict]:
+        """
+        Coroutine version of `_download()`, returning a list of decoded
+        meta.json dicts in the order of the builds of the evaluation.
+
+        Raises
+        ------
+        ConnectionError
+            Raised if `hydra.vtr.tools` returns a non-200 status code when
+            fetching evals.
+
+        IndexError
+            Raised if the specified eval_num is invalid due to it being too
+            large.
+
+        ValueError
+            Raised if all builds in a given eval failed.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            # evals pages are fetched one at a time, using a single slot
+            build_nums = await self._run_bounded(
+                semaphore, executor, self._get_builds, self.eval_num
+            )
+
+            tasks = [
+                asyncio.ensure_future(
+                    self._download_build_async(semaphore, executor, build_num)
+                )
+                for build_num in build_nums
+            ]
+            try:
+                results = await asyncio.gather(*tasks)
+            except Exception:
+                # stop scheduling requests for the remaining builds
+                for task in tasks:
+                    task.cancel()
+                raise
+
+        data = [result for result in results if result is not None]
+        if len(data) == 0:
+            raise ValueError(f"Unable to get any successful builds from eval_num {self.eval_num}.")
+
+        return data
+
+    async def get_evaluation_async(self) -> Evaluation:
+        """
+        Coroutine that returns an Evaluation that represents the fetched data.
+        """
+        data = await self._download_async()
+        preprocessed_df = self._preprocess(data)
+        return self._create_evaluation(preprocessed_df, self._abs_eval_id)
+
+    @staticmethod
+    def _is_loop_running() -> bool:
+        """
+        Returns True if an event loop is running in the current thread, as in
+        a Jupyter notebook.
+        """
+        try:
+            asyncio.get_running_loop()
+        except AttributeError:
+            # asyncio.get_running_loop() was added in Python 3.7
+            return asyncio.get_event_loop().is_running()
+        except RuntimeError:
+            return False
+        return True
+
+    def _run_in_new_loop(self) -> Evaluation:
+        """
+        Runs `get_evaluation_async()` to completion in a new event loop.
+        """
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(self.get_evaluation_async())
+        finally:
+            loop.close()
+
+    def get_evaluation(self) -> Evaluation:
+        """
+        Returns an Evaluation that represents the fetched data, running
+        `get_evaluation_async()` in a new event loop.
+
+        If an event loop is already running in the calling thread, as in a
+        Jupyter notebook, the new loop is run in a worker thread and this
+        method blocks until it finishes. In a coroutine, use
+        `await get_evaluation_async()` instead, which does not block the
+        running loop.
+        """
+        if self._is_loop_running():
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                return executor.submit(self._run_in_new_loop).result()
+        return self._run_in_new_loop()
+
+
+class LocalDirectoryFetcher(MetaJSONFetcher):
+    """
+    Represents a loader and preprocessor of test results from meta.json files
+    in a local directory tree, such as the output directory of fpga-tool-perf.
+
+    The tree is walked in sorted order, and the files are decoded and
+    flattened in a process pool. The files are preprocessed like those
+    downloaded by HydraFetcher, using the same mapping, clock names and
+    legacy Icebreaker unit fix.
+
+    The fetcher remembers the modification time and size of each file it has
+    parsed, so calling `get_evaluation()` again only parses files that were
+    added or changed since the previous call.
+
+    Parameters
+    ----------
+    path : str
+        The path of the directory to search for meta.json files
+    filename : str, optional
+        The name of the files to load, which may be a glob pattern such as
+        "meta*.json", by default "meta.json"
+    mapping : dict, optional
+        A dictionary mapping input column names to output
+        column names, if needed for remapping, by default None
+    hydra_clock_names : list, optional
+        An optional ordered list of strings used in finding
+        the actual frequency for each build result, by default None
+    max_workers : int, optional
+        The number of worker processes used to parse files. If None, the
+        number of CPUs is used. If 1, files are parsed in this process.
+        By default None
+    compact : bool, optional
+        If True, the Evaluation is stored with compact, lossless dtypes. See
+        Fetcher. By default False
+    """
+
+    def __init__(
+        self,
+        path: str,
+        filename: str = "meta.json",
+        mapping: dict = None,
+        hydra_clock_names: list = None,
+        max_workers: int = None,
+        compact: bool = False
+    ) -> None:
+        super().__init__(
+            mapping=mapping, hydra_clock_names=hydra_clock_names, compact=compact
+        )
+        self.path = path
+        self.filename = filename
+        self.max_workers = max_workers
+        # path -> ((mtime_ns, size), flattened meta.json or None)
+        self._parsed = {}
+        self._parsed_plan = None
+
+    def _find_files(self) -> List[str]:
+        """
+        Returns the paths of the files in the directory tree that match
+        `filename`, in sorted order.
+        """
+        if not os.path.isdir(self.path):
+            raise ValueError(f"Unable to find directory {self.path}.")
+        paths = []
+        for dirpath, dirnames, filenames in os.walk(self.path):
+            dirnames.sort() # walk subdirectories in sorted order
+            for filename in sorted(filenames):
+                if fnmatch.fnmatch(filename, self.filename):
+                    paths.append(os.path.join(dirpath, filename))
+        return paths
+
+    def _parse_files(self, paths: List[str], plan: Union[dict, None]) -> List[Union[Dict, None]]:
+        """
+        Returns the flattened meta.json file at each path, or None for files
+        that cannot be decoded, parsing the files in a process pool.
+        """
+        if self.max_workers == 1 or len(paths) <= 1:
+            return [_load_meta_json(path, plan) for path in paths]
+
+        max_workers = self.max_workers or os.cpu_count() or 1
+        # send several files to each task to limit the overhead per file
+        chunksize = max(1, len(paths) // (4 * max_workers))
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(
+                _load_meta_json, paths, [plan] * len(paths), chunksize=chunksize
+            ))
+
+    def _download(self) -> List[Dict]:
+        """
+        Returns a list of flattened meta.json files found in the directory
+        tree, parsing only the files that changed since the previous call.
+
+        Raises
+        ------
+        ValueError
+            Raised if the directory does not exist or contains no meta.json
+            files that can be decoded.
+        """
+        plan = self._get_extraction_plan()
+        if plan != self._parsed_plan:
+            # the mapping changed, so the parsed files select the wrong keys
+            self._parsed = {}
+            self._parsed_plan = plan
+
+        signatures = {}
+        for path in self._find_files():
+            try:
+                stat = os.stat(path)
+            except OSError: # removed while walking
+                continue
+            signatures[path] = (stat.st_mtime_ns, stat.st_size)
+
+        changed = [
+            path for path, signature in signatures.items()
+            if path not in self._parsed or self._parsed[path][0] != signature
+        ]
+        for path, result in zip(changed, self._parse_files(changed, plan)):
+            self._parsed[path] = (signatures[path], result)
+        # forget files that were removed
+        self._parsed = {path: self._parsed[path] for path in signatures}
+
+        data = []
+        for path, (_, result) in self._parsed.items():
+            if result is None:
+                print(f"Warning: Unable to decode {path}. Skipping...")
             else:
-                for in_col_name, out_col_name in self.mapping.items():
-                    processed_row[out_col_name] = row[in_col_name]
-
-            actual_freq = Helpers.get_actual_freq(row, self.hydra_clock_names)
-            if actual_freq:
-                if legacy_icestorm:
-                    # freq in MHz, no change needed
-                    processed_row["freq"] = actual_freq
-                else:
-                    processed_row["freq"] = actual_freq / 1_000_000 # convert hz to mhz
-            processed_row.update(Helpers.get_versions(row))
-            processed_data.append(processed_row)
-
-        return pd.DataFrame(processed_data).dropna(axis=1, how="all")
-    
+                data.append(result)
+        if len(data) == 0:
+            raise ValueError(f"Unable to find any {self.filename} files in {self.path}.")
+        return data
+
+    def _preprocess(self, data: List[Dict]) -> pd.DataFrame:
+        """
+        Processes the flattened meta.json files from _download() and returns
+        a Pandas DataFrame.
+        """
+        return self._preprocess_flattened(data)
+
+    def get_evaluation(self) -> Evaluation:
+        return super().get_evaluation()
+
+
+class ArchiveFetcher(MetaJSONFetcher):
+    """
+    Represents a loader and preprocessor of test results from meta.json files
+    in an archive, such as a CI artifact bundle.
+
+    Tar archives (optionally compressed with gzip, bz2 or xz) and zip archives
+    are read as streams: each matching member is decoded as it is read, and
+    nothing is extracted to disk. Members that are themselves compressed with
+    gzip, bz2 or xz, such as `meta.json.gz`, are decompressed transparently.
+    The path may also be a single, optionally compressed, meta.json file. The
+    files are preprocessed like those downloaded by HydraFetcher, in the order
+    in which they appear in the archive.
+
+    Parameters
+    ----------
+    path : str
+        The path of the archive or file
+    filename : str, optional
+        The name of the members to load, which may be a glob pattern such as
+        "meta*.json". Compression extensions are ignored when matching, so
+        "meta.json" also matches "meta.json.gz". By default "meta.json"
+    mapping : dict, optional
+        A dictionary mapping input column names to output
+        column names, if needed for remapping, by default None
+    hydra_clock_names : list, optional
+        An optional ordered list of strings used in finding
+        the actual frequency for each build result, by default None
+    compact : bool, optional
+        If True, the Evaluation is stored with compact, lossless dtypes. See
+        Fetcher. By default False
+    """
+
+    def __init__(
+        self,
+        path: str,
+        filename: str = "meta.json",
+        mapping: dict = None,
+        hydra_clock_names: list = None,
+        compact: bool = False
+    ) -> None:
+        super().__init__(
+            mapping=mapping, hydra_clock_names=hydra_clock_names, compact=compact
+        )
+        self.path = path
+        self.filename = filename
+
+    def _matches(self, name: str) -> bool:
+        """
+        Returns True if the base name of the member matches `filename`,
+        ignoring any compression extension.
+        """
+        basename = os.path.basename(name)
+        root, ext = os.path.splitext(basename)
+        if ext in _COMPRESSION_OPENERS:
+            basename = root
+        return fnmatch.fnmatch(basename, self.filename)
+
+    def _iter_members(self) -> Iterator[Tuple[str, IO[bytes]]]:
+        """
+        Yields the name and a binary file object of each matching member of
+        the archive. Each file object is only valid until the next member is
+        yielded.
+        """
+        if zipfile.is_zipfile(self.path):
+            with zipfile.ZipFile(self.path) as archive:
+                for info in archive.infolist():
+                    if not info.is_dir() and self._matches(info.filename):
+                        with archive.open(info) as f:
+                            yield info.filename, f
+        elif tarfile.is_tarfile(self.path):
+            # stream mode reads the archive once, without seeking
+            with tarfile.open(self.path, "r|*") as archive:
+                for member in archive:
+                    if member.isfile() and self._matches(member.name):
+                        yield member.name, archive.extractfile(member)
+        else:
+            with open(self.path, "rb") as f:
+                yield self.path, f
+
+    @staticmethod
+    def _decode(name: str, f: IO[bytes]) -> Union[Dict, None]:
+        """
+        Returns the decoded meta.json file, decompressing it according to the
+        extension of its name, or None if it cannot be decoded.
+        """
+        opener = _COMPRESSION_OPENERS.get(os.path.splitext(name)[1])
+        try:
+            if opener is None:
+                meta_json = json.load(f)
+            else:
+                with opener(f) as decompressed:
+                    meta_json = json.load(decompressed)
+        except (OSError, EOFError, ValueError):
+            return None
+        return meta_json if isinstance(meta_json, dict) else None
+
+    def _download(self) -> List[Dict]:
+        """
+        Returns a list of flattened meta.json files read from the archive.
+
+        Raises
+        ------
+        ValueError
+            Raised if the archive contains no meta.json files that can be
+            decoded.
+        """
+        plan = self._get_extraction_plan()
+        data = []
+        for name, f in self._iter_members():
+            meta_json = self._decode(name, f)
+            if meta_json is None:
+                print(f"Warning: Unable to decode {name}. Skipping...")
+            else:
+                data.append(_flatten_meta_json(meta_json, plan))
+        if len(data) == 0:
+            raise ValueError(f"Unable to find any {self.filename} files in {self.path}.")
+        return data
+
+    def _preprocess(self, data: List[Dict]) -> pd.DataFrame:
+        """
+        Processes the flattened meta.json files from _download() and returns
+        a Pandas DataFrame.
+        """
+        return self._preprocess_flattened(data)
+
     def get_evaluation(self) -> Evaluation:
         return super().get_evaluation()
 
@@ -305,13 +1794,39 @@ class JSONFetcher(Fetcher):
     mapping : dict, optional
         An optional dictionary mapping input column names to output
         column names., by default None
+
+    compact : bool, optional
+        If True, the Evaluation is stored with compact, lossless dtypes. See
+        Fetcher. By default False
+
+    lines : bool, optional
+        If True, the file is read as JSON Lines, with one test result object
+        per line, by default False
+
+    chunksize : int, optional
+        The number of lines read at a time if `lines` is True. Each chunk is
+        projected using the mapping, and compacted if `compact` is True,
+        before the next chunk is read, so memory used while reading depends on
+        the chunk size rather than the file size. If None, the whole file is
+        read at once. By default None
     """
 
-    def __init__(self, path: str, mapping: dict = None) -> None:
+    def __init__(
+        self,
+        path: str,
+        mapping: dict = None,
+        compact: bool = False,
+        lines: bool = False,
+        chunksize: int = None
+    ) -> None:
 
-        super().__init__()
+        super().__init__(compact=compact)
+        if chunksize is not None and not lines:
+            raise ValueError("chunksize can only be used if lines is True.")
         self.path = path
         self.mapping = mapping
+        self.lines = lines
+        self.chunksize = chunksize
 
     def _download(self) -> str:
         """
@@ -324,13 +1839,214 @@ class JSONFetcher(Fetcher):
         Given the path, load the data in pandas, process the data, and return
         the resulting dataframe.
         """
-        loaded_df = pd.read_json(path)
+        if self.lines:
+            chunks = [
+                Helpers.compact_df(x) if self.compact else x
+                for x in self._iter_lines(path)
+            ]
+            if len(chunks) == 0:
+                return pd.DataFrame()
+            return pd.concat(chunks, ignore_index=True)
+
         if self.mapping is None:
-            return loaded_df
+            return pd.read_json(path)
+
+        loaded_df = self._read_projected_json(path)
+        if loaded_df is None:
+            loaded_df = pd.read_json(path)
+        return loaded_df.filter(items=self.mapping.keys()).rename(
+            columns=self.mapping
+        )
+
+    def _read_projected_json(self, path: str) -> Union[pd.DataFrame, None]:
+        """
+        Loads only the columns of the JSON file that are in the mapping, so
+        that pandas does not need to build and infer the types of columns that
+        are discarded.
+
+        Returns None if the file cannot be projected, such as when it is not
+        a local file, is not in the column-oriented format written by
+        DataFrame.to_json(), or cannot be decompressed, in which case the
+        whole file should be loaded, so that pandas raises the same errors as
+        without a mapping.
+        """
+        if not isinstance(path, (str, os.PathLike)):
+            return None
+        path = os.fspath(path)
+        if not os.path.isfile(path):
+            return None
+
+        opener = _COMPRESSION_OPENERS.get(os.path.splitext(path)[1], open)
+        try:
+            with opener(path, "rt") as f:
+                decoded = json.load(f)
+        except (ValueError, OSError, EOFError):
+            # other compressions or formats, and corrupt or truncated files,
+            # are left to pandas
+            return None
+        if not isinstance(decoded, dict) or not all(
+            isinstance(x, dict) for x in decoded.values()
+        ):
+            return None
+
+        # pandas also infers the types of the column names, which are left
+        # to pandas unless they stay strings
+        names = pd.Index(list(decoded), dtype=object)
+        converted_names = _convert_json_dates(names)
+        if converted_names is not None or not names.equals(_convert_json_values(names)):
+            return None
+
+        projected = {k: decoded[k] for k in self.mapping if k in decoded}
+        return _create_json_df(projected)
+
+    def _iter_lines(self, path: str) -> Iterator[pd.DataFrame]:
+        """
+        Yields dataframes of at most `chunksize` lines of the JSON Lines file,
+        projected using the mapping.
+        """
+        if self.chunksize is None:
+            chunks = [pd.read_json(path, lines=True)]
+            reader = None
         else:
-            return loaded_df.filter(items=self.mapping.keys()).rename(
-                columns=self.mapping
-            )
+            reader = pd.read_json(path, lines=True, chunksize=self.chunksize)
+            chunks = reader
+
+        try:
+            for chunk in chunks:
+                if self.mapping is not None:
+                    chunk = chunk.filter(items=self.mapping.keys()).rename(
+                        columns=self.mapping
+                    )
+                yield chunk
+        finally:
+            if reader is not None:
+                reader.close()
+
+    def get_chunk_iter(self) -> Iterator[Evaluation]:
+        """
+        Yields an Evaluation for each chunk of the file, so that files larger
+        than memory can be processed one chunk at a time.
+
+        If `lines` is True, each Evaluation contains at most `chunksize` test
+        results, and rows are numbered from the start of the file. Otherwise,
+        a single Evaluation of the whole file is yielded.
+        """
+        path = self._download()
+        if not self.lines:
+            yield self._create_evaluation(self._preprocess(path), self._abs_eval_id)
+            return
+        for chunk in self._iter_lines(path):
+            yield self._create_evaluation(chunk, self._abs_eval_id)
+
+    def get_evaluation(self) -> Evaluation:
+        return super().get_evaluation()
+
+
+class ParquetFetcher(Fetcher):
+    """
+    Represents a loader of test results from a Parquet file written by
+    `Evaluation.to_parquet()`.
+
+    The eval_id, index levels and dtypes stored in the file are restored. Only
+    the columns in `mapping` are read, and rows are filtered while the file is
+    read, so row groups without matching rows are skipped. Requires pyarrow.
+
+    Parameters
+    ----------
+    path : str
+        A string file path pointing to the Parquet file.
+
+    mapping : dict, optional
+        An optional dictionary mapping input column names to output
+        column names. If specified, only these columns are read, by default
+        None
+
+    filters : list, optional
+        A list of row predicates that a test result must satisfy to be loaded.
+        Each predicate is either a string such as `"toolchain == 'vpr'"` or a
+        tuple such as `("toolchain", "==", "vpr")`. The supported operators are
+        `==`, `!=`, `<`, `<=`, `>`, `>=`, `in` and `not in`. Columns are named
+        as in the file, before mapping. By default None
+
+    compact : bool, optional
+        If True, the Evaluation is stored with compact, lossless dtypes. See
+        Fetcher. By default False
+    """
+
+    _FILTER_PATTERN = re.compile(r"^\s*([^\s=!<>]+)\s*(==|!=|<=|>=|<|>|not in|in)\s*(.+?)\s*$")
+
+    def __init__(
+        self,
+        path: str,
+        mapping: dict = None,
+        filters: list = None,
+        compact: bool = False
+    ) -> None:
+        super().__init__(compact=compact)
+        self.path = path
+        self.mapping = mapping
+        self.filters = filters
+
+    def _download(self) -> str:
+        """
+        Returns the path of the Parquet file.
+        """
+        return self.path
+
+    def _get_filters(self) -> Union[List[tuple], None]:
+        """
+        Returns the filters in the format used by pyarrow.
+
+        Raises
+        ------
+        ValueError
+            Raised if a filter string cannot be parsed.
+        """
+        if not self.filters:
+            return None
+
+        parsed = []
+        for predicate in self.filters:
+            if isinstance(predicate, str):
+                match = self._FILTER_PATTERN.match(predicate)
+                if match is None:
+                    raise ValueError(f"Unable to parse filter {predicate}.")
+                column, op, literal = match.groups()
+                try:
+                    value = ast.literal_eval(literal)
+                except (ValueError, SyntaxError):
+                    raise ValueError(f"Unable to parse value in filter {predicate}.")
+                predicate = (column, op, value)
+            column, op, value = predicate
+            if op in ("in", "not in"):
+                value = list(value)
+            parsed.append((column, op, value))
+        return parsed
+
+    def _preprocess(self, path: str) -> pd.DataFrame:
+        """
+        Given the path, read the selected columns and rows, and return the
+        resulting dataframe.
+        """
+        pa = Helpers.import_pyarrow()
+
+        columns = None
+        if self.mapping is not None:
+            schema = pa.parquet.read_schema(path)
+            columns = [k for k in self.mapping.keys() if k in schema.names]
+
+        table = pa.parquet.read_table(
+            path,
+            columns=columns,
+            filters=self._get_filters(),
+            use_pandas_metadata=True
+        )
+        self._abs_eval_id = Helpers.get_arrow_metadata(table.schema).get("eval_id")
+
+        loaded_df = table.to_pandas()
+        if self.mapping is None:
+            return loaded_df
+        return loaded_df.rename(columns=self.mapping)
 
     def get_evaluation(self) -> Evaluation:
         return super().get_evaluation()
@@ -1,6 +1,10 @@
 """ Defines helper functions useful for classes """
-from typing import Union, Any, Tuple
+import json
+import re
+from typing import Any, Dict, Iterable, List, Tuple, Union
 
+import numpy as np
+import pandas as pd
 from ftpvl import settings
 from matplotlib.colors import Colormap
 
@@ -30,17 +34,255 @@ def flatten(input_dict: dict) -> dict:
     {"a.b": "c"}
     """
     new_dict = {}
-    for k_1, v_1 in input_dict.items():
-        if isinstance(v_1, dict):
-            result = flatten(v_1)
-            for k_2, v_2 in result.items():
-                combined_key = f"{k_1}.{k_2}"
-                new_dict[combined_key] = v_2
+    _flatten_into(input_dict, "", new_dict)
+    return new_dict
+
+
+def _flatten_into(input_dict: dict, prefix: str, output_dict: dict) -> None:
+    """
+    Writes the flattened items of input_dict into output_dict, prefixing each
+    key with prefix. Writing into a single dictionary avoids copying the keys
+    of nested dictionaries once per level.
+    """
+    for key, value in input_dict.items():
+        if isinstance(value, dict):
+            _flatten_into(value, f"{prefix}{key}.", output_dict)
         else:
-            new_dict[k_1] = v_1
+            output_dict[f"{prefix}{key}"] = value
+
+
+def get_extraction_plan(keys: Iterable[str]) -> dict:
+    """
+    Given a list of flattened keys, return a plan that can be passed to
+    extract() to flatten only the parts of a nested dictionary that are
+    needed to produce those keys.
+
+    Each key is a period-delimited path. A path segment of `*` matches any
+    key at that level. If the value at the end of a path is a dictionary,
+    its whole subtree is extracted.
+
+    Parameters
+    ----------
+    keys : Iterable[str]
+        the flattened keys to extract
+
+    Returns
+    -------
+    dict
+        a tree of path segments, where True marks a subtree that is extracted
+        as a whole
+
+    Examples
+    --------
+    >>> get_extraction_plan(["resources.LUT", "max_freq.*.actual"])
+    {"resources": {"LUT": True}, "max_freq": {"*": {"actual": True}}}
+    """
+    plan = {}
+    for key in keys:
+        node = {}
+        for segment in reversed(key.split(".")):
+            node = {segment: node if node else True}
+        plan = _merge_plans(plan, node)
+    return _distribute_wildcards(plan)
+
+
+def _merge_plans(a: Union[dict, bool], b: Union[dict, bool]) -> Union[dict, bool]:
+    """
+    Returns a plan that extracts the keys extracted by either plan.
+    """
+    if a is True or b is True:
+        return True
+    merged = dict(a)
+    for key, value in b.items():
+        merged[key] = _merge_plans(merged[key], value) if key in merged else value
+    return merged
+
+
+def _distribute_wildcards(plan: Union[dict, bool]) -> Union[dict, bool]:
+    """
+    Merges the plan for `*` into the plans of its explicit siblings, so that
+    extract() only needs to look up one plan per key.
+    """
+    if plan is True:
+        return True
+    wildcard = plan.get("*")
+    distributed = {}
+    for key, value in plan.items():
+        if wildcard is not None and key != "*":
+            value = _merge_plans(value, wildcard)
+        distributed[key] = _distribute_wildcards(value)
+    return distributed
+
+
+def extract(input_dict: dict, plan: dict) -> dict:
+    """
+    Given an input dictionary that may contain nested dictionaries and a plan
+    from get_extraction_plan(), return a flattened dictionary of only the
+    keys selected by the plan.
+
+    Unlike flatten(), only the nested dictionaries on a planned path are
+    visited, so the cost depends on the number of selected keys rather than
+    the size of the input dictionary. Keys that are in the plan but not in
+    the input dictionary are left out of the output.
+
+    Parameters
+    ----------
+    input_dict : dict
+        a potentially-nested dictionary
+
+    plan : dict
+        a plan returned by get_extraction_plan()
+
+    Returns
+    -------
+    dict
+        a new flattened dictionary, with the same keys and values as the
+        output of flatten() for the planned paths
+
+    Examples
+    --------
+    >>> extract({"a": {"b": "c", "d": "e"}}, get_extraction_plan(["a.b"]))
+    {"a.b": "c"}
+    """
+    new_dict = {}
+    _extract_into(input_dict, plan, "", new_dict)
     return new_dict
 
 
+def _extract_into(input_dict: dict, plan: dict, prefix: str, output_dict: dict) -> None:
+    """
+    Writes the items of input_dict selected by plan into output_dict,
+    prefixing each key with prefix.
+    """
+    if "*" in plan:
+        wildcard = plan["*"]
+        items = ((key, value, plan.get(key, wildcard)) for key, value in input_dict.items())
+    else:
+        items = (
+            (key, input_dict[key], subplan)
+            for key, subplan in plan.items() if key in input_dict
+        )
+
+    for key, value, subplan in items:
+        if not isinstance(value, dict):
+            output_dict[f"{prefix}{key}"] = value
+        elif subplan is True:
+            _flatten_into(value, f"{prefix}{key}.", output_dict)
+        else:
+            _extract_into(value, subplan, f"{prefix}{key}.", output_dict)
+
+
+def flatten_columns(records: List[dict], plan: Union[dict, None] = None) -> Dict[str, list]:
+    """
+    Given a list of dictionaries that may contain nested dictionaries, return
+    their flattened items as columns: a dictionary mapping each flattened key
+    to a list with the value of that key in each record, or NaN if the
+    record does not have the key.
+
+    The result has the same keys and values, in the same order, as building
+    a column for each key of the records flattened with flatten(), or with
+    extract() if a plan is given. The records are visited in a single pass
+    that writes each value straight into its column, and the flattened key
+    of each nested key is only built once.
+
+    Parameters
+    ----------
+    records : List[dict]
+        a list of potentially-nested dictionaries
+
+    plan : Union[dict, None], optional
+        a plan returned by get_extraction_plan() to only flatten the selected
+        keys, or None to flatten every key, by default None
+
+    Returns
+    -------
+    Dict[str, list]
+        a list of values for each flattened key, in the order of the records
+
+    Examples
+    --------
+    >>> flatten_columns([{"a": {"b": "c"}}, {"a": {"b": "d"}, "e": "f"}])
+    {"a.b": ["c", "d"], "e": [nan, "f"]}
+    """
+    columns = {}
+    node = _ColumnNode(True if plan is None else plan, "", columns, len(records))
+    for row, record in enumerate(records):
+        _flatten_row_into(record, node, row)
+    return columns
+
+
+class _ColumnNode:
+    """
+    The columns of one level of nested dictionaries in flatten_columns(). The
+    column of each key, or the node of each nested dictionary, is looked up
+    on first use and cached, with None for the keys that are not planned.
+    """
+
+    def __init__(
+        self,
+        plan: Union[dict, bool],
+        prefix: str,
+        output_columns: Dict[str, list],
+        num_records: int
+    ):
+        self.plan = plan
+        self.prefix = prefix
+        self.output_columns = output_columns
+        self.num_records = num_records
+        self.columns = {}
+        self.children = {}
+
+    def _get_subplan(self, key: str) -> Union[dict, bool, None]:
+        if self.plan is True:
+            return True
+        return self.plan.get(key, self.plan.get("*"))
+
+    def add_column(self, key: str) -> Union[list, None]:
+        column = None
+        if self._get_subplan(key) is not None:
+            # keys of different nested dictionaries may flatten to the same key
+            column = self.output_columns.setdefault(
+                f"{self.prefix}{key}", [np.nan] * self.num_records
+            )
+        self.columns[key] = column
+        return column
+
+    def add_child(self, key: str) -> Union["_ColumnNode", None]:
+        child = None
+        subplan = self._get_subplan(key)
+        if subplan is not None:
+            child = _ColumnNode(
+                subplan, f"{self.prefix}{key}.", self.output_columns, self.num_records
+            )
+        self.children[key] = child
+        return child
+
+
+# placeholder for keys that have not been seen by a _ColumnNode
+_UNSEEN = object()
+
+
+def _flatten_row_into(input_dict: dict, node: _ColumnNode, row: int) -> None:
+    """
+    Writes the flattened items of input_dict into the row of the columns of
+    node.
+    """
+    columns = node.columns
+    for key, value in input_dict.items():
+        if isinstance(value, dict):
+            child = node.children.get(key, _UNSEEN)
+            if child is _UNSEEN:
+                child = node.add_child(key)
+            if child is not None:
+                _flatten_row_into(value, child, row)
+        else:
+            column = columns.get(key, _UNSEEN)
+            if column is _UNSEEN:
+                column = node.add_column(key)
+            if column is not None:
+                column[row] = value
+
+
 def get_versions(obj: dict) -> dict:
     """
     Given a flattened object decoded from meta.json, return a dictionary of
@@ -113,6 +355,255 @@ def get_actual_freq(obj: dict, hydra_clock_names: list = None) -> Union[int, flo
             return None
 
 
+def get_actual_freq_column(
+    df: pd.DataFrame,
+    hydra_clock_names: list = None
+) -> Union[pd.Series, None]:
+    """
+    Given a dataframe of flattened objects decoded from meta.json, return the
+    actual frequency of each row as a series.
+
+    This is the columnar equivalent of get_actual_freq(). The clock columns
+    are resolved once for the whole dataframe: for each row, the frequency is
+    taken from the unnested `max_freq` column, then from the first clock name
+    in hydra_clock_names, and then from the shortest clock name, skipping
+    columns that have no value in that row.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        A dataframe with a row for each decoded and flattened meta.json file
+
+    hydra_clock_names : list, optional
+        An ordered list of clock names to look for in the columns, by default
+        None
+
+    Returns
+    -------
+    Union[pd.Series, None]
+        the frequency of the actual clock of each row, or None if there are no
+        frequency columns
+    """
+    # set default clock names
+    if hydra_clock_names is None:
+        hydra_clock_names = settings.default_hydra_clock_names
+
+    # order candidate columns by priority
+    candidates = []
+    if "max_freq" in df.columns:
+        candidates.append("max_freq")
+    for clock_name in hydra_clock_names:
+        key = f"max_freq.{clock_name}.actual"
+        if key in df.columns and key not in candidates:
+            candidates.append(key)
+    max_freq_keys = [
+        x for x in df.columns
+        if x.startswith("max_freq.") and x.endswith(".actual") and x not in candidates
+    ]
+    candidates.extend(sorted(max_freq_keys, key=len))
+
+    if len(candidates) == 0:
+        return None
+    actual_freq = df[candidates[0]]
+    for key in candidates[1:]:
+        actual_freq = actual_freq.where(actual_freq.notna(), df[key])
+    return actual_freq.rename(None)
+
+
+def find_meta_json_product(build_info: dict) -> Tuple[Union[str, None], Union[str, None]]:
+    """
+    Given the decoded build info of a Hydra build, return the product ID of
+    its meta.json file.
+
+    Parameters
+    ----------
+    build_info : dict
+        the decoded build info returned by Hydra
+
+    Returns
+    -------
+    Tuple[Union[str, None], Union[str, None]]
+        the product ID of the meta.json file and None, or None and the reason
+        the build should be skipped if it failed or has no meta.json file
+    """
+    if build_info.get("buildstatus") != 0:
+        return None, "failed with non-zero exit"
+    meta_json_id = None
+    for product_id, product_desc in build_info.get("buildproducts", {}).items():
+        if product_desc.get("name", "") == "meta.json":
+            meta_json_id = product_id
+    if meta_json_id is None:
+        return None, "does not contain meta.json file"
+    return meta_json_id, None
+
+
+def get_page_num(params: Union[str, None]) -> Union[int, None]:
+    """
+    Given a pagination query string of a Hydra evals page, such as `?page=2`,
+    return its 1-based page number.
+
+    Parameters
+    ----------
+    params : Union[str, None]
+        the query string, such as the `last` link of an evals page
+
+    Returns
+    -------
+    Union[int, None]
+        the page number, or None if params is None
+    """
+    if params is None:
+        return None
+    match = re.search(r"page=(\d+)", params)
+    return int(match.group(1)) if match else 1
+
+
+def compact_df(df: pd.DataFrame, max_category_ratio: float = 0.5) -> pd.DataFrame:
+    """
+    Given a dataframe, return a copy that uses less memory by storing each
+    column with the smallest dtype that represents it without loss.
+
+    Columns are compacted as follows:
+
+    - String columns of numbers, such as resource counts, are parsed if every
+      string is written the way the parsed number is, so "24" and "3.5" are
+      parsed but "024" and "0.10" are not.
+    - Integer columns are downcast to the smallest signed integer type.
+    - Float columns are downcast to float32 if no value changes.
+    - String columns with at most max_category_ratio unique values per row,
+      such as project, device, toolchain and board, become categorical.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        the dataframe to compact
+
+    max_category_ratio : float, optional
+        the largest ratio of unique values to non-null values for which a
+        string column becomes categorical, by default 0.5
+
+    Returns
+    -------
+    pd.DataFrame
+        a new dataframe with the same values and compact dtypes
+    """
+    if len(df.columns) == 0:
+        return df.copy()
+    columns = [
+        _compact_series(df.iloc[:, i], max_category_ratio) for i in range(len(df.columns))
+    ]
+    return pd.concat(columns, axis=1)
+
+
+def _compact_series(series: pd.Series, max_category_ratio: float) -> pd.Series:
+    """
+    Returns a copy of series stored with the smallest lossless dtype.
+    """
+    if series.dtype == object:
+        values = series.dropna()
+        if len(values) == 0:
+            return series.copy()
+        parsed = _parse_numbers(values)
+        if parsed is not None and len(values) == len(series):
+            series = parsed
+        elif parsed is not None:
+            # missing values become NaN, like numbers missing from meta.json
+            full = np.full(len(series), np.nan)
+            full[series.notna().to_numpy()] = parsed.to_numpy(dtype=float)
+            series = pd.Series(full, index=series.index, name=series.name)
+        elif all(isinstance(x, str) for x in values):
+            if values.nunique() <= max_category_ratio * len(values):
+                return series.astype("category")
+            return series.copy()
+        else:
+            return series.copy()
+
+    if pd.api.types.is_bool_dtype(series.dtype):
+        return series.copy()
+    if pd.api.types.is_integer_dtype(series.dtype):
+        return pd.to_numeric(series, downcast="integer")
+    if pd.api.types.is_float_dtype(series.dtype) and series.dtype.itemsize > 4:
+        downcast = series.astype("float32")
+        if ((downcast.astype(series.dtype) == series) | series.isna()).all():
+            return downcast
+    return series.copy()
+
+
+def _parse_numbers(values: pd.Series) -> Union[pd.Series, None]:
+    """
+    Returns values parsed as numbers, or None if any value is not a number or
+    a string that is written the way its parsed number is.
+    """
+    if any(isinstance(x, bool) or not isinstance(x, (str, int, float)) for x in values):
+        return None
+    parsed = pd.to_numeric(values, errors="coerce")
+    if parsed.isna().any():
+        return None
+    for value, number in zip(values, parsed):
+        if isinstance(value, str) and value not in _format_number(number):
+            return None
+    return parsed
+
+
+def _format_number(number: Union[int, float]) -> Tuple[str, ...]:
+    """
+    Returns the ways a parsed number can be written without losing
+    information.
+    """
+    number = float(number)
+    if number.is_integer():
+        return (str(int(number)), repr(number))
+    return (repr(number),)
+
+
+def import_pyarrow() -> Any:
+    """
+    Returns the pyarrow module with its parquet submodule imported.
+
+    pyarrow is an optional dependency that is only needed to store
+    Evaluations in Arrow and Parquet files.
+
+    Raises
+    ------
+    ImportError
+        Raised if pyarrow is not installed.
+    """
+    try:
+        import pyarrow
+        import pyarrow.parquet # pylint: disable=unused-import
+    except ImportError as e:
+        raise ImportError(
+            "pyarrow is required for Arrow and Parquet support. "
+            "Install it using `pip install ftpvl[arrow]`."
+        ) from e
+    return pyarrow
+
+
+ARROW_METADATA_KEY = b"ftpvl"
+
+
+def get_arrow_metadata(schema: Any) -> dict:
+    """
+    Given the schema of a pyarrow Table, return the Evaluation attributes
+    stored in its metadata, or an empty dictionary if there are none.
+    """
+    metadata = schema.metadata or {}
+    if ARROW_METADATA_KEY not in metadata:
+        return {}
+    return json.loads(metadata[ARROW_METADATA_KEY])
+
+
+def set_arrow_metadata(table: Any, attributes: dict) -> Any:
+    """
+    Given a pyarrow Table, return a table with the Evaluation attributes
+    stored in its schema metadata, keeping the existing metadata such as the
+    pandas index and dtypes.
+    """
+    metadata = dict(table.schema.metadata or {})
+    metadata[ARROW_METADATA_KEY] = json.dumps(attributes)
+    return table.replace_schema_metadata(metadata)
+
+
 def get_styling(val: Any, cmap: Colormap, val_range: Tuple[int, int] = (0, 1)) -> str:
     """
     Given a value between two integers, returns a CSS string with the 
@@ -0,0 +1,337 @@
+""" Mirrors keep a local copy of a Hydra jobset so it can be fetched without the network. """
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import json
+import os
+from typing import Any, List, Tuple, Union
+
+from ftpvl.cache import write_atomic
+import ftpvl.helpers as Helpers
+
+
+class HydraMirror:
+    """
+    Represents a local copy of the evals listing, build info and meta.json
+    files of a Hydra jobset.
+
+    Calling `sync()` downloads the evals that were added since the previous
+    sync, along with their builds, so each build is only downloaded once.
+    Every file is written atomically, and the evals listing is only updated
+    once the builds of the new evals have been downloaded, so a sync can be
+    interrupted at any time and resumed by calling `sync()` again. If a sync
+    is limited by `max_evals`, the evals it skipped are mirrored by the
+    following syncs.
+
+    A HydraFetcher created with the `mirror` parameter reads from the mirror
+    instead of from Hydra.
+
+    The mirror of each jobset is stored in `path/project/jobset`, which
+    contains the evals listing in `evals.json`, along with the IDs of the
+    mirrored evals that are followed by evals that are not yet mirrored in
+    the Hydra listing, the info of each finished
+    build in `builds/<build_num>.json`, and the meta.json file of each
+    successful build in `meta/<build_num>.json`.
+
+    Parameters
+    ----------
+    path : str
+        The directory of the mirror, which may contain several jobsets. It is
+        created if it does not exist.
+    project : str
+        The project name of the jobset on Hydra
+    jobset : str
+        The jobset name on Hydra
+    max_workers : int, optional
+        The maximum number of builds downloaded concurrently, by default 8
+    retries : int, optional
+        The number of times a failed request is retried, by default 3
+    backoff_factor : float, optional
+        The base delay in seconds between retries, by default 0.5. See
+        HydraFetcher.
+    base_url : str, optional
+        The URL of the Hydra server, by default "https://hydra.vtr.tools"
+
+    Examples
+    --------
+    >>> HydraMirror("~/hydra-mirror", "dusty", "fpga-tool-perf").sync()
+    >>> HydraFetcher("dusty", "fpga-tool-perf", mirror="~/hydra-mirror").get_evaluation()
+    """
+
+    def __init__(
+        self,
+        path: str,
+        project: str,
+        jobset: str,
+        max_workers: int = 8,
+        retries: int = 3,
+        backoff_factor: float = 0.5,
+        base_url: str = "https://hydra.vtr.tools"
+    ) -> None:
+        self.path = os.path.expanduser(path)
+        self.project = project
+        self.jobset = jobset
+        self.max_workers = max_workers
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.base_url = base_url
+
+        self._jobset_path = os.path.join(self.path, project, jobset)
+        self._evals_path = os.path.join(self._jobset_path, "evals.json")
+        self._builds_path = os.path.join(self._jobset_path, "builds")
+        self._meta_path = os.path.join(self._jobset_path, "meta")
+
+    @staticmethod
+    def _read_json(path: str) -> Any:
+        """
+        Returns the decoded JSON file, or None if it does not exist.
+        """
+        try:
+            with open(path, "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def _write_json(path: str, value: Any) -> None:
+        """
+        Writes value to a JSON file such that readers never see a partial
+        file.
+        """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        write_atomic(path, json.dumps(value).encode("utf-8"))
+
+    def get_evals_page(self) -> dict:
+        """
+        Returns the mirrored evals listing as a single evals page in the
+        format used by Hydra, with evals in the order of the Hydra listing.
+        The listing is empty if the jobset has not been synced.
+        """
+        evals_json = self._read_json(self._evals_path)
+        return {"evals": evals_json["evals"] if evals_json is not None else []}
+
+    def _get_gaps(self) -> List[int]:
+        """
+        Returns the IDs of the mirrored evals that are followed by evals that
+        are not mirrored in the Hydra listing, because a sync was limited by
+        `max_evals`.
+        """
+        evals_json = self._read_json(self._evals_path)
+        return evals_json.get("gaps", []) if evals_json is not None else []
+
+    def get_eval_ids(self) -> List[int]:
+        """
+        Returns the IDs of the mirrored evals, in the order of the listing.
+        """
+        return [eval_data["id"] for eval_data in self.get_evals_page()["evals"]]
+
+    def get_build(self, build_num: int) -> Union[dict, None]:
+        """
+        Returns the mirrored build info of a build, or None if the build is
+        not in the mirror.
+        """
+        return self._read_json(os.path.join(self._builds_path, f"{build_num}.json"))
+
+    def get_meta_json(self, build_num: int) -> Union[dict, None]:
+        """
+        Returns the mirrored meta.json file of a build, or None if the build
+        is not in the mirror or has no meta.json file.
+        """
+        return self._read_json(os.path.join(self._meta_path, f"{build_num}.json"))
+
+    def _create_fetcher(self) -> Any:
+        """
+        Returns a HydraFetcher used to send requests to Hydra.
+        """
+        # imported here since ftpvl.fetchers imports this module
+        from ftpvl.fetchers import HydraFetcher
+        return HydraFetcher(
+            self.project,
+            self.jobset,
+            max_workers=self.max_workers,
+            retries=self.retries,
+            backoff_factor=self.backoff_factor,
+            base_url=self.base_url
+        )
+
+    def _get_new_evals(
+        self,
+        fetcher: Any,
+        max_evals: Union[int, None]
+    ) -> Tuple[List[dict], List[dict], List[int]]:
+        """
+        Walks the Hydra listing from its head until the rest of the mirror is
+        contiguous with the listing, and returns the evals walked, in listing
+        order, the evals among them that are not mirrored, and the gaps that
+        remain after mirroring them.
+
+        New evals are added to the head of the listing, and a sync limited by
+        `max_evals` leaves a gap after the oldest eval it mirrored, so evals
+        are mirrored from the head and from each gap, until a mirrored eval
+        that does not start a gap is reached after every gap.
+        """
+        mirrored = set(self.get_eval_ids())
+        gaps = set(self._get_gaps())
+        remaining_gaps = set(gaps)
+
+        walked = []
+        new_evals = []
+        # evals before the first mirrored eval are new, unless the limit of
+        # the first sync is reached
+        in_gap = True
+        page = 1
+        while True:
+            evals_json = fetcher.get_evals_page_num(page)
+            for eval_data in evals_json["evals"]:
+                eval_id = eval_data["id"]
+                if eval_id in mirrored:
+                    walked.append(eval_data)
+                    in_gap = eval_id in gaps
+                    remaining_gaps.discard(eval_id)
+                    if not in_gap and len(remaining_gaps) == 0:
+                        return walked, new_evals, []
+                elif in_gap:
+                    if max_evals is not None and len(new_evals) >= max_evals:
+                        # the rest of this gap is left to the next sync
+                        if len(mirrored) > 0 and len(walked) > 0:
+                            remaining_gaps.add(walked[-1]["id"])
+                        return walked, new_evals, sorted(remaining_gaps)
+                    walked.append(eval_data)
+                    new_evals.append(eval_data)
+
+            last_page = Helpers.get_page_num(evals_json.get("last")) or 1
+            if page >= last_page or len(evals_json["evals"]) == 0:
+                # the listing ended, so nothing is missing after the last eval
+                return walked, new_evals, []
+            page += 1
+
+    def _sync_build(self, fetcher: Any, build_num: int) -> bool:
+        """
+        Downloads the build info and meta.json file of a build into the
+        mirror, returning True if the build was mirrored.
+
+        The meta.json file is written before the build info, so a mirrored
+        build info means that the build is complete. Builds that have not
+        finished are not mirrored, since they may still change.
+        """
+        resp = fetcher.request(f"{fetcher.base_url}/build/{build_num}")
+        if resp.status_code != 200:
+            print(f"Warning: Unable to get build {build_num}, got status code {resp.status_code}.")
+            return False
+        try:
+            build_info = resp.json()
+        except json.decoder.JSONDecodeError:
+            print("Warning:", f"Unable to decode build {build_num}")
+            return False
+        if build_info.get("finished", 1) != 1:
+            return False
+
+        meta_json_id, _ = Helpers.find_meta_json_product(build_info)
+        if meta_json_id is not None:
+            resp = fetcher.request(
+                f"{fetcher.base_url}/build/{build_num}/download/{meta_json_id}/meta.json"
+            )
+            try:
+                meta_json = resp.json() if resp.status_code == 200 else None
+            except json.decoder.JSONDecodeError:
+                meta_json = None
+            if meta_json is None:
+                print("Warning:", f"Unable to get build {build_num} meta.json file.")
+                return False
+            self._write_json(os.path.join(self._meta_path, f"{build_num}.json"), meta_json)
+
+        self._write_json(os.path.join(self._builds_path, f"{build_num}.json"), build_info)
+        return True
+
+    def sync(self, max_evals: int = None) -> List[int]:
+        """
+        Downloads the evals added to the jobset since the previous sync, and
+        every build of a mirrored eval that is not yet in the mirror, such as
+        builds that had not finished or failed to download during a previous
+        sync. Builds are downloaded concurrently using up to `max_workers`
+        threads.
+
+        Parameters
+        ----------
+        max_evals : int, optional
+            The maximum number of new evals to mirror, starting from the head
+            of the listing, or None to mirror every new eval, by default None.
+            Use this to limit how far back the first sync goes. The evals that
+            a later sync skips, between its new evals and the evals mirrored
+            before, are mirrored by the following syncs.
+
+        Returns
+        -------
+        List[int]
+            The IDs of the evals added to the mirror
+
+        Raises
+        ------
+        ConnectionError
+            Raised if the evals listing cannot be fetched.
+        """
+        fetcher = self._create_fetcher()
+        walked, new_evals, gaps = self._get_new_evals(fetcher, max_evals)
+        # mirrored evals that were not walked are older than the walked evals
+        walked_ids = {eval_data["id"] for eval_data in walked}
+        evals = walked + [
+            eval_data for eval_data in self.get_evals_page()["evals"]
+            if eval_data["id"] not in walked_ids
+        ]
+
+        # mirror each distinct build once, keeping listing order
+        build_nums = list(dict.fromkeys(
+            build_num for eval_data in evals for build_num in eval_data["builds"]
+            if not os.path.exists(os.path.join(self._builds_path, f"{build_num}.json"))
+        ))
+        with ThreadPoolExecutor(max_workers=max(self.max_workers, 1)) as executor:
+            list(executor.map(lambda x: self._sync_build(fetcher, x), build_nums))
+
+        if len(new_evals) > 0 or gaps != self._get_gaps():
+            self._write_json(self._evals_path, {"evals": evals, "gaps": gaps})
+        return [eval_data["id"] for eval_data in new_evals]
+
+
+def main(argv: List[str] = None) -> None:
+    """
+    Command line entry point that syncs the mirror of a Hydra jobset.
+
+    Example: `ftpvl-mirror dusty fpga-tool-perf ~/hydra-mirror --max-evals 50`
+    """
+    parser = argparse.ArgumentParser(
+        description="Incrementally mirror the evals and builds of a Hydra jobset."
+    )
+    parser.add_argument("project", help="the project name on Hydra")
+    parser.add_argument("jobset", help="the jobset name on Hydra")
+    parser.add_argument("path", help="the directory of the mirror")
+    parser.add_argument(
+        "--max-evals", type=int, default=None,
+        help="the maximum number of new evals to mirror"
+    )
+    parser.add_argument(
+        "--max-workers", type=int, default=8,
+        help="the maximum number of builds downloaded concurrently"
+    )
+    parser.add_argument(
+        "--retries", type=int, default=3,
+        help="the number of times a failed request is retried"
+    )
+    parser.add_argument(
+        "--base-url", default="https://hydra.vtr.tools",
+        help="the URL of the Hydra server"
+    )
+    args = parser.parse_args(argv)
+
+    mirror = HydraMirror(
+        args.path,
+        args.project,
+        args.jobset,
+        max_workers=args.max_workers,
+        retries=args.retries,
+        base_url=args.base_url
+    )
+    eval_ids = mirror.sync(max_evals=args.max_evals)
+    print(f"Mirrored {len(eval_ids)} new evals of {args.project}/{args.jobset} to {mirror.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+""" Plans process Evaluations lazily, rewriting pipelines to do less work. """
+from typing import Any, Dict, List, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from ftpvl.evaluation import Evaluation
+from ftpvl.processors import (
+    CleanDuplicates, FilterByIndex, FilterByIndexValues, Processor, Reindex, SortIndex,
+    StandardizeTypes
+)
+
+
+class SelectRows(Processor):
+    """
+    Processor that keeps the rows with a value in an index level or column,
+    without dropping the level.
+
+    The planner inserts it ahead of expensive processors as an early copy of
+    a FilterByIndex, which still runs in its original position on the
+    selected rows.
+
+    Parameters
+    ----------
+    name : str
+        the name of the index level or column to select by
+    value : Any
+        the value to select
+    """
+
+    def __init__(self, name: str, value: Any):
+        self.name = name
+        self.value = value
+
+    def process(self, input_eval: Evaluation) -> Evaluation:
+        input_df = input_eval.get_df_view()
+        if self.name in input_df.index.names:
+            values = input_df.index.get_level_values(self.name)
+        else:
+            values = input_df[self.name]
+        new_df = input_df[values == self.value]
+        return Evaluation(new_df, input_eval.get_eval_id())._keep_index_order(input_eval)
+
+    def __repr__(self) -> str:
+        return f"SelectRows({self.name!r}, {self.value!r})"
+
+
+def _describe(processor: Processor) -> str:
+    """
+    Returns a short description of a processor used by Plan.explain().
+    """
+    if type(processor).__repr__ is not object.__repr__:
+        return repr(processor)
+    return type(processor).__name__
+
+
+def _merge_casts(steps: List[Processor]) -> List[Processor]:
+    """
+    Merges adjacent StandardizeTypes processors into a single cast, if they
+    do not cast the same column to different types.
+    """
+    result = []
+    for step in steps:
+        prev = result[-1] if len(result) > 0 else None
+        if (
+            type(step) is StandardizeTypes and type(prev) is StandardizeTypes
+            and all(prev.types.get(k, v) == v for k, v in step.types.items())
+        ):
+            result[-1] = StandardizeTypes({**prev.types, **step.types})
+        else:
+            result.append(step)
+    return result
+
+
+def _dedupe_before_cast(steps: List[Processor]) -> List[Processor]:
+    """
+    Moves a CleanDuplicates ahead of the StandardizeTypes before it if the
+    cast does not change the columns used to find or sort duplicates, so
+    that only the remaining rows are cast.
+    """
+    result = list(steps)
+    for i in range(len(result) - 1):
+        cast, dedupe = result[i], result[i + 1]
+        if type(cast) is StandardizeTypes and type(dedupe) is CleanDuplicates:
+            used = set(dedupe._duplicate_col_names) | set(dedupe._sort_col_names or [])
+            if used.isdisjoint(cast.types):
+                result[i], result[i + 1] = dedupe, cast
+    return result
+
+
+def _commutes_with_selection(step: Processor, name: str) -> bool:
+    """
+    Returns True if selecting the rows with a value in `name` before the
+    step gives the same result as selecting them after the step.
+    """
+    step_type = type(step)
+    if step_type in (SortIndex, SelectRows, FilterByIndexValues):
+        return True
+    if step_type is FilterByIndex:
+        # filtering by the same name drops its index level
+        return step.index_name != name
+    if step_type is StandardizeTypes:
+        return name not in step.types
+    if step_type is CleanDuplicates:
+        # duplicates always have the same value, so they are selected together,
+        # and the stable sort keeps the same first row of each group
+        return name in step._duplicate_col_names
+    if step_type is Reindex:
+        return name in step._reindex_names
+    # processors that apply a function to groups or rows, such as
+    # AddNormalizedColumn, NormalizeAround and ExpandColumn, do not add their
+    # columns when no rows are selected, so they are not crossed
+    return False
+
+
+def _get_index_levels(steps: List[Processor]) -> Union[List[str], None]:
+    """
+    Returns the names of the index levels after running the steps, or None
+    if they are not known, such as when no Reindex sets them or a processor
+    may change the index.
+    """
+    levels = None
+    for step in steps:
+        step_type = type(step)
+        if step_type is Reindex:
+            levels = list(step._reindex_names)
+        elif step_type is FilterByIndex:
+            if levels is None or len(levels) < 2 or step.index_name not in levels:
+                levels = None
+            else:
+                # filtering a MultiIndex drops the level
+                levels = [x for x in levels if x != step.index_name]
+        elif step_type not in (
+            StandardizeTypes, CleanDuplicates, SortIndex, SelectRows, FilterByIndexValues
+        ):
+            levels = None
+    return levels
+
+
+def _push_down_filters(steps: List[Processor]) -> List[Processor]:
+    """
+    Moves each FilterByIndexValues, and inserts a SelectRows for each
+    FilterByIndex on a single value, as early as possible, so that the
+    processors before the filter only process the rows that are kept.
+    """
+    result = list(steps)
+    i = 0
+    while i < len(result):
+        step = result[i]
+        if type(step) is FilterByIndexValues:
+            names = list(step.values)
+        elif type(step) is FilterByIndex and pd.api.types.is_scalar(step.index_value):
+            # FilterByIndex only filters by the index, so it is only selected
+            # early if the name is a level of a known MultiIndex at the filter
+            levels = _get_index_levels(result[:i])
+            if levels is None or len(levels) < 2 or step.index_name not in levels:
+                i += 1
+                continue
+            names = [step.index_name]
+        else:
+            i += 1
+            continue
+
+        j = i
+        while j > 0 and all(_commutes_with_selection(result[j - 1], x) for x in names):
+            j -= 1
+        # only select early if it skips work for at least one processor
+        if j < i and any(type(x) not in (SelectRows, FilterByIndexValues) for x in result[j:i]):
+            if type(step) is FilterByIndexValues:
+                # it keeps the index levels, so it can run early instead
+                result.insert(j, result.pop(i))
+            else:
+                result.insert(j, SelectRows(step.index_name, step.index_value))
+                i += 1
+        i += 1
+    return result
+
+
+class Plan:
+    """
+    Represents a processing pipeline that is rewritten before it is run, so
+    that it gives the same result as running each processor in order while
+    doing less work.
+
+    The pipeline is rewritten as follows:
+        - adjacent StandardizeTypes casts are merged into one cast
+        - CleanDuplicates runs before a StandardizeTypes that does not cast
+          the columns it uses, so fewer rows are cast
+        - a FilterByIndex on a single value selects its rows as early as
+          possible, ahead of processors that give the same rows either way,
+          such as casts, deduplication, reindexing and sorting. This is only
+          done if the name is known to be a level of the MultiIndex it
+          filters, set by an earlier Reindex. A FilterByIndexValues is moved
+          there instead, so it uses the cached hash index of the input
+          Evaluation when it runs first.
+
+    Processors that the planner does not know, and processors that depend
+    on every row such as Normalize and Aggregate, are never moved or
+    crossed.
+
+    Parameters
+    ----------
+    pipeline : List[Processor]
+        a list of Processors in the order they would be run eagerly
+    """
+
+    def __init__(self, pipeline: List[Processor]):
+        self.pipeline = list(pipeline)
+
+    def optimize(self) -> List[Processor]:
+        """
+        Returns the rewritten pipeline.
+        """
+        steps = _merge_casts(self.pipeline)
+        steps = _dedupe_before_cast(steps)
+        steps = _merge_casts(steps)
+        return _push_down_filters(steps)
+
+    def explain(self) -> str:
+        """
+        Returns a description of the rewritten pipeline, with one processor
+        per line.
+        """
+        return "\n".join(_describe(x) for x in self.optimize())
+
+    def execute(self, evaluation: Evaluation) -> Evaluation:
+        """
+        Runs the rewritten pipeline on an Evaluation and returns the result.
+        """
+        result = evaluation
+        for step in self.optimize():
+            result = step.process(result)
+        return result
+
+
+class LazyEvaluation(Evaluation):
+    """
+    Represents the result of lazily processing an Evaluation, returned by
+    `Evaluation.process(pipeline, lazy=True)`.
+
+    Processing a LazyEvaluation lazily adds to its pipeline, and the whole
+    pipeline is planned and run once, the first time the result is used,
+    for example by get_df() or a visualizer. A LazyEvaluation can be used
+    anywhere an Evaluation is used.
+
+    Parameters
+    ----------
+    source : Evaluation
+        the Evaluation to process
+    pipeline : List[Processor]
+        a list of Processors to process the Evaluation in order
+    """
+
+    # pylint: disable=super-init-not-called
+    def __init__(self, source: Evaluation, pipeline: List[Processor]):
+        self._source = source
+        self._plan = Plan(pipeline)
+        self._result = None
+
+    @property
+    def _df(self) -> pd.DataFrame:
+        return self.collect()._df
+
+    @property
+    def _eval_id(self) -> Any:
+        return self.collect()._eval_id
+
+    @property
+    def _index_unique(self) -> Any:
+        return self.collect()._index_unique
+
+    def collect(self) -> Evaluation:
+        """
+        Runs the planned pipeline, if it has not been run yet, and returns
+        the resulting Evaluation.
+        """
+        if self._result is None:
+            self._result = self._plan.execute(self._source)
+        return self._result
+
+    def get_index(self, keys: Union[str, List[str]]) -> Dict[Any, np.ndarray]:
+        return self.collect().get_index(keys)
+
+    def get_sorted_by(self) -> Tuple:
+        return self.collect().get_sorted_by()
+
+    def is_index_unique(self) -> bool:
+        return self.collect().is_index_unique()
+
+    def explain(self) -> str:
+        """
+        Returns a description of the planned pipeline. See Plan.explain().
+        """
+        return self._plan.explain()
+
+    def process(self, pipeline: List[Processor], lazy: bool = False) -> Evaluation:
+        if lazy:
+            return LazyEvaluation(self._source, self._plan.pipeline + list(pipeline))
+        return super().process(pipeline)
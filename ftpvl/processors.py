@@ -1,6 +1,6 @@
 """ Processors transform Evaluations to be more useful when visualized. """
 import math
-from typing import Any, Callable, Dict, List, Union
+from typing import Any, Callable, Dict, Iterable, List, Union
 from enum import Enum
 
 import numpy as np
@@ -40,7 +40,8 @@ class MinusOne(Processor):
     """
 
     def process(self, input_eval: Evaluation) -> Evaluation:
-        return Evaluation(input_eval.get_df() - 1, input_eval.get_eval_id())
+        new_eval = Evaluation(input_eval.get_df_view() - 1, input_eval.get_eval_id())
+        return new_eval._keep_index_order(input_eval)
 
 
 class StandardizeTypes(Processor):
@@ -61,7 +62,7 @@ class StandardizeTypes(Processor):
         self.types = types
 
     def process(self, input_eval: Evaluation) -> Evaluation:
-        input_df = input_eval.get_df()
+        input_df = input_eval.get_df_view()
 
         try:
             # if int, we might need to convert to float first
@@ -76,7 +77,7 @@ class StandardizeTypes(Processor):
             new_df = input_df.astype(self.types)
         except KeyError:
             raise KeyError("A key in the types parameter does not exist in the evaluation.")
-        return Evaluation(new_df, input_eval.get_eval_id())
+        return Evaluation(new_df, input_eval.get_eval_id())._keep_index_order(input_eval)
 
 
 class CleanDuplicates(Processor):
@@ -89,7 +90,8 @@ class CleanDuplicates(Processor):
 
     By default, the first instance of a duplicate is retained, and all others
     are removed. You can optionally specify columns to sort by and which way to
-    sort, which provides fine-grained control over which rows are removed.
+    sort, which provides fine-grained control over which rows are removed. The
+    sort is stable, so rows with equal sort values keep their original order.
 
     Parameters
     ----------
@@ -116,14 +118,16 @@ class CleanDuplicates(Processor):
 
     def process(self, input_eval: Evaluation) -> Evaluation:
         if self._sort_col_names is None:
-            new_df = input_eval.get_df().drop_duplicates(
+            new_df = input_eval.get_df_view().drop_duplicates(
                 subset=self._duplicate_col_names
             )
-            return Evaluation(new_df, input_eval.get_eval_id())
+            return Evaluation(new_df, input_eval.get_eval_id())._keep_index_order(input_eval)
         else:
             new_df = (
-                input_eval.get_df()
-                .sort_values(by=self._sort_col_names, ascending=self._reverse_sort)
+                input_eval.get_df_view()
+                .sort_values(
+                    by=self._sort_col_names, ascending=self._reverse_sort, kind="mergesort"
+                )
                 .drop_duplicates(subset=self._duplicate_col_names)
             )
             return Evaluation(new_df, input_eval.get_eval_id())
@@ -181,7 +185,7 @@ class AddNormalizedColumn(Processor):
         return input_df
 
     def process(self, input_eval: Evaluation) -> Evaluation:
-        input_df = input_eval.get_df()
+        input_df = input_eval.get_df_view()
         new_df = input_df.groupby(self._groupby).apply(self._normalize)
 
         return Evaluation(new_df, input_eval.get_eval_id())
@@ -235,7 +239,7 @@ class ExpandColumn(Processor):
         return input_df
 
     def process(self, input_eval: Evaluation) -> Evaluation:
-        input_df = input_eval.get_df()
+        input_df = input_eval.get_df_view()
         new_df = input_df.groupby(self._input_col_name).apply(self._expansion)
 
         return Evaluation(new_df, input_eval.get_eval_id())
@@ -261,8 +265,10 @@ class Reindex(Processor):
         self._reindex_names = reindex_names
 
     def process(self, input_eval: Evaluation) -> Evaluation:
-        input_df = input_eval.get_df()
-        new_df = input_df.set_index(self._reindex_names)
+        # the view is a shallow copy, so setting its index in place does not
+        # affect the input and avoids copying the data
+        new_df = input_eval.get_df_view()
+        new_df.set_index(self._reindex_names, inplace=True)
         return Evaluation(new_df, input_eval.get_eval_id())
 
 
@@ -279,10 +285,31 @@ class SortIndex(Processor):
     def __init__(self, sort_names: List[str]):
         self._sort_names = sort_names
 
+    def _get_order(self, index: pd.Index) -> tuple:
+        """
+        Returns the names of the index levels that the sorted rows are sorted
+        by, in order. Levels that are not sorted by are sorted in index order
+        after the sort names, like sort_index(). Returns an empty tuple if a
+        sort name is not an index level, since the order is then not known.
+        """
+        sort_names = [self._sort_names] if isinstance(self._sort_names, str) else self._sort_names
+        if any(x not in index.names for x in sort_names):
+            return ()
+        return tuple(sort_names) + tuple(x for x in index.names if x not in sort_names)
+
     def process(self, input_eval: Evaluation) -> Evaluation:
-        input_df = input_eval.get_df()
-        new_df = input_df.sort_index(level=self._sort_names)
-        return Evaluation(new_df, input_eval.get_eval_id())
+        input_df = input_eval.get_df_view()
+        order = self._get_order(input_df.index)
+        if len(order) > 0 and (input_eval.get_sorted_by() == order or (
+            order == tuple(input_df.index.names) and input_df.index.is_monotonic_increasing
+        )):
+            # already sorted
+            new_df = input_df
+        else:
+            new_df = input_df.sort_index(level=self._sort_names)
+        new_eval = Evaluation(new_df, input_eval.get_eval_id())._keep_index_order(input_eval)
+        new_eval._sorted_by = order
+        return new_eval
 
 
 class NormalizeAround(Processor):
@@ -338,7 +365,7 @@ class NormalizeAround(Processor):
         """
         Given a dataframe, finds the baseline using the specified index name
         and value, and normalizes all other rows around it. Only affects items
-        specified in normalize_direction. Returns the altered df.
+        specified in normalize_direction. Returns a new df.
         """
         is_baseline = input_df.index.get_level_values(self._idx_name) == self._idx_value
 
@@ -350,13 +377,15 @@ class NormalizeAround(Processor):
         scaled = (input_df[self._column_names] - base) / scaling_factor
         scaled *= self._column_negations
 
-        # rescale values to between 0 and 1
+        # rescale values to between 0 and 1, in a copy so that the input view
+        # is not modified
         offset = (scaled / 2) + 0.5
-        input_df[self._column_names] = offset
-        return input_df
+        new_df = input_df.copy()
+        new_df[self._column_names] = offset
+        return new_df
 
     def process(self, input_eval: Evaluation) -> Evaluation:
-        input_df = input_eval.get_df()
+        input_df = input_eval.get_df_view()
         new_df = input_df.groupby(self._groupby).apply(self._normalize_around)
         return Evaluation(new_df, input_eval.get_eval_id())
 
@@ -397,7 +426,7 @@ class Normalize(Processor):
     def _normalize(self, input_df):
         """
         Given a dataframe, normalizes each column. Only affects items
-        specified in normalize_direction. Returns the altered df.
+        specified in normalize_direction. Returns a new df.
         """
 
         # find scaling factor
@@ -407,15 +436,17 @@ class Normalize(Processor):
         scaled = (input_df[self._column_names]) / scaling_factor
         scaled *= self._column_negations
 
-        # rescale values to between 0 and 1
+        # rescale values to between 0 and 1, in a copy so that the input view
+        # is not modified
         offset = (scaled / 2) + 0.5
-        input_df[self._column_names] = offset
-        return input_df
+        new_df = input_df.copy()
+        new_df[self._column_names] = offset
+        return new_df
 
     def process(self, input_eval: Evaluation) -> Evaluation:
-        input_df = input_eval.get_df()
+        input_df = input_eval.get_df_view()
         new_df = self._normalize(input_df)
-        return Evaluation(new_df, input_eval.get_eval_id())
+        return Evaluation(new_df, input_eval.get_eval_id())._keep_index_order(input_eval)
 
 class RelativeDiff(Processor):
     """
@@ -457,13 +488,50 @@ class RelativeDiff(Processor):
         self.a = a
 
     def process(self, b: Evaluation) -> Evaluation:
-        a_nums = self.a.get_df().select_dtypes(include=[np.number])
-        b_nums = b.get_df().select_dtypes(include=[np.number])
+        a_nums = self.a.get_df_view().select_dtypes(include=[np.number])
+        b_nums = b.get_df_view().select_dtypes(include=[np.number])
         diff = (b_nums - a_nums) / a_nums
         difference_eval = Evaluation(diff)
 
         return difference_eval
 
+def _find_sorted_rows(
+    input_eval: Evaluation,
+    index: pd.Index,
+    index_name: str,
+    index_value: Any
+) -> Union[slice, None]:
+    """
+    Returns the slice of rows with a value in an index level using binary
+    search, if the rows of the Evaluation are known to be sorted by that level
+    first. Otherwise returns None.
+    """
+    if input_eval.get_sorted_by()[:1] != (index_name,):
+        return None
+    try:
+        if isinstance(index, pd.MultiIndex):
+            level = index.names.index(index_name)
+            levels, codes = index.levels[level], index.codes[level]
+            # missing values have code -1 and are sorted last
+            if not levels.is_monotonic_increasing or (len(codes) > 0 and codes[-1] == -1):
+                return None
+            if index_value not in levels:
+                return slice(0, 0)
+            # search with the dtype of the codes, to avoid casting the codes
+            code = codes.dtype.type(levels.get_loc(index_value))
+            start = codes.searchsorted(code, side="left")
+            stop = codes.searchsorted(code, side="right")
+        else:
+            if index.name != index_name or index.hasnans:
+                return None
+            start = index.searchsorted(index_value, side="left")
+            stop = index.searchsorted(index_value, side="right")
+    except TypeError:
+        # values that cannot be compared with the index
+        return None
+    return slice(int(start), int(stop))
+
+
 class FilterByIndex(Processor):
     """
     Processor that filters an Evaluation by matching a specified index value
@@ -498,15 +566,91 @@ class FilterByIndex(Processor):
         self.index_value = index_value
     
     def process(self, input_eval: Evaluation):
-        old_df = input_eval.get_df()
+        old_df = input_eval.get_df_view()
+        rows = _find_sorted_rows(input_eval, old_df.index, self.index_name, self.index_value)
         if isinstance(old_df.index, pd.MultiIndex):
-            new_df = old_df.xs(self.index_value, level=self.index_name)
+            if rows is None:
+                new_df = old_df.xs(self.index_value, level=self.index_name)
+            elif rows.start == rows.stop:
+                raise KeyError(self.index_value)
+            else:
+                new_df = old_df.iloc[rows].droplevel(self.index_name)
+            new_eval = Evaluation(new_df, input_eval.get_eval_id())
+            return new_eval._keep_index_order(input_eval, dropped_level=self.index_name)
         elif isinstance(old_df.index, pd.Index):
-            # slicing instead of indexing to maintain shape
-            new_df = old_df.loc[self.index_value:self.index_value]
+            if rows is None:
+                # slicing instead of indexing to maintain shape
+                new_df = old_df.loc[self.index_value:self.index_value]
+            else:
+                new_df = old_df.iloc[rows]
         else:
             raise ValueError("Incompatible dataframe index.")
-        return Evaluation(new_df, input_eval.get_eval_id())
+        return Evaluation(new_df, input_eval.get_eval_id())._keep_index_order(input_eval)
+
+class FilterByIndexValues(Processor):
+    """
+    Processor that filters an Evaluation by a set of values for each of one
+    or more index levels, keeping the rows that match one of the values of
+    every level. This is the bulk version of FilterByIndex.
+
+    Rows are found using the cached hash index of the input Evaluation, or
+    using binary search if the rows are sorted by the level, so selecting
+    many values, or filtering the same Evaluation repeatedly, does not scan
+    the dataframe for each value. The index levels are kept, and the
+    rows stay in their original order. Columns can also be used.
+
+    Parameters
+    ----------
+    values : Dict[str, Iterable[Any]]
+        a dictionary mapping index names to the values to keep. A scalar,
+        such as a string or a number, is treated as a single value.
+
+    Examples
+    --------
+    >>> a = Evaluation(pd.DataFrame(
+    ... data=[
+    ...     {"x": 1, "y": 5},
+    ...     {"x": 4, "y": 10},
+    ...     {"x": 2, "y": 7}
+    ... ],
+    ... index=pd.Index(["a", "b", "c"], name="key")))
+    >>> a.process([FilterByIndexValues({"key": ["a", "c"]})]).get_df()
+        x    y
+    key
+    a   1    5
+    c   2    7
+    """
+    def __init__(self, values: Dict[str, Iterable[Any]]):
+        self.values = {
+            name: [x] if pd.api.types.is_scalar(x) else list(dict.fromkeys(x))
+            for name, x in values.items()
+        }
+
+    def process(self, input_eval: Evaluation) -> Evaluation:
+        input_df = input_eval.get_df_view()
+        positions = None
+        for name, values in self.values.items():
+            empty = np.array([], dtype=np.intp)
+            rows = [_find_sorted_rows(input_eval, input_df.index, name, x) for x in values]
+            if len(rows) > 0 and all(x is not None for x in rows):
+                # the rows of each value are a slice, found by binary search
+                matches = np.sort(np.concatenate(
+                    [empty] + [np.arange(x.start, x.stop) for x in rows]
+                ))
+            else:
+                index = input_eval.get_index(name)
+                matches = np.sort(np.concatenate(
+                    [empty] + [index[x] for x in values if x in index]
+                ))
+            if positions is None:
+                positions = matches
+            else:
+                positions = np.intersect1d(positions, matches, assume_unique=True)
+
+        new_df = input_df
+        if positions is not None:
+            new_df = new_df.take(positions)
+        return Evaluation(new_df, input_eval.get_eval_id())._keep_index_order(input_eval)
 
 class Aggregate(Processor):
     """
@@ -538,7 +682,7 @@ class Aggregate(Processor):
         self.func = func
     
     def process(self, input_eval: Evaluation):
-        old_df = input_eval.get_df()
+        old_df = input_eval.get_df_view()
         numeric_columns = old_df.select_dtypes(include=['number']).dropna(axis=1).columns
         new_df = pd.DataFrame([old_df[numeric_columns].agg(self.func)])
         return Evaluation(new_df, input_eval.get_eval_id())
@@ -642,6 +786,6 @@ class CompareToFirst(Processor):
         return pd.concat([input_df, renamed_ratio], axis=1)[new_cols]
 
     def process(self, input_eval: Evaluation) -> Evaluation:
-        input_df = input_eval.get_df()
+        input_df = input_eval.get_df_view()
         new_df = self._compare_to_first(input_df)
         return Evaluation(new_df, input_eval.get_eval_id())
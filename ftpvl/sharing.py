@@ -0,0 +1,249 @@
+""" Sharing lets multiple processes use an Evaluation without copying it. """
+import os
+import sys
+from typing import Any, Union
+
+import ftpvl.helpers as Helpers
+from ftpvl.evaluation import Evaluation
+
+try:
+    from multiprocessing import shared_memory
+except ImportError: # Python < 3.8
+    shared_memory = None
+
+
+def _to_shareable_table(evaluation: Evaluation) -> Any:
+    """
+    Returns a pyarrow Table of the Evaluation in which missing floats are
+    stored as NaN instead of null, so that float columns can be converted
+    back to pandas without copying.
+    """
+    pa = Helpers.import_pyarrow()
+    import pyarrow.compute as pc
+
+    table = evaluation.to_arrow()
+    for i, field in enumerate(table.schema):
+        column = table.column(i)
+        if pa.types.is_floating(field.type) and column.null_count > 0:
+            table = table.set_column(i, field, pc.fill_null(column, float("nan")))
+    return table
+
+
+def _from_shared_table(table: Any) -> Evaluation:
+    """
+    Returns an Evaluation of a table read from shared memory. Numeric columns
+    without missing values, and float columns, are read-only views of the
+    shared memory.
+    """
+    eval_id = Helpers.get_arrow_metadata(table.schema).get("eval_id")
+    return Evaluation(table.to_pandas(split_blocks=True), eval_id)
+
+
+def _write_ipc(table: Any, sink: Any) -> None:
+    """
+    Writes the table to the sink in the Arrow IPC file format.
+    """
+    pa = Helpers.import_pyarrow()
+    writer = pa.ipc.new_file(sink, table.schema)
+    try:
+        writer.write_table(table)
+    finally:
+        writer.close()
+
+
+def write_ipc(evaluation: Evaluation, path: str) -> None:
+    """
+    Writes an Evaluation to an Arrow IPC file, which can be memory-mapped by
+    other processes using read_ipc(). Requires pyarrow.
+
+    Parameters
+    ----------
+    evaluation : Evaluation
+        the Evaluation to write
+
+    path : str
+        the path of the Arrow IPC file
+    """
+    pa = Helpers.import_pyarrow()
+    with pa.OSFile(path, "wb") as sink:
+        _write_ipc(_to_shareable_table(evaluation), sink)
+
+
+def read_ipc(path: str) -> Evaluation:
+    """
+    Returns an Evaluation of an Arrow IPC file written by write_ipc(). The
+    file is memory-mapped, so numeric columns are not copied into the memory
+    of the process, and processes that read the same file share its pages.
+    Requires pyarrow.
+
+    Parameters
+    ----------
+    path : str
+        the path of the Arrow IPC file
+
+    Returns
+    -------
+    Evaluation
+        an Evaluation with the eval_id, index levels and dtypes of the
+        written Evaluation
+    """
+    pa = Helpers.import_pyarrow()
+    source = pa.memory_map(path, "r")
+    return _from_shared_table(pa.ipc.open_file(source).read_all())
+
+
+class SharedEvaluation:
+    """
+    Represents an Evaluation stored in a block of shared memory, so that
+    worker processes can attach to it by name instead of receiving a pickled
+    copy. Requires pyarrow and Python 3.8 or newer.
+
+    Use `SharedEvaluation.create()` in the process that owns the Evaluation,
+    pass `name` to the workers, and use `SharedEvaluation.attach()` in each
+    worker. The owner must call `unlink()` once no worker needs the block.
+
+    Examples
+    --------
+    >>> with SharedEvaluation.create(evaluation) as shared:
+    ...     pool.map(work, [shared.name] * 8)
+    ...     shared.unlink()
+
+    >>> def work(name):
+    ...     with SharedEvaluation.attach(name) as shared:
+    ...         return shared.get_evaluation().process(pipeline)
+    """
+
+    # size of the header that stores the length of the Arrow IPC data, which
+    # keeps the data aligned for zero-copy reads
+    _HEADER_SIZE = 64
+
+    # directory where Linux exposes shared memory blocks as files
+    _SHM_DIR = "/dev/shm"
+
+    # blocks closed while their memory was still in use by an Evaluation,
+    # kept open until the process exits
+    _in_use = []
+
+    def __init__(self, name: str, shm: Any = None) -> None:
+        self.name = name
+        self._shm = shm
+
+    def _get_path(self) -> Union[str, None]:
+        """
+        Returns the path of the file of the shared memory block, or None if
+        the platform does not expose shared memory as files.
+        """
+        path = os.path.join(self._SHM_DIR, self.name.lstrip("/"))
+        return path if os.path.isfile(path) else None
+
+    @staticmethod
+    def _check_supported() -> None:
+        if shared_memory is None:
+            raise RuntimeError("SharedEvaluation requires Python 3.8 or newer.")
+
+    @classmethod
+    def create(cls, evaluation: Evaluation, name: str = None) -> 'SharedEvaluation':
+        """
+        Returns a SharedEvaluation of a new shared memory block that contains
+        the Evaluation.
+
+        Parameters
+        ----------
+        evaluation : Evaluation
+            the Evaluation to share
+
+        name : str, optional
+            the name of the shared memory block, or None to generate a unique
+            name, by default None
+        """
+        cls._check_supported()
+        pa = Helpers.import_pyarrow()
+
+        table = _to_shareable_table(evaluation)
+        mock_sink = pa.MockOutputStream()
+        _write_ipc(table, mock_sink)
+        size = mock_sink.size()
+
+        shm = shared_memory.SharedMemory(
+            name=name, create=True, size=cls._HEADER_SIZE + size
+        )
+        try:
+            shm.buf[:8] = size.to_bytes(8, "little")
+            view = shm.buf[cls._HEADER_SIZE:cls._HEADER_SIZE + size]
+            sink = pa.FixedSizeBufferWriter(pa.py_buffer(view))
+            _write_ipc(table, sink)
+            sink.close()
+            del sink, view # release the view so that the block can be closed
+        except BaseException:
+            shm.close()
+            shm.unlink()
+            raise
+        return cls(shm.name, shm)
+
+    @classmethod
+    def attach(cls, name: str) -> 'SharedEvaluation':
+        """
+        Returns a SharedEvaluation of an existing shared memory block created
+        by `SharedEvaluation.create()`.
+
+        Parameters
+        ----------
+        name : str
+            the name of the shared memory block
+        """
+        cls._check_supported()
+        shared = cls(name)
+        if shared._get_path() is not None:
+            # memory-mapped directly when get_evaluation() is called
+            return shared
+        if sys.version_info >= (3, 13):
+            shared._shm = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            shared._shm = shared_memory.SharedMemory(name=name)
+        return shared
+
+    def get_evaluation(self) -> Evaluation:
+        """
+        Returns the shared Evaluation. Numeric columns are read-only views of
+        the shared memory rather than copies.
+        """
+        pa = Helpers.import_pyarrow()
+        path = self._get_path()
+        if path is not None:
+            # the mapping is owned by pyarrow, so it stays open as long as the
+            # Evaluation uses it, regardless of when the block is closed
+            buffer = pa.memory_map(path, "r").read_buffer()
+        else:
+            buffer = pa.py_buffer(self._shm.buf)
+        size = int.from_bytes(buffer.slice(0, 8).to_pybytes(), "little")
+        reader = pa.BufferReader(buffer.slice(self._HEADER_SIZE, size))
+        return _from_shared_table(pa.ipc.open_file(reader).read_all())
+
+    def close(self) -> None:
+        """
+        Closes this process's view of the shared memory block. Evaluations
+        returned by `get_evaluation()` remain valid. On platforms that do not
+        expose shared memory as files, the view stays open until the process
+        exits if such Evaluations are still in use.
+        """
+        if self._shm is None:
+            return
+        try:
+            self._shm.close()
+        except BufferError:
+            SharedEvaluation._in_use.append(self._shm)
+
+    def unlink(self) -> None:
+        """
+        Requests that the shared memory block is destroyed once every process
+        has closed it. Should only be called by the creator of the block.
+        """
+        if self._shm is None:
+            raise RuntimeError("Only the creator of a SharedEvaluation can unlink it.")
+        self._shm.unlink()
+
+    def __enter__(self) -> 'SharedEvaluation':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
@@ -0,0 +1,340 @@
+""" Stores keep a local history of Evaluations that can be queried without fetching. """
+import sqlite3
+from typing import Iterable, List
+
+import pandas as pd
+
+from ftpvl.evaluation import Evaluation
+from ftpvl.fetchers import Fetcher
+
+
+class EvaluationStore:
+    """
+    Represents a local history of Evaluations stored in a SQLite database.
+
+    Each test result is stored as a row with its eval_id, and each metric is
+    stored in its own column, which is added the first time an Evaluation
+    containing it is stored. The project, toolchain, device and board columns
+    are indexed, so queries for a design across many evaluations do not need
+    to scan or fetch every evaluation.
+
+    Parameters
+    ----------
+    path : str
+        The path of the SQLite database file, which is created if it does not
+        exist, or ":memory:" for a temporary in-memory database.
+
+    Examples
+    --------
+    >>> store = EvaluationStore("history.db")
+    >>> store.ingest(HydraFetcher("dusty", "fpga-tool-perf"), range(200))
+    >>> store.query(project="blinky", last=200, columns=["toolchain", "lut"])
+    """
+
+    _INDEXED_COLUMNS = ("project", "toolchain", "device", "board")
+
+    # columns used internally to key each result
+    _RESERVED_COLUMNS = ("eval_id", "row_num")
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS evaluations (eval_id INTEGER PRIMARY KEY)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "eval_id INTEGER NOT NULL REFERENCES evaluations(eval_id), "
+                "row_num INTEGER NOT NULL, "
+                "PRIMARY KEY (eval_id, row_num))"
+            )
+
+    @staticmethod
+    def _quote(name: str) -> str:
+        """
+        Returns the name quoted for use as an SQL identifier.
+        """
+        return '"' + str(name).replace('"', '""') + '"'
+
+    def get_columns(self) -> List[str]:
+        """
+        Returns the names of the metric columns in the store, in the order in
+        which they were first stored.
+        """
+        cursor = self._conn.execute("PRAGMA table_info(results)")
+        return [row[1] for row in cursor if row[1] not in self._RESERVED_COLUMNS]
+
+    @staticmethod
+    def _fold(name: str) -> str:
+        """
+        Returns the name with ASCII letters in lowercase. SQLite compares
+        identifiers this way, so names with the same folded name are the same
+        column.
+        """
+        return "".join(c.lower() if c.isascii() else c for c in name)
+
+    def _check_columns(self, columns: List[str]) -> None:
+        """
+        Raises a ValueError if a column is reserved, if two columns differ
+        only in case, or if a column differs only in case from a stored
+        column.
+        """
+        reserved = {self._fold(x) for x in self._RESERVED_COLUMNS}
+        stored = {self._fold(x): x for x in self.get_columns()}
+        seen = {}
+        for column in columns:
+            folded = self._fold(column)
+            if folded in reserved:
+                raise ValueError(f"Unable to store an Evaluation with a column named {column}.")
+            if folded in seen:
+                raise ValueError(
+                    f"Unable to store columns {seen[folded]} and {column}, "
+                    "which differ only in case."
+                )
+            if folded in stored and stored[folded] != column:
+                raise ValueError(
+                    f"Unable to store column {column}, which differs only in case from the "
+                    f"stored column {stored[folded]}."
+                )
+            seen[folded] = column
+
+    def _add_columns(self, columns: Iterable[str]) -> None:
+        """
+        Adds the columns that are not yet in the results table, indexing the
+        columns used to identify a test case. Must be called in a transaction.
+        """
+        existing = set(self.get_columns())
+        for column in columns:
+            if column in existing:
+                continue
+            self._conn.execute(f"ALTER TABLE results ADD COLUMN {self._quote(column)}")
+            if column in self._INDEXED_COLUMNS:
+                self._conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS {self._quote('results_' + column)} "
+                    f"ON results ({self._quote(column)}, eval_id)"
+                )
+            existing.add(column)
+
+    @staticmethod
+    def _get_records(df: pd.DataFrame) -> List[tuple]:
+        """
+        Returns the rows of the dataframe as tuples of Python values, with
+        missing values as None.
+        """
+        object_df = df.astype(object)
+        object_df = object_df.where(pd.notna(object_df), None)
+        return list(object_df.itertuples(index=False, name=None))
+
+    def put(self, evaluation: Evaluation) -> None:
+        """
+        Stores an Evaluation, replacing any stored Evaluation with the same
+        eval_id. Named index levels are stored as columns.
+
+        Parameters
+        ----------
+        evaluation : Evaluation
+            the Evaluation to store
+
+        Raises
+        ------
+        ValueError
+            Raised if the Evaluation has no eval_id, has a column named
+            eval_id or row_num, or has column names that differ only in case
+            from each other or from a stored column, since SQLite column names
+            are not case-sensitive.
+        """
+        eval_id = evaluation.get_eval_id()
+        if eval_id is None:
+            raise ValueError("Unable to store an Evaluation without an eval_id.")
+        eval_id = int(eval_id)
+
+        df = evaluation.get_df_view()
+        if any(name is not None for name in df.index.names):
+            df = df.reset_index()
+        columns = [str(x) for x in df.columns]
+        self._check_columns(columns)
+        placeholders = ", ".join(["?"] * (len(columns) + 2))
+        column_names = ", ".join(self._quote(x) for x in self._RESERVED_COLUMNS + tuple(columns))
+        records = [
+            (eval_id, row_num) + record
+            for row_num, record in enumerate(self._get_records(df))
+        ]
+
+        with self._conn:
+            self._add_columns(columns)
+            self._conn.execute("DELETE FROM results WHERE eval_id = ?", (eval_id,))
+            self._conn.execute(
+                "INSERT OR IGNORE INTO evaluations (eval_id) VALUES (?)", (eval_id,)
+            )
+            self._conn.executemany(
+                f"INSERT INTO results ({column_names}) VALUES ({placeholders})", records
+            )
+
+    def ingest(self, fetcher: Fetcher, eval_nums: Iterable[int] = None) -> List[int]:
+        """
+        Fetches Evaluations using the fetcher and stores them.
+
+        If eval_nums is None, the Evaluation returned by
+        `fetcher.get_evaluation()` is stored. Otherwise, the fetcher must be a
+        HydraFetcher, and the Evaluations returned by
+        `fetcher.get_evaluations(eval_nums)` are stored. If the fetcher uses
+        absolute eval_nums, evaluations that are already stored are not
+        fetched again.
+
+        Parameters
+        ----------
+        fetcher : Fetcher
+            the fetcher used to fetch the Evaluations
+
+        eval_nums : Iterable[int], optional
+            the evaluations to fetch, by default None
+
+        Returns
+        -------
+        List[int]
+            the eval_ids of the stored Evaluations
+        """
+        if eval_nums is None:
+            evaluations = [fetcher.get_evaluation()]
+        else:
+            eval_nums = list(eval_nums)
+            if getattr(fetcher, "absolute_eval_num", False):
+                stored = set(self.get_eval_ids())
+                eval_nums = [x for x in eval_nums if x not in stored]
+            evaluations = fetcher.get_evaluations(eval_nums) if eval_nums else []
+
+        for evaluation in evaluations:
+            self.put(evaluation)
+        return [x.get_eval_id() for x in evaluations]
+
+    def get_eval_ids(self, last: int = None) -> List[int]:
+        """
+        Returns the stored eval_ids in ascending order.
+
+        Parameters
+        ----------
+        last : int, optional
+            if specified, only the `last` largest eval_ids are returned, by
+            default None
+        """
+        if last is None:
+            cursor = self._conn.execute("SELECT eval_id FROM evaluations ORDER BY eval_id")
+            return [row[0] for row in cursor]
+        cursor = self._conn.execute(
+            "SELECT eval_id FROM evaluations ORDER BY eval_id DESC LIMIT ?", (last,)
+        )
+        return [row[0] for row in cursor][::-1]
+
+    def get_evaluation(self, eval_id: int) -> Evaluation:
+        """
+        Returns the stored Evaluation with the eval_id, containing the columns
+        that have a value in at least one of its test results.
+
+        Raises
+        ------
+        ValueError
+            Raised if there is no stored Evaluation with the eval_id.
+        """
+        cursor = self._conn.execute("SELECT 1 FROM evaluations WHERE eval_id = ?", (eval_id,))
+        if cursor.fetchone() is None:
+            raise ValueError(f"Unable to find eval_id {eval_id}")
+        df = self.query(eval_ids=[eval_id]).get_df()
+        df = df.drop(columns="eval_id").dropna(axis=1, how="all")
+        return Evaluation(df, eval_id)
+
+    def query(
+        self,
+        eval_ids: Iterable[int] = None,
+        last: int = None,
+        columns: List[str] = None,
+        **filters
+    ) -> Evaluation:
+        """
+        Returns an Evaluation of the stored test results that match the query,
+        ordered by eval_id and then by their order in the stored Evaluation.
+        The dataframe has a categorical `eval_id` column identifying the
+        Evaluation of each test result, like the result of
+        Evaluation.concat().
+
+        Parameters
+        ----------
+        eval_ids : Iterable[int], optional
+            if specified, only these evaluations are included, by default None
+
+        last : int, optional
+            if specified, only the `last` most recent evaluations are
+            included, by default None
+
+        columns : List[str], optional
+            if specified, only these columns are returned, in addition to
+            eval_id, by default None
+
+        **filters
+            Test results are included only if the column named by each
+            keyword is equal to its value, or to one of its values if the
+            value is a list, tuple or set. For example, `project="blinky"` or
+            `toolchain=["vpr", "vivado"]`.
+
+        Returns
+        -------
+        Evaluation
+            an Evaluation of the matching test results. If eval_ids contains a
+            single eval_id, the Evaluation has that eval_id.
+
+        Raises
+        ------
+        ValueError
+            Raised if a column or filter is not a column in the store.
+        """
+        stored_columns = self.get_columns()
+        if columns is None:
+            columns = stored_columns
+        for column in list(columns) + list(filters.keys()):
+            if column not in stored_columns:
+                raise ValueError(f"Unknown column {column}.")
+
+        conditions = []
+        params = []
+        if eval_ids is not None:
+            eval_ids = list(eval_ids)
+            conditions.append(f"eval_id IN ({', '.join(['?'] * len(eval_ids))})")
+            params.extend(eval_ids)
+        if last is not None:
+            conditions.append(
+                "eval_id IN (SELECT eval_id FROM evaluations ORDER BY eval_id DESC LIMIT ?)"
+            )
+            params.append(last)
+        for column, value in filters.items():
+            if isinstance(value, (list, tuple, set)):
+                value = list(value)
+                conditions.append(
+                    f"{self._quote(column)} IN ({', '.join(['?'] * len(value))})"
+                )
+                params.extend(value)
+            else:
+                conditions.append(f"{self._quote(column)} = ?")
+                params.append(value)
+
+        select = ", ".join(self._quote(x) for x in ["eval_id"] + list(columns))
+        sql = f"SELECT {select} FROM results"
+        if len(conditions) > 0:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY eval_id, row_num"
+
+        df = pd.read_sql_query(sql, self._conn, params=params)
+        df["eval_id"] = df["eval_id"].astype("category")
+        eval_id = eval_ids[0] if eval_ids is not None and len(eval_ids) == 1 else None
+        return Evaluation(df, eval_id)
+
+    def close(self) -> None:
+        """
+        Closes the database connection.
+        """
+        self._conn.close()
+
+    def __enter__(self) -> 'EvaluationStore':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
@@ -34,6 +34,6 @@ class ColorMapStyle(Style):
         self.cmap = cmap
 
     def process(self, input_eval: Evaluation) -> Evaluation:
-        df = input_eval.get_df()
+        df = input_eval.get_df_view()
         new_df = df.applymap(lambda x: get_styling(x, self.cmap))
         return Evaluation(new_df)
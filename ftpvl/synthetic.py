@@ -0,0 +1,308 @@
+""" Synthetic test results for testing and benchmarking at scale. """
+import json
+import os
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from ftpvl.fetchers import MetaJSONFetcher
+
+# boards with their family, device and package
+BOARDS = {
+    "arty": ("xc7", "a35t", "csg324-1"),
+    "basys3": ("xc7", "a35t", "cpg236-1"),
+    "nexys_video": ("xc7", "a200t", "sbg484-1"),
+    "zybo": ("xc7", "z010", "clg400-1"),
+    "icebreaker": ("ice40", "up5k", "sg48"),
+}
+
+# toolchains with the family they support and the tools they report versions of
+TOOLCHAINS = {
+    "vpr": ("xc7", ["yosys", "vpr"]),
+    "vpr-fasm2bels": ("xc7", ["yosys", "vpr"]),
+    "yosys-vivado": ("xc7", ["yosys", "vivado"]),
+    "vivado": ("xc7", ["vivado"]),
+    "nextpnr-xilinx": ("xc7", ["yosys", "nextpnr-xilinx"]),
+    "nextpnr-xilinx-fasm2bels": ("xc7", ["yosys", "nextpnr-xilinx"]),
+    "nextpnr-ice40": ("ice40", ["yosys", "nextpnr-ice40"]),
+}
+
+PROJECTS = [
+    "oneblink", "blinky", "ibex", "picorv32", "picosoc", "murax", "vexriscv",
+    "baselitex", "litex-linux", "bram-n1", "bram-n2", "bram-n3", "dram-test",
+    "hamsternz-hdmi", "fir", "sha256",
+]
+
+# clock names of the designs, each a different layout of clocks
+CLOCK_LAYOUTS = [
+    ["clk"],
+    ["sys_clk"],
+    ["clk_i"],
+    ["clk", "clk_i"],
+    ["sys_clk", "clk"],
+    ["clk", "sys_clk", "clk_i"],
+]
+
+VERSIONS = {
+    "yosys": [
+        "Yosys 0.9+932 (git sha1 2e8d6ec0b0, g++ 9.2.0 -fPIC -Os)",
+        "Yosys 0.9+2406 (git sha1 a3a1ad9d, g++ 9.3.0 -fPIC -Os)",
+        "Yosys 0.9+3558 (git sha1 c9555c9a, g++ 9.3.0 -fPIC -Os)",
+    ],
+    "vpr": [
+        "Version: 8.1.0-dev+unkown, Revision: unkown",
+        "Version: 8.1.0-dev+c4156f225, Revision: c4156f225",
+    ],
+    "vivado": ["v2017.2", "v2020.1"],
+    "nextpnr-xilinx": ["nextpnr-xilinx -- Next Generation Place and Route (git sha1 0ea8bdd)"],
+    "nextpnr-ice40": [
+        "nextpnr-ice40 -- Next Generation Place and Route (Version 4e92b9f)",
+        "nextpnr-ice40 -- Next Generation Place and Route (Version c192ba2)",
+    ],
+}
+
+RUNTIME_STAGES = ["synthesis", "packing", "placement", "routing", "fasm", "bitstream"]
+
+# resources that may be missing from a result, along with the runtime stages
+SPARSE_RESOURCES = ["BRAM", "CARRY", "PLL"]
+
+# test dates are uniformly distributed in this range, and Icebreaker tests
+# before Jul 31, 2020 report their frequency in MHz
+START_DATE = "2020-06-01"
+END_DATE = "2020-10-01"
+
+
+class SyntheticFetcher(MetaJSONFetcher):
+    """
+    Represents a seeded generator of realistic test results, for testing and
+    benchmarking processors and visualizers at scale.
+
+    Each result is a meta.json file of a project built by a toolchain for a
+    board, with resource usage, runtimes, the actual frequency of one or
+    more clocks, and the versions of the tools used. About a third of the
+    Icebreaker results are from before Jul 31, 2020, and report their
+    frequency in MHz like the legacy Icebreaker tests on Hydra.
+
+    `get_evaluation()` preprocesses the results like HydraFetcher, using the
+    mapping and clock names, without building a meta.json dict for each
+    result, so large Evaluations are generated quickly. `get_meta_jsons()`
+    returns the same results as meta.json dicts, and `write_tree()` writes
+    them to a directory tree for LocalDirectoryFetcher. The same parameters
+    and seed always generate the same results.
+
+    Parameters
+    ----------
+    num_results : int, optional
+        The number of test results, by default 1000
+    seed : int, optional
+        The seed of the random number generator, by default 0
+    num_projects : int, optional
+        The number of projects. Projects beyond the built-in list are named
+        `project<n>`. By default 10
+    boards : List[str], optional
+        The boards to generate results for, by default all of BOARDS
+    toolchains : List[str], optional
+        The toolchains to generate results for, by default all of TOOLCHAINS.
+        Each result uses a toolchain that supports the family of its board.
+    sparsity : float, optional
+        The probability that each runtime stage and each of the BRAM, CARRY
+        and PLL resources is missing from a result, by default 0.1
+    mapping : dict, optional
+        A dictionary mapping input column names to output
+        column names, if needed for remapping, by default None
+    hydra_clock_names : list, optional
+        An optional ordered list of strings used in finding
+        the actual frequency for each build result, by default None
+    compact : bool, optional
+        If True, the Evaluation is stored with compact, lossless dtypes. See
+        Fetcher. By default False
+
+    Examples
+    --------
+    >>> fetcher = SyntheticFetcher(num_results=10**6, mapping=df_mappings)
+    >>> fetcher.get_evaluation().process(pipeline)
+    """
+
+    def __init__(
+        self,
+        num_results: int = 1000,
+        seed: int = 0,
+        num_projects: int = 10,
+        boards: List[str] = None,
+        toolchains: List[str] = None,
+        sparsity: float = 0.1,
+        mapping: dict = None,
+        hydra_clock_names: list = None,
+        compact: bool = False
+    ) -> None:
+        super().__init__(
+            mapping=mapping, hydra_clock_names=hydra_clock_names, compact=compact
+        )
+        self.num_results = num_results
+        self.seed = seed
+        self.num_projects = num_projects
+        self.boards = list(BOARDS) if boards is None else boards
+        self.toolchains = list(TOOLCHAINS) if toolchains is None else toolchains
+        self.sparsity = sparsity
+
+        if num_results < 1:
+            raise ValueError("num_results must be at least 1.")
+        for board in self.boards:
+            if not any(TOOLCHAINS[x][0] == BOARDS[board][0] for x in self.toolchains):
+                raise ValueError(f"No toolchain supports board {board}.")
+
+    def _get_projects(self) -> List[str]:
+        """
+        Returns the names of the projects.
+        """
+        extra = [f"project{i}" for i in range(len(PROJECTS), self.num_projects)]
+        return (PROJECTS + extra)[:self.num_projects]
+
+    def _download(self) -> pd.DataFrame:
+        """
+        Returns a dataframe with a row for each generated result and a column
+        for each flattened meta.json key, grouped like the keys of a meta.json
+        file. Missing values are None or NaN.
+        """
+        rng = np.random.default_rng(self.seed)
+        size = self.num_results
+        columns = {}
+
+        # board and a toolchain that supports its family
+        board_ids = rng.integers(len(self.boards), size=size)
+        boards = np.array(self.boards, dtype=object)[board_ids]
+        toolchains = np.empty(size, dtype=object)
+        for board in self.boards:
+            family = BOARDS[board][0]
+            supported = np.array([x for x in self.toolchains if TOOLCHAINS[x][0] == family])
+            is_board = boards == board
+            toolchains[is_board] = supported[rng.integers(len(supported), size=is_board.sum())]
+        families, devices, packages = [
+            np.array(x, dtype=object)[board_ids] for x in zip(*[BOARDS[x] for x in self.boards])
+        ]
+
+        projects = np.array(self._get_projects())
+        project_ids = rng.integers(len(projects), size=size)
+
+        start = np.datetime64(START_DATE, "s").astype(np.int64)
+        end = np.datetime64(END_DATE, "s").astype(np.int64)
+        dates = rng.integers(start, end, size=size).astype("datetime64[s]")
+
+        columns["board"] = boards
+        columns["date"] = np.datetime_as_string(dates).astype(object)
+        columns["design"] = (
+            projects[project_ids].astype(object) + "_" + toolchains + "_"
+            + families + "_" + boards
+        )
+        columns["device"] = devices
+        columns["family"] = families
+
+        # actual frequency of each clock in the layout of the project, in MHz
+        # for legacy Icebreaker tests
+        is_legacy = (boards == "icebreaker") & (dates < np.datetime64("2020-07-31"))
+        layout_ids = rng.integers(len(CLOCK_LAYOUTS), size=len(projects))[project_ids]
+        clock_names = sorted({name for layout in CLOCK_LAYOUTS for name in layout})
+        for name in clock_names:
+            in_layout = np.array([name in layout for layout in CLOCK_LAYOUTS])[layout_ids]
+            freq = rng.uniform(20e6, 250e6, size=size)
+            freq = np.where(is_legacy, freq / 1e6, freq)
+            columns[f"max_freq.{name}.actual"] = np.where(in_layout, freq, np.nan)
+
+        columns["package"] = packages
+        columns["project"] = projects[project_ids].astype(object)
+
+        # resource usage scales with the size of the project, and is reported
+        # as strings like on Hydra
+        project_size = rng.lognormal(7, 1.5, size=len(projects))[project_ids]
+        resources = {
+            "BRAM": project_size / 500,
+            "CARRY": project_size / 20,
+            "DFF": project_size * 1.5,
+            "IOB": rng.integers(2, 100, size=size),
+            "LUT": project_size,
+            "PLL": rng.integers(0, 3, size=size),
+        }
+        for name, values in resources.items():
+            values = np.rint(values * rng.uniform(0.8, 1.2, size=size)).astype(np.int64)
+            # format each distinct value once
+            unique, inverse = np.unique(values, return_inverse=True)
+            values = unique.astype(str).astype(object)[inverse]
+            if name in SPARSE_RESOURCES:
+                values[rng.random(size) < self.sparsity] = None
+            columns[f"resources.{name}"] = values
+
+        stage_times = {
+            name: project_size / 100 * rng.uniform(0.5, 1.5, size=size)
+            for name in RUNTIME_STAGES
+        }
+        for name in ["packing", "fasm"]:
+            # stages that Vivado does not report
+            stage_times[name][np.isin(toolchains, ["vivado", "yosys-vivado"])] = np.nan
+        for name in RUNTIME_STAGES:
+            stage_times[name][rng.random(size) < self.sparsity] = np.nan
+            columns[f"runtime.{name}"] = np.round(stage_times[name], 3)
+        overhead = rng.uniform(1, 10, size=size)
+        columns["runtime.total"] = np.round(
+            np.nansum(list(stage_times.values()), axis=0) + overhead, 3
+        )
+
+        columns["toolchain"] = toolchains
+
+        tools = sorted({tool for x in self.toolchains for tool in TOOLCHAINS[x][1]})
+        for tool in tools:
+            uses_tool = np.isin(toolchains, [x for x in self.toolchains if tool in TOOLCHAINS[x][1]])
+            # later tests use later versions
+            version_ids = ((dates - dates.min()).astype(np.int64) * len(VERSIONS[tool])) // (
+                (dates.max() - dates.min()).astype(np.int64) + 1
+            )
+            versions = np.array(VERSIONS[tool], dtype=object)[version_ids]
+            columns[f"versions.{tool}"] = np.where(uses_tool, versions, None)
+
+        return pd.DataFrame(columns)
+
+    def _preprocess(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Processes the generated results from _download() and returns a Pandas
+        DataFrame.
+        """
+        return self._preprocess_flattened_df(data)
+
+    def get_meta_jsons(self) -> List[Dict]:
+        """
+        Returns the generated results as decoded meta.json files, which can be
+        used anywhere the meta.json files downloaded by HydraFetcher are used.
+        """
+        return [_unflatten(row) for row in self._download().to_dict("records")]
+
+    def write_tree(self, path: str) -> List[str]:
+        """
+        Writes each generated result to `<path>/<n>/meta.json`, where n is the
+        index of the result, and returns the paths of the files. The tree can
+        be loaded using LocalDirectoryFetcher.
+        """
+        paths = []
+        width = len(str(max(self.num_results - 1, 0)))
+        for i, meta_json in enumerate(self.get_meta_jsons()):
+            file_path = os.path.join(path, str(i).zfill(width), "meta.json")
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            with open(file_path, "w") as f:
+                json.dump(meta_json, f)
+            paths.append(file_path)
+        return paths
+
+
+def _unflatten(row: Dict[str, Any]) -> Dict:
+    """
+    Returns the nested dictionary of a flattened row, omitting missing values.
+    """
+    nested = {}
+    for key, value in row.items():
+        if value is None or (isinstance(value, float) and np.isnan(value)):
+            continue
+        parts = key.split(".")
+        current = nested
+        for part in parts[:-1]:
+            current = current.setdefault(part, {})
+        current[parts[-1]] = value
+    return nested
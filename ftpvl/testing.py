@@ -0,0 +1,392 @@
+""" Testing utilities, such as a local stand-in for the Hydra server used by HydraFetcher. """
+import gzip
+import hashlib
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import json
+import random
+import re
+import socketserver
+import threading
+import time
+from typing import Dict, List, Tuple, Union
+
+from ftpvl.mirror import HydraMirror
+from ftpvl.synthetic import SyntheticFetcher
+
+
+class _ThreadingHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class _HydraRequestHandler(BaseHTTPRequestHandler):
+    """
+    Handles requests to a HydraServer, which is stored in `server.hydra`.
+    """
+
+    # keep connections alive, like Hydra
+    protocol_version = "HTTP/1.1"
+
+    # send the headers and body of a response together, so the server does
+    # not add delays of its own to the injected latency
+    wbufsize = -1
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None: # pylint: disable=invalid-name
+        self.server.hydra._handle(self)
+
+    def log_message(self, format, *args) -> None: # pylint: disable=redefined-builtin
+        pass
+
+
+class HydraServer:
+    """
+    Represents a local HTTP server that stands in for the Hydra endpoints used
+    by HydraFetcher, so that fetchers can be tested and benchmarked offline
+    and reproducibly.
+
+    The server serves a single jobset, either replayed from a HydraMirror
+    using `from_mirror()`, or generated using `synthetic()`. It serves the
+    evals listing at `/jobset/<project>/<jobset>/evals`, paginated with
+    `page_size` evals per page and revalidated using ETags, the build info
+    at `/build/<build_num>`, and the meta.json files at
+    `/build/<build_num>/download/<product_id>/meta.json`. Responses are
+    gzip-encoded if the client accepts it.
+
+    Use `start()` or a `with` statement to run the server in a background
+    thread, and pass `base_url` to the fetcher.
+
+    Parameters
+    ----------
+    evals : List[dict]
+        The evals of the jobset in listing order, each with an `id` and a list
+        of `builds`
+    builds : Dict[int, dict]
+        The build info of each build number
+    meta_jsons : Dict[int, dict]
+        The meta.json file of each build number
+    project : str, optional
+        The project name of the jobset, by default "dusty"
+    jobset : str, optional
+        The jobset name, by default "fpga-tool-perf"
+    latency : float, optional
+        The delay in seconds before each response is sent, by default 0
+    bandwidth : float, optional
+        The maximum number of response body bytes sent per second on each
+        connection, or None for no limit, by default None
+    error_rate : float, optional
+        The probability that a request is answered with 503 Service
+        Unavailable, by default 0
+    page_size : int, optional
+        The number of evals on each page of the evals listing, by default 10
+    seed : int, optional
+        The seed used to choose which requests fail, by default None
+
+    Examples
+    --------
+    >>> with HydraServer.synthetic(num_evals=5, builds_per_eval=200, latency=0.05) as server:
+    ...     fetcher = HydraFetcher("dusty", "fpga-tool-perf", base_url=server.base_url)
+    ...     fetcher.get_evaluation()
+    ...     server.get_stats()
+    """
+
+    _BUILD_PATTERN = re.compile(r"^/build/(\d+)$")
+    _META_JSON_PATTERN = re.compile(r"^/build/(\d+)/download/([^/]+)/meta\.json$")
+
+    # size of the chunks in which bandwidth-limited bodies are sent
+    _CHUNK_SIZE = 16 * 1024
+
+    def __init__(
+        self,
+        evals: List[dict],
+        builds: Dict[int, dict],
+        meta_jsons: Dict[int, dict],
+        project: str = "dusty",
+        jobset: str = "fpga-tool-perf",
+        latency: float = 0,
+        bandwidth: float = None,
+        error_rate: float = 0,
+        page_size: int = 10,
+        seed: int = None
+    ) -> None:
+        self.evals = evals
+        self.builds = builds
+        self.meta_jsons = meta_jsons
+        self.project = project
+        self.jobset = jobset
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.error_rate = error_rate
+        self.page_size = page_size
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._server = None
+        self._thread = None
+        self.reset_stats()
+
+    @classmethod
+    def from_mirror(cls, path: str, project: str, jobset: str, **kwargs) -> 'HydraServer':
+        """
+        Returns a HydraServer that replays a jobset recorded in a HydraMirror.
+        Other keyword arguments are passed to the constructor.
+
+        Parameters
+        ----------
+        path : str
+            The directory of the mirror
+        project : str
+            The project name of the jobset
+        jobset : str
+            The jobset name
+        """
+        mirror = HydraMirror(path, project, jobset)
+        evals = mirror.get_evals_page()["evals"]
+        builds = {}
+        meta_jsons = {}
+        for eval_data in evals:
+            for build_num in eval_data["builds"]:
+                build_info = mirror.get_build(build_num)
+                if build_info is not None:
+                    builds[build_num] = build_info
+                meta_json = mirror.get_meta_json(build_num)
+                if meta_json is not None:
+                    meta_jsons[build_num] = meta_json
+        return cls(evals, builds, meta_jsons, project=project, jobset=jobset, **kwargs)
+
+    @classmethod
+    def synthetic(
+        cls,
+        num_evals: int = 10,
+        builds_per_eval: int = 20,
+        failure_rate: float = 0,
+        seed: int = 0,
+        **kwargs
+    ) -> 'HydraServer':
+        """
+        Returns a HydraServer of a generated jobset. Evals are listed newest
+        first, and the meta.json file of each successful build is generated by
+        SyntheticFetcher, with its build number added as `build_num`. Other
+        keyword arguments are passed to the constructor.
+
+        Parameters
+        ----------
+        num_evals : int, optional
+            The number of evals, by default 10
+        builds_per_eval : int, optional
+            The number of builds in each eval, by default 20
+        failure_rate : float, optional
+            The probability that a build failed and has no meta.json file, by
+            default 0
+        seed : int, optional
+            The seed used to generate the jobset, by default 0
+        """
+        rng = random.Random(seed)
+        meta_jsons = SyntheticFetcher(
+            num_results=num_evals * builds_per_eval, seed=seed
+        ).get_meta_jsons()
+        evals = []
+        builds = {}
+        for eval_id in range(num_evals, 0, -1):
+            build_nums = list(range(
+                (eval_id - 1) * builds_per_eval, eval_id * builds_per_eval
+            ))
+            evals.append({"id": eval_id, "builds": build_nums})
+        for build_num in range(num_evals * builds_per_eval):
+            failed = rng.random() < failure_rate
+            builds[build_num] = cls._create_build_info(build_num, failed)
+            meta_jsons[build_num]["build_num"] = build_num
+        meta_jsons = {
+            build_num: meta_json for build_num, meta_json in enumerate(meta_jsons)
+            if builds[build_num]["buildstatus"] == 0
+        }
+        return cls(evals, builds, meta_jsons, seed=seed, **kwargs)
+
+    @staticmethod
+    def _create_build_info(build_num: int, failed: bool) -> dict:
+        """
+        Returns the build info of a generated build.
+        """
+        build_info = {"id": build_num, "finished": 1, "buildstatus": 1 if failed else 0}
+        build_info["buildproducts"] = {} if failed else {
+            "1": {"name": "meta.json", "type": "file", "subtype": "data"}
+        }
+        return build_info
+
+    @property
+    def base_url(self) -> str:
+        """
+        The URL of the running server, such as `http://127.0.0.1:8000`.
+        """
+        if self._server is None:
+            raise RuntimeError("The HydraServer is not running.")
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self, host: str = "127.0.0.1", port: int = 0) -> 'HydraServer':
+        """
+        Starts the server in a background thread and returns it.
+
+        Parameters
+        ----------
+        host : str, optional
+            The address to listen on, by default "127.0.0.1"
+        port : int, optional
+            The port to listen on, or 0 to choose a free port, by default 0
+        """
+        self._server = _ThreadingHTTPServer((host, port), _HydraRequestHandler)
+        self._server.hydra = self
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """
+        Stops the server.
+        """
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        self._server = None
+        self._thread = None
+
+    def __enter__(self) -> 'HydraServer':
+        return self.start()
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    def get_stats(self) -> dict:
+        """
+        Returns the number of requests served since the last reset, by type:
+        `evals`, `build` and `meta_json` requests, and `not_found`. Also
+        returns the number of `errors` injected, the number of `not_modified`
+        responses, and the number of body `bytes` sent.
+        """
+        with self._lock:
+            return dict(self._stats)
+
+    def reset_stats(self) -> None:
+        """
+        Resets the request statistics to zero.
+        """
+        with self._lock:
+            self._stats = {
+                "evals": 0, "build": 0, "meta_json": 0, "not_found": 0,
+                "errors": 0, "not_modified": 0, "bytes": 0,
+            }
+
+    def _count(self, key: str, amount: int = 1) -> None:
+        with self._lock:
+            self._stats[key] += amount
+
+    def _get_evals_page(self, page: int) -> Union[dict, None]:
+        """
+        Returns the evals page with the given 1-based page number, or None if
+        it does not exist.
+        """
+        last_page = max(1, -(-len(self.evals) // self.page_size))
+        if page < 1 or page > last_page:
+            return None
+        start = (page - 1) * self.page_size
+        evals_json = {
+            "evals": self.evals[start:start + self.page_size],
+            "first": "?page=1",
+            "last": f"?page={last_page}",
+        }
+        if page > 1:
+            evals_json["previous"] = f"?page={page - 1}"
+        if page < last_page:
+            evals_json["next"] = f"?page={page + 1}"
+        return evals_json
+
+    def _route(self, path: str, query: str) -> Tuple[Union[dict, None], str]:
+        """
+        Returns the decoded body of the response to a GET request and the type
+        of the request, or None and "not_found" if there is no such resource.
+        """
+        if path == f"/jobset/{self.project}/{self.jobset}/evals":
+            match = re.search(r"page=(\d+)", query)
+            return self._get_evals_page(int(match.group(1)) if match else 1), "evals"
+
+        match = self._BUILD_PATTERN.match(path)
+        if match:
+            return self.builds.get(int(match.group(1))), "build"
+
+        match = self._META_JSON_PATTERN.match(path)
+        if match:
+            build_num = int(match.group(1))
+            products = self.builds.get(build_num, {}).get("buildproducts", {})
+            if products.get(match.group(2), {}).get("name") != "meta.json":
+                return None, "meta_json"
+            return self.meta_jsons.get(build_num), "meta_json"
+        return None, "not_found"
+
+    def _handle(self, handler: BaseHTTPRequestHandler) -> None:
+        """
+        Sends the response to a GET request, injecting latency, errors and
+        bandwidth limits.
+        """
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+        with self._lock:
+            failed = self.error_rate > 0 and self._random.random() < self.error_rate
+        if failed:
+            self._count("errors")
+            self._send(handler, 503, b"")
+            return
+
+        path, _, query = handler.path.partition("?")
+        body, request_type = self._route(path, query)
+        self._count(request_type)
+        if body is None:
+            if request_type != "not_found":
+                self._count("not_found")
+            self._send(handler, 404, b"")
+            return
+
+        data = json.dumps(body).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+        if request_type == "evals":
+            etag = '"' + hashlib.sha1(data).hexdigest() + '"'
+            headers["ETag"] = etag
+            if handler.headers.get("If-None-Match") == etag:
+                self._count("not_modified")
+                self._send(handler, 304, b"", headers)
+                return
+        if "gzip" in handler.headers.get("Accept-Encoding", ""):
+            data = gzip.compress(data)
+            headers["Content-Encoding"] = "gzip"
+        self._send(handler, 200, data, headers)
+
+    def _send(
+        self,
+        handler: BaseHTTPRequestHandler,
+        status: int,
+        data: bytes,
+        headers: dict = None
+    ) -> None:
+        """
+        Sends a response, limiting the rate at which the body is sent to
+        `bandwidth` bytes per second.
+        """
+        handler.send_response(status)
+        for key, value in (headers or {}).items():
+            handler.send_header(key, value)
+        handler.send_header("Content-Length", str(len(data)))
+        handler.end_headers()
+        if status == 304:
+            return
+
+        if self.bandwidth is None:
+            handler.wfile.write(data)
+        else:
+            for start in range(0, len(data), self._CHUNK_SIZE):
+                chunk = data[start:start + self._CHUNK_SIZE]
+                time.sleep(len(chunk) / self.bandwidth) # time to transfer the chunk
+                handler.wfile.write(chunk)
+                handler.wfile.flush()
+        self._count("bytes", len(data))
@@ -106,7 +106,7 @@ class DebugVisualizer(Visualizer):
 
     def _generate(self):
         """ Generate visualization and save in self._visualization """
-        ordered_df = self._evaluation.get_df()[self._column_order]
+        ordered_df = self._evaluation.get_df_view()[self._column_order]
 
         self._visualization = (
             ordered_df.style.set_table_styles(self._custom_styles)
@@ -203,8 +203,8 @@ class SingleTableVisualizer(Visualizer):
 
     def _generate(self):
         """ Generate visualization and save in self._visualization """
-        ordered_df = self._evaluation.get_df()[self._column_order]
-        styled_df = self._style_eval.get_df()[self._column_order]
+        ordered_df = self._evaluation.get_df_view()[self._column_order]
+        styled_df = self._style_eval.get_df_view()[self._column_order]
         self._visualization = (
             ordered_df.style.apply(lambda x: styled_df, axis=None)
             .set_table_styles(self._custom_styles)
@@ -0,0 +1,121 @@
+# pylint: disable=invalid-name
+
+""" Tests for BuildCache class """
+import os
+import tempfile
+import unittest
+
+from ftpvl.cache import BuildCache, Checkpoint
+
+
+class TestBuildCache(unittest.TestCase):
+    """
+    Testing by partition:
+        __init__(path, max_size, compression)
+            invalid compression
+        get(key), put(key, value)
+            missing key, stored key
+            no compression, gzip, lzma
+            persistence across instances
+        LRU eviction
+        get_negative(key), put_negative(key, reason)
+        clear()
+    """
+
+    def test_buildcache_invalid_compression(self):
+        """
+        Calling init with an unknown compression should raise ValueError.
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with self.assertRaises(ValueError):
+                BuildCache(tmp_dir, compression="zip")
+
+    def test_buildcache_get_put(self):
+        """
+        get() should return the value stored by put() for every compression,
+        also when read by a new instance, and None for missing keys.
+        """
+        value = {"buildstatus": 0, "buildproducts": {"5": {"name": "meta.json"}}}
+        for compression in [None, "gzip", "lzma"]:
+            with self.subTest(compression=compression):
+                with tempfile.TemporaryDirectory() as tmp_dir:
+                    cache = BuildCache(tmp_dir, compression=compression)
+                    self.assertIsNone(cache.get("build/1"))
+
+                    cache.put("build/1", value)
+                    self.assertEqual(cache.get("build/1"), value)
+                    self.assertEqual(BuildCache(tmp_dir).get("build/1"), value)
+
+    def test_buildcache_lru_eviction(self):
+        """
+        put() should evict the least recently used entries when the cache
+        exceeds max_size.
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            value = {"data": "x" * 100}
+            entry_size = len('{"data": "' + "x" * 100 + '"}')
+            cache = BuildCache(tmp_dir, max_size=entry_size * 2)
+
+            cache.put("a", value)
+            cache.put("b", value)
+            cache.get("a") # "b" is now least recently used
+            cache.put("c", value)
+
+            self.assertEqual(cache.get("a"), value)
+            self.assertIsNone(cache.get("b"))
+            self.assertEqual(cache.get("c"), value)
+            self.assertEqual(cache.get_size(), entry_size * 2)
+            self.assertEqual(len(os.listdir(os.path.join(tmp_dir, "entries"))), 2)
+
+    def test_buildcache_negative(self):
+        """
+        get_negative() should return the reason recorded by put_negative(),
+        also when read by a new instance, until the cache is cleared.
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache = BuildCache(tmp_dir)
+            self.assertIsNone(cache.get_negative("build/1"))
+
+            cache.put_negative("build/1", "failed with non-zero exit")
+            self.assertEqual(cache.get_negative("build/1"), "failed with non-zero exit")
+            self.assertEqual(
+                BuildCache(tmp_dir).get_negative("build/1"),
+                "failed with non-zero exit"
+            )
+
+            cache.put("build/2", {})
+            cache.clear()
+            self.assertIsNone(cache.get_negative("build/1"))
+            self.assertIsNone(cache.get("build/2"))
+            self.assertIsNone(BuildCache(tmp_dir).get_negative("build/1"))
+
+
+class TestCheckpoint(unittest.TestCase):
+    """
+    Testing by partition:
+        load()
+            no file, recorded results, partially written line
+        record(build_num, result)
+        remove()
+    """
+
+    def test_checkpoint_record_load(self):
+        """
+        load() should return every recorded result, ignoring a partially
+        written last line, and an empty dict after remove().
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "checkpoints", "dusty-fpga-tool-perf-1.jsonl")
+            checkpoint = Checkpoint(path)
+            self.assertEqual(checkpoint.load(), {})
+
+            checkpoint.record(0, {"build_num": 0})
+            checkpoint.record(1, None)
+            with open(path, "a") as f:
+                f.write('{"build": 2, "res') # interrupted write
+
+            self.assertEqual(Checkpoint(path).load(), {0: {"build_num": 0}, 1: None})
+
+            checkpoint.remove()
+            self.assertFalse(os.path.exists(path))
+            self.assertEqual(checkpoint.load(), {})
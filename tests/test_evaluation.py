@@ -1,6 +1,8 @@
 # pylint: disable=invalid-name
 
 """ Tests for Evaluation class """
+import os
+import tempfile
 import unittest
 
 import pandas as pd
@@ -8,6 +10,11 @@ from ftpvl.evaluation import Evaluation
 from ftpvl.processors import MinusOne
 from pandas.testing import assert_frame_equal
 
+try:
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
 
 class TestEvaluation(unittest.TestCase):
     """
@@ -15,7 +22,11 @@ class TestEvaluation(unittest.TestCase):
         __init__()
         get_df()
             defensive copying
+        get_df_view()
+            shared data, changes to the view
         get_eval_num()
+        get_index()
+            index level, column, several keys, cached
         get_copy()
         process(List[Processor])
             0, 1, 1+ processors
@@ -23,6 +34,13 @@ class TestEvaluation(unittest.TestCase):
             direct add
             reverse add
             sum
+            eval_id provenance
+        concat()
+            union of columns, eval_id provenance, named index, no Evaluations
+        compact()
+        get_memory_usage()
+        to_arrow(), from_arrow()
+        to_parquet()
     """
 
     def test_evaluation_get_df_equality(self):
@@ -48,6 +66,23 @@ class TestEvaluation(unittest.TestCase):
 
         self.assertFalse(result.equals(df))
 
+    def test_evaluation_get_df_view(self):
+        """
+        get_df_view() should share the data of the evaluation, and adding
+        columns or changing the index of the view should not change the
+        evaluation
+        """
+        df = pd.DataFrame([{"a": 1, "b": 2}, {"a": 3, "b": 4}])
+        evaluation = Evaluation(df)
+        view = evaluation.get_df_view()
+        self.assertTrue(view.equals(df))
+        self.assertTrue(view["a"].values.base is df["a"].values.base)
+
+        view["c"] = [5, 6]
+        view["a"] = [7, 8]
+        view.set_index("b", inplace=True)
+        assert_frame_equal(evaluation.get_df(), pd.DataFrame([{"a": 1, "b": 2}, {"a": 3, "b": 4}]))
+
     def test_evaluation_get_eval_id(self):
         """
         get_eval_id() should return the eval_id specified when initialized
@@ -59,6 +94,28 @@ class TestEvaluation(unittest.TestCase):
         result = Evaluation(df, eval_id=0)
         assert result.get_eval_id() == 0
 
+    def test_evaluation_get_index(self):
+        """
+        get_index() should map each value of the keys to the positions of its
+        rows, and cache the index
+        """
+        df = pd.DataFrame({
+            "project": ["ibex", "blinky", "ibex", "murax"],
+            "toolchain": ["vpr", "vpr", "vivado", "vpr"],
+            "lut": [1, 2, 3, 4],
+        }).set_index("project")
+        evaluation = Evaluation(df)
+
+        index = evaluation.get_index("project")
+        self.assertEqual(set(index), {"ibex", "blinky", "murax"})
+        self.assertEqual(index["ibex"].tolist(), [0, 2])
+        self.assertIs(evaluation.get_index("project"), index)
+
+        self.assertEqual(evaluation.get_index("toolchain")["vpr"].tolist(), [0, 1, 3])
+        index = evaluation.get_index(["project", "toolchain"])
+        self.assertEqual(index[("ibex", "vivado")].tolist(), [2])
+        self.assertNotIn(("blinky", "vivado"), index)
+
     def test_evaluation_get_copy(self):
         """
         get_copy() should return a deep copy of Evaluation
@@ -186,3 +243,115 @@ class TestEvaluation(unittest.TestCase):
 
         assert_frame_equal(sum_result.get_df(), expected)
         assert sum_result.get_eval_id() is None
+
+    def test_evaluation_add_provenance(self):
+        """
+        Adding Evaluations with eval_ids should record the eval_id of each
+        test result in a categorical eval_id column, also when adding more
+        Evaluations to the sum.
+        """
+        eval1 = Evaluation(pd.DataFrame([{"a": 1}]), eval_id=1)
+        eval2 = Evaluation(pd.DataFrame([{"a": 3}, {"a": 5}]), eval_id=2)
+        eval3 = Evaluation(pd.DataFrame([{"a": 7}]))
+
+        result = sum([eval1, eval2, eval3]).get_df()
+        self.assertEqual(list(result.columns), ["eval_id", "a"])
+        self.assertEqual(result["eval_id"].dtype, "category")
+        self.assertEqual(result["eval_id"].tolist()[:3], [1, 2, 2])
+        self.assertTrue(pd.isna(result["eval_id"].iloc[3]))
+        self.assertEqual(result["a"].tolist(), [1, 3, 5, 7])
+
+        # the sum of a single Evaluation has the same column
+        result = sum([eval1]).get_df()
+        self.assertEqual(list(result.columns), ["eval_id", "a"])
+        self.assertEqual(result["eval_id"].tolist(), [1])
+
+    def test_evaluation_concat(self):
+        """
+        concat() should concatenate the Evaluations in a single pass, with the
+        union of their columns and the eval_id of each test result, and equal
+        the result of sum().
+        """
+        eval1 = Evaluation(pd.DataFrame([{"a": 1, "b": 2}, {"a": 3, "b": 4}]), eval_id=10)
+        eval2 = Evaluation(pd.DataFrame([{"a": 5, "c": "x"}]), eval_id=11)
+        eval3 = Evaluation(pd.DataFrame([{"b": 6}]), eval_id=10)
+
+        result = Evaluation.concat([eval1, eval2, eval3])
+        expected = pd.DataFrame({
+            "eval_id": pd.Categorical([10, 10, 11, 10]),
+            "a": [1, 3, 5, None],
+            "b": [2, 4, None, 6],
+            "c": [None, None, "x", None],
+        })
+        assert_frame_equal(result.get_df(), expected)
+        self.assertIsNone(result.get_eval_id())
+        assert_frame_equal(sum([eval1, eval2, eval3]).get_df(), expected)
+
+        # concatenated evaluations keep their provenance
+        nested = Evaluation.concat([result, Evaluation(pd.DataFrame([{"a": 7}]), eval_id=12)])
+        self.assertEqual(nested.get_df()["eval_id"].tolist(), [10, 10, 11, 10, 12])
+
+        # named index levels are kept
+        indexed = [
+            Evaluation(pd.DataFrame({"a": [1]}, index=pd.Index(["x"], name="key")), eval_id=1),
+            Evaluation(pd.DataFrame({"a": [2]}, index=pd.Index(["y"], name="key")), eval_id=2),
+        ]
+        result = Evaluation.concat(indexed).get_df()
+        self.assertEqual(result.index.tolist(), ["x", "y"])
+        self.assertEqual(result.index.name, "key")
+
+        with self.assertRaises(ValueError):
+            Evaluation.concat([])
+
+    def test_evaluation_compact(self):
+        """
+        compact() should return a new Evaluation with the same values stored
+        using compact dtypes and less memory
+        """
+        df = pd.DataFrame({
+            "project": ["blinky", "blinky", "ibex", "blinky"],
+            "lut": ["24", "300", "12", "8"],
+            "freq": [12.5, 20.0, None, 40.25],
+            "version": ["0.10", "0.9", "0.9", "0.9"]
+        })
+        evaluation = Evaluation(df, eval_id=5)
+        result = evaluation.compact()
+
+        assert result.get_eval_id() == 5
+        assert str(result.get_df()["project"].dtype) == "category"
+        assert str(result.get_df()["lut"].dtype) == "int16"
+        assert str(result.get_df()["freq"].dtype) == "float32"
+        # not parsed, since "0.10" would become 0.1
+        assert str(result.get_df()["version"].dtype) == "category"
+        assert result.get_memory_usage() < evaluation.get_memory_usage()
+
+        expected = df.assign(lut=pd.Series([24, 300, 12, 8], dtype="int16"))
+        assert_frame_equal(result.get_df(), expected, check_dtype=False, check_categorical=False)
+
+        # original is not modified
+        assert_frame_equal(evaluation.get_df(), df)
+
+    @unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+    def test_evaluation_arrow_roundtrip(self):
+        """
+        from_arrow() and to_arrow() should preserve the eval_id, index levels
+        and dtypes of the Evaluation
+        """
+        df = pd.DataFrame({
+            "project": ["blinky", "blinky", "ibex"],
+            "toolchain": ["vpr", "vivado", "vpr"],
+            "lut": [10, 20, 30],
+            "freq": [12.5, None, 40.25]
+        }).set_index(["project", "toolchain"])
+        evaluation = Evaluation(df, eval_id=3).compact()
+
+        result = Evaluation.from_arrow(evaluation.to_arrow())
+        assert result.get_eval_id() == 3
+        assert_frame_equal(result.get_df(), evaluation.get_df())
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "eval.parquet")
+            Evaluation(df).to_parquet(path)
+            result = Evaluation.from_arrow(pyarrow.parquet.read_table(path))
+        assert result.get_eval_id() is None
+        assert_frame_equal(result.get_df(), df)
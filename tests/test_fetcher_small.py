@@ -1,14 +1,33 @@
 # pylint: disable=invalid-name, line-too-long
 
 """ Tests for Evaluation class """
+import asyncio
+import gzip
+import io
+import json
+import lzma
+import os
+import tarfile
+import tempfile
 import unittest
+import zipfile
 
 import pandas as pd
 import requests_mock
 
 from pandas.testing import assert_frame_equal, assert_series_equal, assert_index_equal
 
-from ftpvl.fetchers import HydraFetcher, JSONFetcher
+from ftpvl.cache import BuildCache
+from ftpvl.evaluation import Evaluation
+from ftpvl.fetchers import (
+    ArchiveFetcher, AsyncHydraFetcher, HydraFetcher, JSONFetcher, LocalDirectoryFetcher,
+    ParquetFetcher
+)
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
 
 class TestHydraFetcherSmall(unittest.TestCase):
     """
@@ -23,6 +42,23 @@ class TestHydraFetcherSmall(unittest.TestCase):
                 exclusion, renaming
             pagination
             with/without board and date information
+            max_workers
+                sequential, concurrent
+            cache
+                cold, warm, negative entries
+                evals page revalidation: modified, not modified
+            eval lookup
+                relative page jump, absolute binary search, eval index
+        get_evaluations(eval_nums)
+            relative, absolute
+            builds shared between evals
+        get_evaluation_iter(chunk_size, queue_size)
+            sequential, concurrent
+            chunk size divides / does not divide number of builds
+        retries
+            transient error, persistent error
+        checkpoint_dir
+            failed run, resumed run, meta.json failures are not checkpointed
     """
 
     def test_hydrafetcher_init(self):
@@ -454,6 +490,726 @@ class TestHydraFetcherSmall(unittest.TestCase):
             expected_series = pd.Series(expected_col, name="freq")
             assert_series_equal(result["freq"], expected_series)
 
+    def test_hydrafetcher_max_workers(self):
+        """
+        get_evaluation() should return the same Evaluation when builds are
+        downloaded concurrently, keeping the order of the builds and skipping
+        failed builds and builds without a meta.json file.
+        """
+        with requests_mock.Mocker() as m:
+            evals_url = 'https://hydra.vtr.tools/jobset/dusty/fpga-tool-perf/evals'
+            evals_json = {"evals": [{"id": 1, "builds": list(range(16))}]}
+            m.get(evals_url, json=evals_json)
+
+            build_fn = 'tests/sample_data/build.small.json'
+            with open(build_fn, "r") as f:
+                json_data = f.read()
+
+            for build_num in range(16):
+                build_url = f'https://hydra.vtr.tools/build/{build_num}'
+                if build_num == 3:
+                    # failed build
+                    m.get(build_url, json={"buildstatus": 1})
+                elif build_num == 7:
+                    # build without meta.json
+                    m.get(build_url, json={"buildstatus": 0, "buildproducts": {}})
+                else:
+                    m.get(build_url, text=json_data)
+
+                meta_url = f'https://hydra.vtr.tools/build/{build_num}/download/5/meta.json'
+                m.get(meta_url, json={"build_num": build_num})
+
+            expected_col = [x for x in range(16) if x not in (3, 7)]
+            expected = pd.DataFrame({"build_num": expected_col})
+
+            for max_workers in [1, 4]:
+                with self.subTest(max_workers=max_workers):
+                    hf = HydraFetcher(
+                        project="dusty",
+                        jobset="fpga-tool-perf",
+                        eval_num=0,
+                        max_workers=max_workers)
+                    result = hf.get_evaluation().get_df()
+                    assert_frame_equal(result, expected)
+
+            # all requests should accept gzip-encoded responses
+            for request in m.request_history:
+                self.assertIn("gzip", request.headers["Accept-Encoding"])
+
+    def test_hydrafetcher_cache(self):
+        """
+        get_evaluation() with a cache should only request each finished build
+        and meta.json file once, and should not request failed builds or builds
+        without a meta.json file again.
+        """
+        with requests_mock.Mocker() as m, tempfile.TemporaryDirectory() as tmp_dir:
+            evals_url = 'https://hydra.vtr.tools/jobset/dusty/fpga-tool-perf/evals'
+            m.get(evals_url, json={"evals": [{"id": 1, "builds": list(range(6))}]})
+
+            build_json = {
+                "buildstatus": 0,
+                "finished": 1,
+                "buildproducts": {"5": {"name": "meta.json"}}
+            }
+            for build_num in range(6):
+                build_url = f'https://hydra.vtr.tools/build/{build_num}'
+                if build_num == 0:
+                    m.get(build_url, json={"buildstatus": 1, "finished": 1})
+                elif build_num == 1:
+                    m.get(build_url, json={"buildstatus": 0, "finished": 1, "buildproducts": {}})
+                else:
+                    m.get(build_url, json=build_json)
+
+                meta_url = f'https://hydra.vtr.tools/build/{build_num}/download/5/meta.json'
+                m.get(meta_url, json={"build_num": build_num})
+
+            expected = pd.DataFrame({"build_num": [2, 3, 4, 5]})
+            for compression in [None, "lzma"]:
+                with self.subTest(compression=compression):
+                    cache = BuildCache(tmp_dir, compression=compression)
+                    cache.clear()
+
+                    m.reset_mock()
+                    hf = HydraFetcher(
+                        project="dusty",
+                        jobset="fpga-tool-perf",
+                        cache=cache)
+                    assert_frame_equal(hf.get_evaluation().get_df(), expected)
+                    self.assertEqual(m.call_count, 11) # 1 evals, 6 builds, 4 meta.json
+
+                    # new cache instance reads the same directory
+                    m.reset_mock()
+                    hf = HydraFetcher(
+                        project="dusty",
+                        jobset="fpga-tool-perf",
+                        cache=BuildCache(tmp_dir, compression=compression))
+                    assert_frame_equal(hf.get_evaluation().get_df(), expected)
+                    self.assertEqual(m.call_count, 1) # only evals
+
+    def test_hydrafetcher_cache_evals_revalidation(self):
+        """
+        get_evaluation() with a cache should revalidate the evals page using
+        the stored ETag and Last-Modified headers, and use the cached page if
+        the server responds with 304 Not Modified.
+        """
+        with requests_mock.Mocker() as m, tempfile.TemporaryDirectory() as tmp_dir:
+            evals_url = 'https://hydra.vtr.tools/jobset/dusty/fpga-tool-perf/evals'
+            etag_headers = {"ETag": '"v1"', "Last-Modified": "Fri, 17 Jul 2020 22:12:40 GMT"}
+            m.get(evals_url, [
+                {"json": {"evals": [{"id": 1, "builds": [0]}]}, "headers": etag_headers},
+                {"status_code": 304},
+                {"json": {"evals": [{"id": 2, "builds": [1]}]}, "headers": {"ETag": '"v2"'}},
+            ])
+
+            with open('tests/sample_data/build.small.json', "r") as f:
+                json_data = f.read()
+            for build_num in range(2):
+                m.get(f'https://hydra.vtr.tools/build/{build_num}', text=json_data)
+                meta_url = f'https://hydra.vtr.tools/build/{build_num}/download/5/meta.json'
+                m.get(meta_url, json={"build_num": build_num})
+
+            cache = BuildCache(tmp_dir)
+            eval_ids = []
+            for _ in range(3):
+                hf = HydraFetcher(project="dusty", jobset="fpga-tool-perf", cache=cache)
+                eval_ids.append(hf.get_evaluation().get_eval_id())
+
+            # not modified, then modified
+            self.assertEqual(eval_ids, [1, 1, 2])
+
+            evals_requests = [r for r in m.request_history if r.url == evals_url]
+            self.assertNotIn("If-None-Match", evals_requests[0].headers)
+            self.assertEqual(evals_requests[1].headers["If-None-Match"], '"v1"')
+            self.assertEqual(
+                evals_requests[1].headers["If-Modified-Since"],
+                "Fri, 17 Jul 2020 22:12:40 GMT"
+            )
+            self.assertEqual(evals_requests[2].headers["If-None-Match"], '"v1"')
+
+    def test_hydrafetcher_eval_lookup_requests(self):
+        """
+        get_evaluation() should jump straight to the page of a relative
+        eval_num, binary search the pages for an absolute eval_num, and use the
+        eval index in the cache to find an absolute eval_num again after new
+        evals were added.
+        """
+        with requests_mock.Mocker() as m, tempfile.TemporaryDirectory() as tmp_dir:
+            evals_url = 'https://hydra.vtr.tools/jobset/dusty/fpga-tool-perf/evals'
+
+            def register_pages(newest_id):
+                """ pages of 3 evals, newest first, with ids newest_id..1 """
+                ids = list(range(newest_id, 0, -1))
+                pages = [ids[i:i + 3] for i in range(0, len(ids), 3)]
+                for page_num, page_ids in enumerate(pages, start=1):
+                    page_json = {
+                        "evals": [{"id": x, "builds": [x]} for x in page_ids],
+                        "first": "?page=1",
+                        "last": f"?page={len(pages)}",
+                    }
+                    if page_num < len(pages):
+                        page_json["next"] = f"?page={page_num + 1}"
+                    url = evals_url if page_num == 1 else evals_url + f"?page={page_num}"
+                    m.get(url, json=page_json)
+
+            def count_evals_requests():
+                return len([r for r in m.request_history if r.path.endswith("/evals")])
+
+            register_pages(60) # 20 pages
+            with open('tests/sample_data/build.small.json', "r") as f:
+                json_data = f.read()
+            for build_num in range(1, 62):
+                m.get(f'https://hydra.vtr.tools/build/{build_num}', text=json_data)
+                meta_url = f'https://hydra.vtr.tools/build/{build_num}/download/5/meta.json'
+                m.get(meta_url, json={"build_num": build_num})
+
+            # relative: first page and target page only
+            hf = HydraFetcher(project="dusty", jobset="fpga-tool-perf", eval_num=50)
+            result = hf.get_evaluation()
+            self.assertEqual(result.get_eval_id(), 10)
+            self.assertEqual(count_evals_requests(), 2)
+
+            with self.assertRaises(IndexError):
+                HydraFetcher(project="dusty", jobset="fpga-tool-perf", eval_num=60).get_evaluation()
+
+            # absolute: binary search over 20 pages
+            cache = BuildCache(tmp_dir)
+            for eval_id in [60, 31, 2]:
+                with self.subTest(eval_id=eval_id):
+                    m.reset_mock()
+                    hf = HydraFetcher(
+                        project="dusty",
+                        jobset="fpga-tool-perf",
+                        eval_num=eval_id,
+                        absolute_eval_num=True,
+                        cache=cache)
+                    result = hf.get_evaluation()
+                    assert_frame_equal(result.get_df(), pd.DataFrame({"build_num": [eval_id]}))
+                    self.assertLessEqual(count_evals_requests(), 6)
+
+            with self.assertRaises(ValueError):
+                HydraFetcher(
+                    project="dusty",
+                    jobset="fpga-tool-perf",
+                    eval_num=100,
+                    absolute_eval_num=True).get_evaluation()
+
+            # eval index: two new evals shift eval 2 to a new page
+            register_pages(62)
+            m.reset_mock()
+            hf = HydraFetcher(
+                project="dusty",
+                jobset="fpga-tool-perf",
+                eval_num=2,
+                absolute_eval_num=True,
+                cache=BuildCache(tmp_dir))
+            self.assertEqual(hf.get_evaluation().get_eval_id(), 2)
+            self.assertEqual(count_evals_requests(), 2)
+
+    def test_hydrafetcher_get_evaluations(self):
+        """
+        get_evaluations() should return an Evaluation for each eval_num with
+        its eval ID set, fetching each evals page and each distinct build only
+        once.
+        """
+        with requests_mock.Mocker() as m:
+            evals_url = 'https://hydra.vtr.tools/jobset/dusty/fpga-tool-perf/evals'
+            m.get(evals_url, json={
+                "evals": [
+                    {"id": 12, "builds": [0, 1, 2]},
+                    {"id": 11, "builds": [1, 2, 3]},
+                ],
+                "next": "?page=2",
+                "last": "?page=2"
+            })
+            m.get(evals_url + "?page=2", json={
+                "evals": [{"id": 10, "builds": [2, 3, 4]}],
+                "last": "?page=2"
+            })
+
+            with open('tests/sample_data/build.small.json', "r") as f:
+                json_data = f.read()
+            for build_num in range(5):
+                m.get(f'https://hydra.vtr.tools/build/{build_num}', text=json_data)
+                meta_url = f'https://hydra.vtr.tools/build/{build_num}/download/5/meta.json'
+                m.get(meta_url, json={"build_num": build_num})
+
+            expected_builds = {12: [0, 1, 2], 11: [1, 2, 3], 10: [2, 3, 4]}
+            test_cases = [
+                (False, range(3), [12, 11, 10]),
+                (True, [10, 12], [10, 12]),
+            ]
+            for absolute_eval_num, eval_nums, expected_ids in test_cases:
+                with self.subTest(absolute_eval_num=absolute_eval_num):
+                    m.reset_mock()
+                    hf = HydraFetcher(
+                        project="dusty",
+                        jobset="fpga-tool-perf",
+                        absolute_eval_num=absolute_eval_num,
+                        max_workers=4)
+                    results = hf.get_evaluations(eval_nums)
+
+                    self.assertEqual([r.get_eval_id() for r in results], expected_ids)
+                    for result in results:
+                        expected = pd.DataFrame({"build_num": expected_builds[result.get_eval_id()]})
+                        assert_frame_equal(result.get_df(), expected)
+
+                    # every page and build is requested once
+                    urls = [r.url for r in m.request_history]
+                    self.assertEqual(len(urls), len(set(urls)))
+                    num_builds = len({b for i in expected_ids for b in expected_builds[i]})
+                    self.assertEqual(len(urls), 2 + num_builds * 2)
+
+    def test_hydrafetcher_get_evaluation_iter(self):
+        """
+        get_evaluation_iter() should yield growing partial Evaluations every
+        chunk_size successful builds, with the last one equal to the result of
+        get_evaluation().
+        """
+        with requests_mock.Mocker() as m:
+            evals_url = 'https://hydra.vtr.tools/jobset/dusty/fpga-tool-perf/evals'
+            m.get(evals_url, json={"evals": [{"id": 7, "builds": list(range(8))}]})
+
+            with open('tests/sample_data/build.small.json', "r") as f:
+                json_data = f.read()
+            for build_num in range(8):
+                build_url = f'https://hydra.vtr.tools/build/{build_num}'
+                if build_num == 2:
+                    m.get(build_url, json={"buildstatus": 1}) # skipped
+                else:
+                    m.get(build_url, text=json_data)
+                meta_url = f'https://hydra.vtr.tools/build/{build_num}/download/5/meta.json'
+                # "note" has no values in the first builds, and "lut" only
+                # appears in the last builds
+                meta_json = {"build_num": build_num, "note": None, "board": "arty"}
+                if build_num >= 5:
+                    meta_json.update({"note": "late", "lut": build_num})
+                m.get(meta_url, json=meta_json)
+
+            expected = HydraFetcher(project="dusty", jobset="fpga-tool-perf").get_evaluation()
+            self.assertEqual(list(expected.get_df().columns), ["build_num", "note", "board", "lut"])
+
+            test_cases = [
+                (1, 7, [7]),
+                (4, 1, [1, 2, 3, 4, 5, 6, 7]),
+                (4, 7, [7]),
+                (3, 3, [3, 6, 7]),
+            ]
+            for max_workers, chunk_size, expected_lengths in test_cases:
+                with self.subTest(max_workers=max_workers, chunk_size=chunk_size):
+                    hf = HydraFetcher(
+                        project="dusty",
+                        jobset="fpga-tool-perf",
+                        max_workers=max_workers)
+                    results = list(hf.get_evaluation_iter(chunk_size=chunk_size, queue_size=2))
+
+                    self.assertEqual([len(r.get_df()) for r in results], expected_lengths)
+                    self.assertTrue(all(r.get_eval_id() == 7 for r in results))
+                    assert_frame_equal(results[-1].get_df(), expected.get_df())
+                    # columns without values so far are left out of partial results
+                    if expected_lengths[0] < 4:
+                        self.assertEqual(list(results[0].get_df().columns), ["build_num", "board"])
+
+    def test_hydrafetcher_retries(self):
+        """
+        get_evaluation() should retry requests that fail with a 5xx status
+        code, and raise if the request still fails after all retries.
+        """
+        with requests_mock.Mocker() as m:
+            evals_url = 'https://hydra.vtr.tools/jobset/dusty/fpga-tool-perf/evals'
+            m.get(evals_url, [
+                {"status_code": 503},
+                {"json": {"evals": [{"id": 1, "builds": [0]}]}},
+            ])
+
+            with open('tests/sample_data/build.small.json', "r") as f:
+                json_data = f.read()
+            m.get('https://hydra.vtr.tools/build/0', [
+                {"status_code": 500},
+                {"status_code": 502},
+                {"text": json_data},
+            ])
+            meta_url = 'https://hydra.vtr.tools/build/0/download/5/meta.json'
+            m.get(meta_url, json={"build_num": 0})
+
+            hf = HydraFetcher(project="dusty", jobset="fpga-tool-perf", backoff_factor=0)
+            assert_frame_equal(hf.get_evaluation().get_df(), pd.DataFrame({"build_num": [0]}))
+            self.assertEqual(m.call_count, 6)
+
+            m.get('https://hydra.vtr.tools/build/0', status_code=500)
+            hf = HydraFetcher(project="dusty", jobset="fpga-tool-perf", retries=1, backoff_factor=0)
+            with self.assertRaises(Exception):
+                hf.get_evaluation()
+
+    def test_hydrafetcher_checkpoint(self):
+        """
+        get_evaluation() with a checkpoint_dir should only download the builds
+        that were not downloaded by a previous, failed run, and remove the
+        checkpoint once the evaluation is downloaded.
+        """
+        with requests_mock.Mocker() as m, tempfile.TemporaryDirectory() as tmp_dir:
+            evals_url = 'https://hydra.vtr.tools/jobset/dusty/fpga-tool-perf/evals'
+            m.get(evals_url, json={"evals": [{"id": 9, "builds": list(range(6))}]})
+
+            with open('tests/sample_data/build.small.json', "r") as f:
+                json_data = f.read()
+            for build_num in range(6):
+                build_url = f'https://hydra.vtr.tools/build/{build_num}'
+                if build_num == 4:
+                    m.get(build_url, status_code=500)
+                elif build_num == 1:
+                    m.get(build_url, json={"buildstatus": 1}) # skipped
+                else:
+                    m.get(build_url, text=json_data)
+                meta_url = f'https://hydra.vtr.tools/build/{build_num}/download/5/meta.json'
+                m.get(meta_url, json={"build_num": build_num})
+
+            def fetch():
+                return HydraFetcher(
+                    project="dusty",
+                    jobset="fpga-tool-perf",
+                    retries=0,
+                    checkpoint_dir=tmp_dir).get_evaluation()
+
+            with self.assertRaises(Exception):
+                fetch()
+            checkpoint_path = os.path.join(tmp_dir, "dusty-fpga-tool-perf-9.jsonl")
+            self.assertTrue(os.path.exists(checkpoint_path))
+
+            # resume with build 4 fixed
+            m.get('https://hydra.vtr.tools/build/4', text=json_data)
+            m.reset_mock()
+            result = fetch()
+
+            expected = pd.DataFrame({"build_num": [0, 2, 3, 4, 5]})
+            assert_frame_equal(result.get_df(), expected)
+            build_urls = {r.url for r in m.request_history if "/build/" in r.url}
+            self.assertEqual(build_urls, {
+                'https://hydra.vtr.tools/build/4',
+                'https://hydra.vtr.tools/build/4/download/5/meta.json',
+                'https://hydra.vtr.tools/build/5',
+                'https://hydra.vtr.tools/build/5/download/5/meta.json',
+            })
+            self.assertFalse(os.path.exists(checkpoint_path))
+
+    def test_hydrafetcher_checkpoint_transient(self):
+        """
+        Builds whose meta.json file could not be downloaded should not be
+        checkpointed, so that a later run downloads them again.
+        """
+        with requests_mock.Mocker() as m, tempfile.TemporaryDirectory() as tmp_dir:
+            evals_url = 'https://hydra.vtr.tools/jobset/dusty/fpga-tool-perf/evals'
+            m.get(evals_url, json={"evals": [{"id": 9, "builds": list(range(3))}]})
+
+            with open('tests/sample_data/build.small.json', "r") as f:
+                json_data = f.read()
+            for build_num in range(3):
+                m.get(f'https://hydra.vtr.tools/build/{build_num}', text=json_data)
+                meta_url = f'https://hydra.vtr.tools/build/{build_num}/download/5/meta.json'
+                m.get(meta_url, status_code=404)
+
+            def fetch():
+                return HydraFetcher(
+                    project="dusty",
+                    jobset="fpga-tool-perf",
+                    retries=0,
+                    checkpoint_dir=tmp_dir).get_evaluation()
+
+            with self.assertRaises(ValueError):
+                fetch()
+
+            # resume with the meta.json files available
+            for build_num in range(3):
+                meta_url = f'https://hydra.vtr.tools/build/{build_num}/download/5/meta.json'
+                m.get(meta_url, json={"build_num": build_num})
+            m.reset_mock()
+            result = fetch()
+
+            assert_frame_equal(result.get_df(), pd.DataFrame({"build_num": [0, 1, 2]}))
+            meta_urls = [r.url for r in m.request_history if r.url.endswith("meta.json")]
+            self.assertEqual(len(meta_urls), 3)
+            checkpoint_path = os.path.join(tmp_dir, "dusty-fpga-tool-perf-9.jsonl")
+            self.assertFalse(os.path.exists(checkpoint_path))
+
+
+class TestAsyncHydraFetcherSmall(unittest.TestCase):
+    """
+    Testing by partition.
+
+    AsyncHydraFetcher:
+        get_evaluation_async()
+            single fetcher, multiple fetchers at once
+        get_evaluation()
+            no running event loop, running event loop
+    """
+
+    def _setup_mocks(self, m):
+        """
+        Registers the small dataset with the request mocker, using two pages
+        of evals.
+        """
+        evals_url = 'https://hydra.vtr.tools/jobset/dusty/fpga-tool-perf/evals'
+        with open('tests/sample_data/evals.small.json', "r") as f:
+            m.get(evals_url, text=f.read())
+        with open('tests/sample_data/evals.small.2.json', "r") as f:
+            m.get(evals_url + "?page=2", text=f.read())
+
+        with open('tests/sample_data/build.small.json', "r") as f:
+            json_data = f.read()
+
+        for build_num in range(24):
+            m.get(f'https://hydra.vtr.tools/build/{build_num}', text=json_data)
+            meta_url = f'https://hydra.vtr.tools/build/{build_num}/download/5/meta.json'
+            m.get(meta_url, json={"build_num": build_num})
+
+    def test_asynchydrafetcher_get_evaluation_async(self):
+        """
+        get_evaluation_async() should return the same Evaluations as
+        HydraFetcher, even when multiple fetchers run at once.
+        """
+        with requests_mock.Mocker() as m:
+            self._setup_mocks(m)
+
+            async def fetch_all():
+                fetchers = [
+                    AsyncHydraFetcher(
+                        project="dusty",
+                        jobset="fpga-tool-perf",
+                        eval_num=eval_num,
+                        max_concurrency=3)
+                    for eval_num in range(6)
+                ]
+                return await asyncio.gather(
+                    *[fetcher.get_evaluation_async() for fetcher in fetchers]
+                )
+
+            loop = asyncio.new_event_loop()
+            try:
+                results = loop.run_until_complete(fetch_all())
+            finally:
+                loop.close()
+
+            for eval_num, result in enumerate(results):
+                with self.subTest(eval_num=eval_num):
+                    expected = pd.DataFrame({
+                        "build_num": [x for x in range(eval_num * 4, eval_num * 4 + 4)]
+                    })
+                    assert_frame_equal(result.get_df(), expected)
+                    assert result.get_eval_id() == eval_num + 1
+
+    def test_asynchydrafetcher_get_evaluation(self):
+        """
+        get_evaluation() should run the asynchronous download to completion.
+        """
+        with requests_mock.Mocker() as m:
+            self._setup_mocks(m)
+
+            hf = AsyncHydraFetcher(
+                project="dusty",
+                jobset="fpga-tool-perf",
+                eval_num=5,
+                absolute_eval_num=True)
+            result = hf.get_evaluation()
+
+            expected = pd.DataFrame({"build_num": [16, 17, 18, 19]})
+            assert_frame_equal(result.get_df(), expected)
+            assert result.get_eval_id() == 5
+
+    def test_asynchydrafetcher_get_evaluation_running_loop(self):
+        """
+        get_evaluation() should also work when an event loop is already
+        running, as in a Jupyter notebook.
+        """
+        with requests_mock.Mocker() as m:
+            self._setup_mocks(m)
+
+            hf = AsyncHydraFetcher(
+                project="dusty",
+                jobset="fpga-tool-perf",
+                eval_num=5,
+                absolute_eval_num=True)
+
+            async def notebook_cell():
+                return hf.get_evaluation()
+
+            loop = asyncio.new_event_loop()
+            try:
+                result = loop.run_until_complete(notebook_cell())
+            finally:
+                loop.close()
+
+            expected = pd.DataFrame({"build_num": [16, 17, 18, 19]})
+            assert_frame_equal(result.get_df(), expected)
+            assert result.get_eval_id() == 5
+
+
+class TestLocalDirectoryFetcherSmall(unittest.TestCase):
+    """
+    Testing by partition.
+
+    LocalDirectoryFetcher:
+        get_evaluation()
+            nested directories, undecodable files
+            max_workers
+                in process, process pool
+            mapping, legacy icebreaker
+            rescan
+                unchanged, changed, added and removed files
+            missing directory, no files
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = self.tmpdir.name
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _write_meta_json(self, subdir, payload):
+        """
+        Writes the payload to subdir/meta.json in the temporary directory and
+        returns its path.
+        """
+        path = os.path.join(self.path, subdir, "meta.json")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(payload, f)
+        return path
+
+    def test_localdirectoryfetcher_get_evaluation(self):
+        """
+        get_evaluation() should return an Evaluation of the meta.json files in
+        the directory tree, in sorted order, using the same preprocessing as
+        HydraFetcher.
+        """
+        for build_num in [3, 1, 2, 0]:
+            self._write_meta_json(f"build{build_num}/out", {
+                "build_num": build_num,
+                "date": "2020-07-30T22:12:40",
+                "board": "icebreaker" if build_num % 2 == 0 else "arty",
+                "max_freq": {"clk": {"actual": 81.05 if build_num % 2 == 0 else 2000000}}
+            })
+        with open(os.path.join(self.path, "build1", "notes.json"), "w") as f:
+            f.write("{}")
+        with open(os.path.join(self.path, "broken.json"), "w") as f:
+            f.write("{")
+        os.makedirs(os.path.join(self.path, "broken"))
+        with open(os.path.join(self.path, "broken", "meta.json"), "w") as f:
+            f.write("{")
+
+        expected = pd.DataFrame({
+            "build_num": [0, 1, 2, 3],
+            "freq": [81.05, 2.0, 81.05, 2.0]
+        })
+        for max_workers in [1, 2]:
+            with self.subTest(max_workers=max_workers):
+                fetcher = LocalDirectoryFetcher(
+                    self.path, mapping={"build_num": "build_num"}, max_workers=max_workers
+                )
+                result = fetcher.get_evaluation()
+                assert_frame_equal(result.get_df(), expected)
+                self.assertIsNone(result.get_eval_id())
+
+        with self.assertRaises(ValueError):
+            LocalDirectoryFetcher(os.path.join(self.path, "missing")).get_evaluation()
+        with self.assertRaises(ValueError):
+            LocalDirectoryFetcher(self.path, filename="*.csv").get_evaluation()
+
+    def test_localdirectoryfetcher_rescan(self):
+        """
+        Calling get_evaluation() again should only parse files that were added
+        or changed, and should exclude files that were removed.
+        """
+        paths = [self._write_meta_json(f"build{x}", {"build_num": x}) for x in range(3)]
+        fetcher = LocalDirectoryFetcher(self.path, max_workers=1)
+        assert_frame_equal(fetcher.get_evaluation().get_df(), pd.DataFrame({"build_num": [0, 1, 2]}))
+
+        # a file with the same modification time and size is not parsed again
+        stat = os.stat(paths[0])
+        self._write_meta_json("build0", {"build_num": 7})
+        os.utime(paths[0], ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        assert_frame_equal(fetcher.get_evaluation().get_df(), pd.DataFrame({"build_num": [0, 1, 2]}))
+
+        # changed, removed and added files
+        self._write_meta_json("build1", {"build_num": 10})
+        os.utime(paths[1], ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        os.remove(paths[2])
+        self._write_meta_json("build3", {"build_num": 3})
+        assert_frame_equal(fetcher.get_evaluation().get_df(), pd.DataFrame({"build_num": [0, 10, 3]}))
+
+
+class TestArchiveFetcherSmall(unittest.TestCase):
+    """
+    Testing by partition.
+
+    ArchiveFetcher:
+        get_evaluation()
+            tar, compressed tar, zip, single compressed file
+            compressed members, undecodable members, other members
+            mapping
+            no matching members
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = self.tmpdir.name
+        # (name, contents) of each member, in archive order
+        self.members = [
+            ("build0/meta.json", json.dumps({"build_num": 0, "board": "arty"}).encode()),
+            ("build1/meta.json.gz", gzip.compress(json.dumps({"build_num": 1}).encode())),
+            ("build2/meta.json.xz", lzma.compress(json.dumps({"build_num": 2}).encode())),
+            ("build3/meta.json", b"{"),
+            ("build3/log.txt", b"not json"),
+        ]
+        self.expected = pd.DataFrame({"build_num": [0, 1, 2]})
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_archivefetcher_tar(self):
+        """
+        get_evaluation() should return an Evaluation of the meta.json members
+        of a tar archive, with or without compression.
+        """
+        for mode, ext in [("w", ".tar"), ("w:gz", ".tar.gz"), ("w:bz2", ".tar.bz2")]:
+            with self.subTest(ext=ext):
+                path = os.path.join(self.path, "artifacts" + ext)
+                with tarfile.open(path, mode) as archive:
+                    for name, contents in self.members:
+                        info = tarfile.TarInfo(name)
+                        info.size = len(contents)
+                        archive.addfile(info, io.BytesIO(contents))
+
+                result = ArchiveFetcher(path, mapping={"build_num": "build_num"}).get_evaluation()
+                assert_frame_equal(result.get_df(), self.expected)
+
+    def test_archivefetcher_zip(self):
+        """
+        get_evaluation() should return an Evaluation of the meta.json members
+        of a zip archive.
+        """
+        path = os.path.join(self.path, "artifacts.zip")
+        with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            for name, contents in self.members:
+                archive.writestr(name, contents)
+
+        result = ArchiveFetcher(path).get_evaluation()
+        expected = pd.DataFrame({"build_num": [0, 1, 2], "board": ["arty", None, None]})
+        assert_frame_equal(result.get_df(), expected)
+
+        with self.assertRaises(ValueError):
+            ArchiveFetcher(path, filename="*.csv").get_evaluation()
+
+    def test_archivefetcher_compressed_file(self):
+        """
+        get_evaluation() should decompress a single meta.json file.
+        """
+        path = os.path.join(self.path, "meta.json.xz")
+        with open(path, "wb") as f:
+            f.write(self.members[2][1])
+
+        result = ArchiveFetcher(path).get_evaluation()
+        assert_frame_equal(result.get_df(), pd.DataFrame({"build_num": [2]}))
+
 
 class TestJSONFetcherSmall(unittest.TestCase):
     """
@@ -462,6 +1218,7 @@ class TestJSONFetcherSmall(unittest.TestCase):
     JSONFetcher:
         __init__(path, mapping_dict)
         get_evaluation()
+            compressed and corrupt compressed files with a mapping
     """
 
     def test_jsonfetcher_init(self):
@@ -513,4 +1270,207 @@ class TestJSONFetcherSmall(unittest.TestCase):
 
         # test exclusion
         expected_columns = pd.Index(["proj"]) # should not have other columns
-        assert_index_equal(result.columns, expected_columns)
\ No newline at end of file
+        assert_index_equal(result.columns, expected_columns)
+
+    def test_jsonfetcher_get_evaluation_mapping_compressed(self):
+        """
+        get_evaluation() should load only the mapped columns of a compressed
+        JSON file, with the same result as an uncompressed file.
+        """
+        mapping = {"project": "proj", "lut": "lut", "missing": "missing"}
+        expected = JSONFetcher(
+            'tests/sample_data/dataframe_small.json', mapping
+        ).get_evaluation().get_df()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "dataframe_small.json.gz")
+            with open('tests/sample_data/dataframe_small.json', "rb") as f_in:
+                with gzip.open(path, "wb") as f_out:
+                    f_out.write(f_in.read())
+            result = JSONFetcher(path, mapping).get_evaluation().get_df()
+
+        assert_index_equal(result.columns, pd.Index(["proj", "lut"]))
+        assert_frame_equal(result, expected)
+
+    def test_jsonfetcher_get_evaluation_mapping_dtypes(self):
+        """
+        get_evaluation() should infer the same index, dates and dtypes for the
+        mapped columns as when the whole file is read.
+        """
+        df = pd.DataFrame({
+            "date": pd.to_datetime(["2020-07-17T22:12:41", None, "2020-08-01T10:00:00"]),
+            "created_at": ["2020-07-17T22:12:41", "2020-07-18T22:12:41", None],
+            "lut": ["693", "12", None],
+            "freq": [1.0, 2.0, 3.0],
+            "board": ["arty", None, "basys3"],
+            "met": [True, False, True]
+        }, index=[2, 0, 5])
+        mapping = {col: col.upper() for col in df.columns}
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "dataframe.json")
+            df.to_json(path)
+            fetcher = JSONFetcher(path, mapping)
+            self.assertIsNotNone(fetcher._read_projected_json(path))
+            result = fetcher.get_evaluation().get_df()
+            expected = pd.read_json(path).rename(columns=mapping)
+
+        assert_frame_equal(result, expected)
+
+    def test_jsonfetcher_get_evaluation_mapping_corrupt(self):
+        """
+        get_evaluation() should raise the same error for a truncated
+        compressed JSON file with a mapping as without one.
+        """
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "dataframe_small.json.gz")
+            with open('tests/sample_data/dataframe_small.json', "rb") as f_in:
+                data = gzip.compress(f_in.read())
+            with open(path, "wb") as f_out:
+                f_out.write(data[:len(data) // 2])
+
+            fetcher = JSONFetcher(path, {"project": "proj"})
+            # the file is left to pandas instead of being projected
+            self.assertIsNone(fetcher._read_projected_json(path))
+            with self.assertRaises(EOFError) as unmapped:
+                JSONFetcher(path).get_evaluation()
+            with self.assertRaises(EOFError) as mapped:
+                fetcher.get_evaluation()
+            self.assertEqual(type(mapped.exception), type(unmapped.exception))
+
+    def test_jsonfetcher_get_evaluation_compact(self):
+        """
+        get_evaluation() should return an Evaluation with compact dtypes if
+        compact is True.
+        """
+        fetcher = JSONFetcher('tests/sample_data/dataframe_small.json', compact=True)
+        result = fetcher.get_evaluation().get_df()
+        expected = JSONFetcher('tests/sample_data/dataframe_small.json').get_evaluation().get_df()
+
+        self.assertEqual(str(result["device"].dtype), "category")
+        self.assertEqual(str(result["bram"].dtype), "int8")
+        assert_frame_equal(result, expected, check_dtype=False, check_categorical=False)
+
+    def test_jsonfetcher_lines(self):
+        """
+        get_evaluation() should read a JSON Lines file in chunks, projecting
+        each chunk using the mapping, and concatenate them in order.
+        """
+        df = pd.read_json('tests/sample_data/dataframe_small.json')
+        mapping = {"project": "proj", "lut": "lut"}
+        expected = df[["project", "lut"]].rename(columns=mapping)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "dataframe_small.jsonl.gz")
+            df.to_json(path, orient="records", lines=True)
+
+            for chunksize in [None, 1, 2, 10]:
+                fetcher = JSONFetcher(path, mapping, lines=True, chunksize=chunksize)
+                result = fetcher.get_evaluation().get_df()
+                assert_frame_equal(result, expected)
+
+            mapping = {"device": "device", "lut": "lut"}
+            fetcher = JSONFetcher(path, mapping, compact=True, lines=True, chunksize=2)
+            result = fetcher.get_evaluation().get_df()
+            self.assertEqual(str(result["device"].dtype), "category")
+            self.assertEqual(str(result["lut"].dtype), "int16")
+            assert_frame_equal(
+                result, df[["device", "lut"]], check_dtype=False, check_categorical=False
+            )
+
+    def test_jsonfetcher_get_chunk_iter(self):
+        """
+        get_chunk_iter() should yield an Evaluation for each chunk of a JSON
+        Lines file, or a single Evaluation for a JSON file.
+        """
+        df = pd.read_json('tests/sample_data/dataframe_small.json')
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "dataframe_small.jsonl")
+            df.to_json(path, orient="records", lines=True)
+
+            fetcher = JSONFetcher(path, {"project": "proj"}, lines=True, chunksize=2)
+            results = [x.get_df() for x in fetcher.get_chunk_iter()]
+
+        self.assertEqual([len(x) for x in results], [2, 2, 1])
+        assert_frame_equal(
+            pd.concat(results),
+            df[["project"]].rename(columns={"project": "proj"})
+        )
+
+        fetcher = JSONFetcher('tests/sample_data/dataframe_small.json')
+        results = list(fetcher.get_chunk_iter())
+        self.assertEqual(len(results), 1)
+        assert_frame_equal(results[0].get_df(), df)
+
+        with self.assertRaises(ValueError):
+            JSONFetcher('tests/sample_data/dataframe_small.json', chunksize=2)
+
+
+@unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+class TestParquetFetcherSmall(unittest.TestCase):
+    """
+    Testing by partition.
+
+    ParquetFetcher:
+        get_evaluation()
+            no mapping, mapping
+            no filters, string filters, tuple filters
+            index levels
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "dataframe_small.parquet")
+        self.df = pd.read_json('tests/sample_data/dataframe_small.json')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_parquetfetcher_get_evaluation(self):
+        """
+        get_evaluation() should return the Evaluation written by to_parquet(),
+        with the same eval_id, values and dtypes.
+        """
+        evaluation = Evaluation(self.df, eval_id=5).compact()
+        evaluation.to_parquet(self.path)
+
+        result = ParquetFetcher(self.path).get_evaluation()
+        self.assertEqual(result.get_eval_id(), 5)
+        assert_frame_equal(result.get_df(), evaluation.get_df())
+
+    def test_parquetfetcher_get_evaluation_mapping_filters(self):
+        """
+        get_evaluation() should only read the mapped columns and the rows that
+        match all filters, including filters on columns that are not mapped.
+        """
+        Evaluation(self.df).to_parquet(self.path)
+
+        fetcher = ParquetFetcher(
+            self.path,
+            mapping={"project": "proj", "lut": "lut"},
+            filters=["toolchain == 'vpr'", ("lut", ">", 100)]
+        )
+        result = fetcher.get_evaluation()
+
+        expected = self.df[(self.df["toolchain"] == "vpr") & (self.df["lut"] > 100)]
+        expected = expected[["project", "lut"]].rename(columns={"project": "proj"})
+        self.assertIsNone(result.get_eval_id())
+        assert_frame_equal(result.get_df(), expected)
+
+        fetcher = ParquetFetcher(self.path, filters=["toolchain in ('vivado', 'vpr-fasm2bels')"])
+        self.assertEqual(fetcher.get_evaluation().get_df()["project"].tolist(), ["ibex", "litex-linux", "oneblink"])
+
+        with self.assertRaises(ValueError):
+            ParquetFetcher(self.path, filters=["toolchain ~ 'vpr'"]).get_evaluation()
+
+    def test_parquetfetcher_get_evaluation_index(self):
+        """
+        get_evaluation() should restore the index levels of the Evaluation.
+        """
+        indexed_df = self.df.set_index(["project", "toolchain"])
+        Evaluation(indexed_df, eval_id=7).to_parquet(self.path)
+
+        result = ParquetFetcher(self.path, mapping={"lut": "lut"}).get_evaluation()
+        self.assertEqual(result.get_eval_id(), 7)
+        assert_frame_equal(result.get_df(), indexed_df[["lut"]])
@@ -11,9 +11,11 @@ class TestHelpers():
     """
     Testing by partition:
         flatten(input_dict)
+        flatten_columns(records, plan)
         get_versions(obj)
         rescale_actual_freq(freq)
         get_actual_freq(obj, hydra_clock_names)
+        compact_df(df)
         get_styling(val, cmap, val_range)
     """
 
@@ -115,7 +117,122 @@ class TestHelpers():
         }
         result = get_actual_freq(flatten(obj), ["clk", "sys_clk", "clk_i"])
         assert result == 12_000_000
-    
+
+    def test_get_actual_freq_column(self):
+        """ Test if get_actual_freq_column selects the same clock as
+        get_actual_freq for each row """
+        objs = [
+            {"max_freq": 5_000_000},
+            {"max_freq": {"clk_i": {"actual": 12_000_000}, "sys_clk": {"actual": 24_000_000}}},
+            {"max_freq": {"cl": {"actual": 36_000_000}, "longer_cl": {"actual": 48_000_000}}},
+            {"resources": {"LUT": 10}},
+        ]
+        flattened = [flatten(x) for x in objs]
+        clock_names = ["clk", "sys_clk", "clk_i"]
+
+        result = get_actual_freq_column(pd.DataFrame(flattened), clock_names)
+        expected = [get_actual_freq(x, clock_names) for x in flattened]
+        assert result.tolist()[:3] == expected[:3]
+        assert pd.isna(result[3]) and expected[3] is None
+
+        # no frequency columns
+        result = get_actual_freq_column(pd.DataFrame([{"resources.LUT": 10}]))
+        assert result is None
+
+    def test_extract(self):
+        """ Test if extract flattens only the keys selected by the plan, with
+        the same values as flatten """
+        obj = {
+            "project": "blinky",
+            "resources": {"LUT": 10, "DFF": 20},
+            "max_freq": {
+                "clk": {"actual": 12_000_000, "met": True},
+                "sys_clk": {"actual": 24_000_000, "met": False}
+            },
+            "versions": {"yosys": "0.9", "vpr": "8.0"},
+            "cmds": {"synth": "yosys -p synth"}
+        }
+        plan = get_extraction_plan(
+            ["project", "resources.LUT", "max_freq.*.actual", "versions", "date"]
+        )
+        result = extract(obj, plan)
+        expected = {
+            "project": "blinky",
+            "resources.LUT": 10,
+            "max_freq.clk.actual": 12_000_000,
+            "max_freq.sys_clk.actual": 24_000_000,
+            "versions.yosys": "0.9",
+            "versions.vpr": "8.0"
+        }
+        assert result == expected
+        flattened = flatten(obj)
+        assert all(flattened[k] == v for k, v in result.items())
+
+        # unnested values on a planned path are kept
+        result = extract({"max_freq": 5_000_000}, plan)
+        assert result == {"max_freq": 5_000_000}
+
+        # explicit keys are merged with wildcards
+        plan = get_extraction_plan(["max_freq.*.actual", "max_freq.clk.met"])
+        result = extract(obj, plan)
+        assert result == {
+            "max_freq.clk.actual": 12_000_000,
+            "max_freq.clk.met": True,
+            "max_freq.sys_clk.actual": 24_000_000
+        }
+
+    def test_flatten_columns(self):
+        """ Test if flatten_columns returns the same columns as a dataframe of
+        the flattened records """
+        records = [
+            {"project": "blinky", "max_freq": {"clk": {"actual": 12_000_000}}},
+            {"project": "picosoc", "max_freq": 5_000_000, "resources": {"LUT": 10}},
+            {},
+            {"resources": {"LUT": 20, "DFF": {}}, "max_freq": {"clk": {"actual": None}}}
+        ]
+        result = pd.DataFrame(flatten_columns(records), index=pd.RangeIndex(len(records)))
+        expected = pd.DataFrame([flatten(x) for x in records])
+        pd.testing.assert_frame_equal(result, expected)
+
+        plan = get_extraction_plan(["resources.LUT", "max_freq.*.actual"])
+        result = pd.DataFrame(flatten_columns(records, plan), index=pd.RangeIndex(len(records)))
+        expected = pd.DataFrame([extract(x, plan) for x in records])
+        pd.testing.assert_frame_equal(result, expected[result.columns])
+        assert sorted(result.columns) == sorted(expected.columns)
+
+        # records without any planned keys have no columns
+        assert flatten_columns([{"a": 1}, {"b": {"c": 2}}], get_extraction_plan(["d"])) == {}
+
+    def test_compact_df(self):
+        """ Test if compact_df stores each column with the smallest lossless
+        dtype """
+        df = pd.DataFrame({
+            "toolchain": ["vpr", "vpr", "vivado", "vpr"],
+            "device": ["a35t", "b", "c", "d"],
+            "lut": ["24", None, "12", "8"],
+            "dff": [1, 2, 3, 100_000],
+            "freq": [81.05, 12.0, 13.0, 14.0],
+            "total": [1.5, 2.0, 2.5, None],
+            "met": [True, False, True, True],
+            "id": ["024", "1", "2", "3"]
+        })
+        result = compact_df(df)
+
+        assert str(result["toolchain"].dtype) == "category"
+        assert result["device"].dtype == object # too many unique values
+        assert result["lut"].dtype == "float32" # missing values are NaN
+        assert result["dff"].dtype == "int32"
+        assert result["freq"].dtype == "float64" # 81.05 is not a float32
+        assert result["total"].dtype == "float32"
+        assert result["met"].dtype == bool
+        assert result["id"].dtype == object # "024" is not written as 24
+        assert result["lut"].tolist()[::2] == [24, 12]
+        assert pd.isna(result["lut"][1])
+        assert result["freq"].tolist() == df["freq"].tolist()
+
+        result = compact_df(pd.DataFrame())
+        assert result.empty
+
     def test_get_styling(self):
         """ Test if get_styling correctly queries colormap and returns correct
         CSS string """
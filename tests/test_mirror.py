@@ -0,0 +1,164 @@
+# pylint: disable=invalid-name
+
+""" Tests for HydraMirror """
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+import requests_mock
+from pandas.testing import assert_frame_equal
+
+from ftpvl.fetchers import HydraFetcher
+from ftpvl.mirror import HydraMirror, main
+
+
+class TestHydraMirror(unittest.TestCase):
+    """
+    Testing by partition:
+        sync()
+            first sync, incremental sync, max_evals
+            gaps left by max_evals in later syncs
+            unfinished and unavailable builds
+        HydraFetcher(mirror)
+            relative and absolute eval_num, get_evaluations()
+            builds missing from the mirror
+        main()
+    """
+
+    evals_url = 'https://hydra.vtr.tools/jobset/dusty/fpga-tool-perf/evals'
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = self.tmpdir.name
+        with open('tests/sample_data/build.small.json', "r") as f:
+            self.build_json = f.read()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _setup_mocks(self, m, eval_ids):
+        """
+        Registers a listing of the evals, newest first with two evals per
+        page, where eval i has builds 2i and 2i + 1.
+        """
+        eval_ids = sorted(eval_ids, reverse=True)
+        last_page = (len(eval_ids) + 1) // 2
+        for page in range(1, last_page + 1):
+            evals = [
+                {"id": eval_id, "builds": [2 * eval_id, 2 * eval_id + 1]}
+                for eval_id in eval_ids[2 * (page - 1):2 * page]
+            ]
+            params = "" if page == 1 else f"?page={page}"
+            m.get(self.evals_url + params, json={"evals": evals, "last": f"?page={last_page}"})
+
+        for eval_id in eval_ids:
+            for build_num in [2 * eval_id, 2 * eval_id + 1]:
+                m.get(f'https://hydra.vtr.tools/build/{build_num}', text=self.build_json)
+                meta_url = f'https://hydra.vtr.tools/build/{build_num}/download/5/meta.json'
+                m.get(meta_url, json={"build_num": build_num})
+
+    @staticmethod
+    def _get_build_requests(m):
+        return sorted(
+            int(x.url.split("/")[4]) for x in m.request_history
+            if "/build/" in x.url and "meta.json" not in x.url
+        )
+
+    def test_sync(self):
+        """
+        sync() should only download the evals and builds added since the
+        previous sync, and retry builds that were not mirrored.
+        """
+        mirror = HydraMirror(self.path, "dusty", "fpga-tool-perf", max_workers=2)
+        with requests_mock.Mocker() as m:
+            self._setup_mocks(m, [1, 2, 3])
+            m.get('https://hydra.vtr.tools/build/6', status_code=404)
+            m.get('https://hydra.vtr.tools/build/4', json={"finished": 0})
+            self.assertEqual(mirror.sync(max_evals=2), [3, 2])
+            self.assertEqual(self._get_build_requests(m), [4, 5, 6, 7])
+            self.assertEqual(mirror.get_eval_ids(), [3, 2])
+            self.assertIsNone(mirror.get_build(4))
+            self.assertIsNone(mirror.get_build(6))
+            self.assertEqual(mirror.get_meta_json(5), {"build_num": 5})
+
+        with requests_mock.Mocker() as m:
+            self._setup_mocks(m, [1, 2, 3, 4, 5])
+            self.assertEqual(mirror.sync(), [5, 4])
+            # builds 4 and 6 were not mirrored, so they are downloaded again
+            self.assertEqual(self._get_build_requests(m), [4, 6, 8, 9, 10, 11])
+            pages = [x.url for x in m.request_history if "/evals" in x.url]
+            self.assertEqual(len(pages), 2)
+            self.assertEqual(mirror.get_eval_ids(), [5, 4, 3, 2])
+
+            m.reset_mock()
+            self.assertEqual(mirror.sync(), [])
+            self.assertEqual(self._get_build_requests(m), [])
+
+    def test_sync_gaps(self):
+        """
+        sync() should mirror the evals skipped by a sync limited by max_evals
+        in the following syncs, keeping the listing in order.
+        """
+        mirror = HydraMirror(self.path, "dusty", "fpga-tool-perf")
+        with requests_mock.Mocker() as m:
+            self._setup_mocks(m, [1, 2])
+            self.assertEqual(mirror.sync(max_evals=1), [2])
+
+        with requests_mock.Mocker() as m:
+            self._setup_mocks(m, range(1, 8))
+            self.assertEqual(mirror.sync(max_evals=2), [7, 6])
+            self.assertEqual(mirror.get_eval_ids(), [7, 6, 2])
+
+            # the evals between 6 and 2 are mirrored before reaching eval 2
+            self.assertEqual(mirror.sync(max_evals=2), [5, 4])
+            self.assertEqual(mirror.get_eval_ids(), [7, 6, 5, 4, 2])
+
+        with requests_mock.Mocker() as m:
+            self._setup_mocks(m, range(1, 9))
+            self.assertEqual(mirror.sync(), [8, 3])
+            self.assertEqual(self._get_build_requests(m), [6, 7, 16, 17])
+            # eval 1 was left out by the first sync
+            self.assertEqual(mirror.get_eval_ids(), [8, 7, 6, 5, 4, 3, 2])
+
+            m.reset_mock()
+            self.assertEqual(mirror.sync(), [])
+            pages = [x.url for x in m.request_history if "/evals" in x.url]
+            self.assertEqual(len(pages), 1)
+
+    def test_fetcher_mirror(self):
+        """
+        A HydraFetcher with a mirror should return the same Evaluations as
+        Hydra without sending requests.
+        """
+        with requests_mock.Mocker() as m:
+            self._setup_mocks(m, [1, 2, 3])
+            HydraMirror(self.path, "dusty", "fpga-tool-perf").sync()
+            os.remove(os.path.join(self.path, "dusty", "fpga-tool-perf", "builds", "2.json"))
+            m.reset_mock()
+
+            fetcher = HydraFetcher("dusty", "fpga-tool-perf", eval_num=1, mirror=self.path)
+            result = fetcher.get_evaluation()
+            self.assertEqual(result.get_eval_id(), 2)
+            assert_frame_equal(result.get_df(), pd.DataFrame({"build_num": [4, 5]}))
+
+            fetcher = HydraFetcher(
+                "dusty", "fpga-tool-perf", absolute_eval_num=True, mirror=self.path
+            )
+            results = fetcher.get_evaluations([1, 3])
+            assert_frame_equal(results[0].get_df(), pd.DataFrame({"build_num": [3]}))
+            assert_frame_equal(results[1].get_df(), pd.DataFrame({"build_num": [6, 7]}))
+            self.assertEqual(m.call_count, 0)
+
+            with self.assertRaises(IndexError):
+                HydraFetcher("dusty", "fpga-tool-perf", eval_num=3, mirror=self.path).get_evaluation()
+
+    def test_main(self):
+        """
+        main() should sync the mirror using the command line arguments.
+        """
+        with requests_mock.Mocker() as m:
+            self._setup_mocks(m, [1, 2, 3])
+            main(["dusty", "fpga-tool-perf", self.path, "--max-evals", "1"])
+        mirror = HydraMirror(self.path, "dusty", "fpga-tool-perf")
+        self.assertEqual(mirror.get_eval_ids(), [3])
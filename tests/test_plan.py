@@ -0,0 +1,275 @@
+# pylint: disable=invalid-name
+
+""" Tests for lazy processing plans """
+import unittest
+import warnings
+
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from ftpvl.evaluation import Evaluation
+from ftpvl.plan import LazyEvaluation, Plan
+from ftpvl.processors import (
+    AddNormalizedColumn, CleanDuplicates, Direction, ExpandColumn, FilterByIndex,
+    FilterByIndexValues, GeomeanAggregate, Normalize, Processor, Reindex, SortIndex,
+    StandardizeTypes
+)
+
+
+class CountingProcessor(Processor):
+    """
+    Processor that counts the rows it processes, without changing them.
+    """
+
+    def __init__(self):
+        self.rows = 0
+
+    def process(self, input_eval: Evaluation) -> Evaluation:
+        self.rows += len(input_eval.get_df_view())
+        return input_eval
+
+
+class TestPlan(unittest.TestCase):
+    """
+    Testing by partition:
+        Plan.optimize(), Plan.explain()
+            merged casts, compatible and conflicting
+            dedupe before cast, disjoint and overlapping columns
+            filter pushdown, through commuting processors and up to barriers
+            FilterByIndex on columns, dropped levels and single indexes
+            FilterByIndexValues moved ahead
+        Evaluation.process(lazy=True)
+            same result as eager processing
+            filter pushed below deduplication with tied sort values
+            chained lazy processing, runs once
+            unknown processors
+    """
+
+    def setUp(self):
+        self.df = pd.DataFrame(
+            [
+                {"project": "ibex", "toolchain": "vpr", "freq": "50.0", "lut": "100"},
+                {"project": "ibex", "toolchain": "vpr", "freq": "60.0", "lut": "90"},
+                {"project": "ibex", "toolchain": "yosys-vivado", "freq": "80.0", "lut": "80"},
+                {"project": "blinky", "toolchain": "vpr", "freq": "150.0", "lut": "10"},
+                {"project": "blinky", "toolchain": "yosys-vivado", "freq": "200.0", "lut": "8"},
+                {"project": "murax", "toolchain": "vpr", "freq": "70.0", "lut": "300"},
+            ]
+        )
+        self.toolchain_map = {"vpr": ["yosys", "vpr"], "yosys-vivado": ["yosys", "vivado"]}
+
+    def test_plan_merge_casts(self):
+        """
+        Adjacent casts should be merged unless they cast a column to different
+        types.
+        """
+        plan = Plan([StandardizeTypes({"freq": float}), StandardizeTypes({"lut": int})])
+        steps = plan.optimize()
+        self.assertEqual(len(steps), 1)
+        self.assertEqual(steps[0].types, {"freq": float, "lut": int})
+
+        plan = Plan([StandardizeTypes({"freq": float}), StandardizeTypes({"freq": int})])
+        self.assertEqual(len(plan.optimize()), 2)
+
+    def test_plan_dedupe_before_cast(self):
+        """
+        Duplicates should be removed before a cast that does not change the
+        columns used to find them.
+        """
+        cast = StandardizeTypes({"lut": int})
+        dedupe = CleanDuplicates(["project", "toolchain"])
+        self.assertEqual(Plan([cast, dedupe]).optimize(), [dedupe, cast])
+
+        dedupe = CleanDuplicates(["project", "toolchain"], ["lut"])
+        self.assertEqual(Plan([cast, dedupe]).optimize(), [cast, dedupe])
+
+    def test_plan_filter_pushdown(self):
+        """
+        A filter should select its rows ahead of the processors that give the
+        same rows either way, and stop at processors that depend on every row
+        or add columns by applying a function to groups or rows.
+        """
+        pipeline = [
+            StandardizeTypes({"freq": float}),
+            CleanDuplicates(["project", "toolchain"], ["freq"]),
+            Reindex(["project", "toolchain"]),
+            SortIndex(["project"]),
+            FilterByIndex("project", "ibex"),
+        ]
+        self.assertEqual(Plan(pipeline).explain().splitlines(), [
+            "SelectRows('project', 'ibex')",
+            "StandardizeTypes",
+            "CleanDuplicates",
+            "Reindex",
+            "SortIndex",
+            "FilterByIndex",
+        ])
+
+        # the normalized column is only added if there are selected rows
+        pipeline.insert(2, AddNormalizedColumn("project", "freq", "normalized_freq"))
+        self.assertEqual(
+            Plan(pipeline).explain().splitlines()[:4],
+            ["StandardizeTypes", "CleanDuplicates", "AddNormalizedColumn",
+             "SelectRows('project', 'ibex')"]
+        )
+        eval1 = Evaluation(self.df, eval_id=3)
+        pipeline[-1] = FilterByIndexValues({"project": ["missing"]})
+        result = eval1.process(pipeline, lazy=True).get_df()
+        expected = eval1.process(pipeline).get_df()
+        self.assertEqual(len(result), 0)
+        self.assertEqual(list(result.columns), list(expected.columns))
+
+        pipeline = [Normalize({"freq": Direction.MAXIMIZE}), FilterByIndex("project", "ibex")]
+        self.assertEqual(Plan(pipeline).optimize(), pipeline)
+
+    def test_plan_filterbyindex_not_level(self):
+        """
+        A FilterByIndex should only select its rows early if its name is a
+        level of the MultiIndex it filters, so lazy processing gives the same
+        result or error as eager processing.
+        """
+        eval1 = Evaluation(self.df, eval_id=3)
+        pipelines = [
+            # the name is a column, not an index level
+            [StandardizeTypes({"freq": float}), FilterByIndex("project", "ibex")],
+            [StandardizeTypes({"freq": float}), Reindex(["toolchain", "lut"]),
+             FilterByIndex("project", "ibex")],
+            # the level was dropped by the first filter, so only the first
+            # filter selects early
+            [Reindex(["project", "toolchain"]), FilterByIndex("project", "ibex"),
+             StandardizeTypes({"freq": float}), FilterByIndex("project", "ibex")],
+            # a single index is filtered regardless of its name
+            [Reindex(["project"]), StandardizeTypes({"freq": float}),
+             FilterByIndex("project", "missing")],
+            [Reindex(["project"]), StandardizeTypes({"freq": float}),
+             FilterByIndex("project", "ibex")],
+        ]
+        for pipeline in pipelines:
+            with self.subTest(pipeline=Plan(pipeline).explain()):
+                self.assertEqual(
+                    Plan(pipeline).explain().count("SelectRows"),
+                    1 if pipeline is pipelines[2] else 0
+                )
+                try:
+                    expected = eval1.process(pipeline).get_df()
+                except KeyError:
+                    with self.assertRaises(KeyError):
+                        eval1.process(pipeline, lazy=True).get_df()
+                else:
+                    assert_frame_equal(eval1.process(pipeline, lazy=True).get_df(), expected)
+
+    def test_plan_filterbyindexvalues(self):
+        """
+        A FilterByIndexValues should be moved ahead of the processors that
+        commute with each of its levels.
+        """
+        values_filter = FilterByIndexValues({"project": ["ibex", "murax"], "toolchain": ["vpr"]})
+        pipeline = [
+            StandardizeTypes({"freq": float}),
+            Reindex(["project", "toolchain"]),
+            SortIndex(["project"]),
+            values_filter,
+        ]
+        steps = Plan(pipeline).optimize()
+        self.assertIs(steps[0], values_filter)
+        self.assertEqual(len(steps), 4)
+
+        # toolchain is not an index level after this Reindex
+        pipeline[1] = Reindex(["project"])
+        self.assertEqual(Plan(pipeline).optimize(), [
+            pipeline[0], pipeline[1], values_filter, pipeline[2]
+        ])
+
+        eval1 = Evaluation(self.df, eval_id=3)
+        pipeline = [
+            StandardizeTypes({"freq": float}),
+            Reindex(["project", "toolchain"]),
+            SortIndex(["project"]),
+            values_filter,
+        ]
+        assert_frame_equal(
+            eval1.process(pipeline, lazy=True).get_df(), eval1.process(pipeline).get_df()
+        )
+
+    def test_process_lazy_same_result(self):
+        """
+        Lazy processing should return the same result as eager processing.
+        """
+        pipelines = [
+            [
+                StandardizeTypes({"freq": float}),
+                StandardizeTypes({"lut": int}),
+                CleanDuplicates(["project", "toolchain"], ["freq"]),
+                AddNormalizedColumn("project", "freq", "normalized_freq"),
+                ExpandColumn("toolchain", ["synthesis_tool", "pr_tool"], self.toolchain_map),
+                Reindex(["project", "synthesis_tool", "pr_tool", "toolchain"]),
+                SortIndex(["project", "synthesis_tool"]),
+                FilterByIndex("project", "ibex"),
+            ],
+            [
+                StandardizeTypes({"freq": float, "lut": float}),
+                CleanDuplicates(["project", "toolchain"]),
+                Reindex(["toolchain", "project"]),
+                FilterByIndex("toolchain", "vpr"),
+                Normalize({"freq": Direction.MAXIMIZE, "lut": Direction.MINIMIZE}),
+                GeomeanAggregate(),
+            ],
+        ]
+        eval1 = Evaluation(self.df, eval_id=3)
+        for pipeline in pipelines:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", FutureWarning)
+                expected = eval1.process(pipeline)
+                result = eval1.process(pipeline, lazy=True)
+                self.assertIsInstance(result, LazyEvaluation)
+                assert_frame_equal(result.get_df(), expected.get_df())
+            self.assertEqual(result.get_eval_id(), expected.get_eval_id())
+
+    def test_process_lazy_dedupe_ties(self):
+        """
+        Pushing a filter below CleanDuplicates should keep the same row of each
+        group when several rows have the same sort value.
+        """
+        rng = np.random.default_rng(0)
+        size = 5000
+        df = pd.DataFrame({
+            "project": rng.choice(["a", "b", "c"], size),
+            "toolchain": rng.choice(["vpr", "vivado", "nextpnr"], size),
+            "freq": rng.integers(0, 3, size),
+            "lut": np.arange(size),
+        })
+        pipeline = [
+            CleanDuplicates(["project", "toolchain"], ["freq"]),
+            Reindex(["project", "toolchain"]),
+            FilterByIndex("project", "c"),
+        ]
+        eval1 = Evaluation(df, eval_id=3)
+        self.assertEqual(Plan(pipeline).explain().splitlines()[0], "SelectRows('project', 'c')")
+        assert_frame_equal(
+            eval1.process(pipeline, lazy=True).get_df(), eval1.process(pipeline).get_df()
+        )
+
+    def test_process_lazy_runs_once(self):
+        """
+        Lazily processing a LazyEvaluation should add to its pipeline, which
+        is run once when the result is first used.
+        """
+        counter = CountingProcessor()
+        result = (
+            Evaluation(self.df, eval_id=3)
+            .process([StandardizeTypes({"freq": float}), counter], lazy=True)
+            .process([Reindex(["project", "toolchain"]), FilterByIndex("project", "blinky")],
+                     lazy=True)
+        )
+        self.assertEqual(counter.rows, 0)
+        self.assertEqual(list(result.get_df()["freq"]), [150.0, 200.0])
+        self.assertEqual(result.get_eval_id(), 3)
+        result.get_df_view()
+        # the unknown processor is a barrier, so it processes every row once
+        self.assertEqual(counter.rows, 6)
+
+        # eager processing of a LazyEvaluation processes its result
+        eager = result.process([SortIndex(["toolchain"])])
+        self.assertNotIsInstance(eager, LazyEvaluation)
+        self.assertEqual(list(eager.get_df().index), ["vpr", "yosys-vivado"])
@@ -1,6 +1,8 @@
 """ Tests for Processors """
 
+import numpy as np
 import pandas as pd
+import pytest
 from pandas.testing import (
     assert_frame_equal, assert_series_equal, assert_index_equal
 )
@@ -21,12 +23,23 @@ class TestProcessor:
     ExpandToolchain()
     Reindex()
     SortIndex()
+        unsorted, sorted by metadata, already monotonic
     NormalizeAround()
     Normalize()
+        input with columns of the output dtype is not modified, non-string
+        column names
     FilterByIndex()
+    FilterByIndexValues()
+        one and several levels, columns, missing values, scalar values
+    Sorted index
+        order kept or reset by processors, binary search matches unsorted
+        filtering
     Aggregate()
     GeomeanAggregate()
     CompareToFirst()
+
+    All processors
+        input is not modified
     """
 
     def test_minusone(self):
@@ -434,6 +447,31 @@ class TestProcessor:
         assert_frame_equal(result.get_df(), expected)
         assert result.get_eval_id() == 10
 
+    def test_normalize_input_unmodified(self):
+        """
+        Normalizing float columns, which have the same dtype as the output,
+        should not write into the input Evaluation
+        """
+        index = pd.MultiIndex.from_arrays(
+            [["a", "a", "b", "b"], ["x", "y", "x", "y"]], names=("group", "key")
+        )
+        df = pd.DataFrame({"value": [-50.0, 50.0, 100.0, 10.0]}, index=index)
+        direction = {"value": Direction.MINIMIZE}
+        for processor in [Normalize(direction), NormalizeAround(direction, "group", "key", "x")]:
+            eval1 = Evaluation(df.copy(), eval_id=10)
+            view = eval1.get_df_view()
+            result = processor.process(eval1)
+            assert_frame_equal(eval1.get_df(), df)
+            assert_frame_equal(view, df)
+            assert not np.shares_memory(
+                result.get_df_view()["value"].values, eval1.get_df_view()["value"].values
+            )
+
+        # column names do not need to be strings
+        df = pd.DataFrame({0: [1.0, -2.0], 1: [4.0, 2.0]})
+        result = Normalize({0: Direction.MINIMIZE}).process(Evaluation(df.copy()))
+        assert_frame_equal(result.get_df(), pd.DataFrame({0: [0.75, 0.0], 1: [4.0, 2.0]}))
+
     def test_normalize_negated(self):
         """
         Test whether all values are normalized
@@ -556,6 +594,125 @@ class TestProcessor:
         assert_frame_equal(result.get_df(), expected_df)
         assert result.get_eval_id() == 10
 
+    def test_filterbyindexvalues(self):
+        """ tests if filtering by sets of index values keeps matching rows in order """
+        idx_arrays = [["a", "a", "a", "b", "b", "c"], ["x", "y", "z", "x", "y", "x"]]
+        index = pd.MultiIndex.from_arrays(idx_arrays, names=("group", "key"))
+        df = pd.DataFrame({"value": [10, 5, 3, 100, 31, 7]}, index=index)
+        eval1 = Evaluation(df, eval_id=10)
+
+        result = eval1.process([FilterByIndexValues({"group": {"c", "a", "missing"}})])
+        assert_frame_equal(result.get_df(), df.iloc[[0, 1, 2, 5]])
+        assert result.get_eval_id() == 10
+
+        result = eval1.process([FilterByIndexValues({"group": ["a", "b"], "key": "x"})])
+        assert_frame_equal(result.get_df(), df.iloc[[0, 3]])
+
+        result = eval1.process([FilterByIndexValues({"group": ["missing"]})])
+        assert_frame_equal(result.get_df(), df.iloc[[]])
+
+        # columns can be used too
+        result = eval1.process([FilterByIndexValues({"value": [3, 7]})])
+        assert_frame_equal(result.get_df(), df.iloc[[2, 5]])
+
+        # a scalar is a single value, including a number
+        result = eval1.process([FilterByIndexValues({"value": 31})])
+        assert_frame_equal(result.get_df(), df.iloc[[4]])
+        int_df = df.set_index("value", append=True)
+        result = FilterByIndexValues({"value": 100, "group": "b"}).process(Evaluation(int_df))
+        assert_frame_equal(result.get_df(), int_df.iloc[[3]])
+
+        # the hash index of the input is built once
+        assert ("group" in eval1._indexes) and len(eval1.get_index("group")) == 3
+
+    def test_sortindex_skipped(self):
+        """ tests if SortIndex skips sorting an index that is already sorted """
+        idx_arrays = [["b", "a", "b", "a"], ["y", "y", "x", "x"]]
+        index = pd.MultiIndex.from_arrays(idx_arrays, names=("group", "key"))
+        df = pd.DataFrame({"value": [1, 2, 3, 4]}, index=index)
+        eval1 = Evaluation(df, eval_id=10)
+        assert eval1.get_sorted_by() == ()
+
+        result = eval1.process([SortIndex(["key"])])
+        assert result.get_sorted_by() == ("key", "group")
+        assert list(result.get_df()["value"]) == [4, 3, 2, 1]
+
+        # sorting again by the same levels returns the same data
+        again = result.process([StandardizeTypes({"value": float}), SortIndex(["key"])])
+        assert again.get_sorted_by() == ("key", "group")
+        assert list(again.get_df()["value"]) == [4.0, 3.0, 2.0, 1.0]
+        resorted = SortIndex(["key", "group"]).process(result)
+        assert np.shares_memory(
+            resorted.get_df_view()["value"].values, result.get_df_view()["value"].values
+        )
+
+        # a monotonic index is sorted without metadata
+        sorted_df = df.sort_index()
+        result = SortIndex(["group"]).process(Evaluation(sorted_df))
+        assert_frame_equal(result.get_df(), sorted_df)
+        assert result.get_sorted_by() == ("group", "key")
+
+    def test_sorted_index_order(self):
+        """ tests if processors keep or reset the order of a sorted index """
+        idx_arrays = [["a", "a", "b", "b"], ["x", "y", "x", "y"]]
+        index = pd.MultiIndex.from_arrays(idx_arrays, names=("group", "key"))
+        df = pd.DataFrame({"value": [1.0, 2.0, 3.0, 4.0]}, index=index)
+        eval1 = SortIndex(["group"]).process(Evaluation(df))
+        assert eval1.is_index_unique()
+
+        kept = eval1.process([
+            MinusOne(), StandardizeTypes({"value": float}), Normalize({"value": Direction.MAXIMIZE})
+        ])
+        assert kept.get_sorted_by() == ("group", "key")
+        assert kept.is_index_unique()
+
+        # filtering drops the filtered level from the order
+        assert eval1.process([FilterByIndex("group", "a")]).get_sorted_by() == ("key",)
+        assert eval1.process([FilterByIndex("key", "x")]).get_sorted_by() == ("group",)
+
+        # processors that build a new index reset the order
+        assert eval1.process([GeomeanAggregate()]).get_sorted_by() == ()
+        assert eval1.process([Reindex(["value"])]).get_sorted_by() == ()
+
+    def test_sorted_index_filtering(self):
+        """ tests if filtering a sorted index gives the same rows as an unsorted one """
+        idx_arrays = [
+            ["a", "a", "a", "b", "b", "c", "c"],
+            ["x", "y", "z", "x", "y", "x", "z"],
+        ]
+        index = pd.MultiIndex.from_arrays(idx_arrays, names=("group", "key"))
+        df = pd.DataFrame({"value": [10, 5, 3, 100, 31, 7, 8]}, index=index)
+        unsorted_eval = Evaluation(df, eval_id=10)
+        sorted_eval = SortIndex(["group"]).process(unsorted_eval)
+        assert sorted_eval.get_sorted_by() == ("group", "key")
+
+        for value in ["a", "b", "c"]:
+            processor = FilterByIndex("group", value)
+            result = processor.process(sorted_eval)
+            assert_frame_equal(result.get_df(), processor.process(unsorted_eval).get_df())
+            assert_frame_equal(result.get_df(), df.xs(value, level="group"))
+            assert result.get_eval_id() == 10
+
+        with pytest.raises(KeyError):
+            FilterByIndex("group", "missing").process(sorted_eval)
+
+        processor = FilterByIndexValues({"group": ["c", "a", "missing"], "key": ["x", "z"]})
+        result = processor.process(sorted_eval)
+        assert_frame_equal(result.get_df(), df.iloc[[0, 2, 5, 6]])
+        assert_frame_equal(result.get_df(), processor.process(unsorted_eval).get_df())
+        assert result.get_sorted_by() == ("group", "key")
+
+        # sorting by a name that is not an index level does not record an order
+        unnamed_eval = SortIndex(["group"]).process(Evaluation(df.reset_index()))
+        assert unnamed_eval.get_sorted_by() == ()
+        result = FilterByIndexValues({"group": ["b"]}).process(unnamed_eval)
+        assert list(result.get_df()["value"]) == [100, 31]
+
+        # a sorted single index is filtered too
+        single_eval = SortIndex(["group"]).process(Evaluation(df.reset_index("key")))
+        result = FilterByIndex("group", "b").process(single_eval)
+        assert_frame_equal(result.get_df(), df.reset_index("key").loc[["b"]])
+
     def test_aggregate(self):
         """ Test aggregate processor with custom aggregator functions """
         df = pd.DataFrame(
@@ -737,4 +894,37 @@ class TestProcessor:
             ]
         )
         assert_frame_equal(eval1.get_df(), expected_df)
-        assert eval1.get_eval_id() == 20
\ No newline at end of file
+        assert eval1.get_eval_id() == 20
+
+    def test_processors_input_unmodified(self):
+        """
+        Processors read the input through a view instead of a copy, so they
+        should not modify the input Evaluation
+        """
+        df = pd.DataFrame(
+            [
+                {"group": "a", "key": "a", "x": 1.0, "y": 8.0},
+                {"group": "a", "key": "b", "x": 4.0, "y": 8.0},
+                {"group": "b", "key": "a", "x": 2.0, "y": 4.0},
+            ]
+        )
+        indexed_df = df.set_index(["group", "key"])
+        direction = {"x": Direction.MAXIMIZE, "y": Direction.MINIMIZE}
+        cases = [
+            (df[["x", "y"]], MinusOne()),
+            (df, StandardizeTypes({"x": int})),
+            (df, CleanDuplicates(["group"], ["x"])),
+            (df, AddNormalizedColumn("group", "x", "x.norm")),
+            (df, ExpandColumn("group", ["g1"], {"a": ["c"], "b": ["d"]})),
+            (df, Reindex(["group", "key"])),
+            (df, Normalize(direction)),
+            (df, CompareToFirst(direction)),
+            (indexed_df, SortIndex(["key"])),
+            (indexed_df, NormalizeAround(direction, "group", "key", "a")),
+            (indexed_df, FilterByIndex("group", "a")),
+            (indexed_df, GeomeanAggregate()),
+        ]
+        for input_df, processor in cases:
+            input_eval = Evaluation(input_df.copy(), eval_id=1)
+            processor.process(input_eval)
+            assert_frame_equal(input_eval.get_df(), input_df)
@@ -0,0 +1,84 @@
+# pylint: disable=invalid-name
+
+""" Tests for sharing Evaluations between processes """
+import multiprocessing
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from ftpvl.evaluation import Evaluation
+from ftpvl.sharing import SharedEvaluation, read_ipc, shared_memory, write_ipc
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+def sum_shared_lut(name: str) -> int:
+    """ Worker that attaches to a SharedEvaluation and sums its lut column """
+    with SharedEvaluation.attach(name) as shared:
+        evaluation = shared.get_evaluation()
+    return int(evaluation.get_df()["lut"].sum())
+
+
+@unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+class TestSharing(unittest.TestCase):
+    """
+    Testing by partition:
+        write_ipc(), read_ipc()
+            eval_id, index levels and dtypes
+            numeric columns are not copied
+        SharedEvaluation
+            create(), attach(), get_evaluation()
+            worker processes
+    """
+
+    def setUp(self):
+        size = 10_000
+        self.df = pd.DataFrame({
+            "project": np.where(np.arange(size) % 2 == 0, "blinky", "ibex"),
+            "toolchain": pd.Categorical(np.where(np.arange(size) % 3 == 0, "vpr", "vivado")),
+            "lut": np.arange(size),
+            "freq": np.where(np.arange(size) % 7 == 0, np.nan, 12.5)
+        }).set_index("project")
+        self.evaluation = Evaluation(self.df, eval_id=12)
+
+    def test_ipc_roundtrip(self):
+        """
+        read_ipc() should return the Evaluation written by write_ipc() without
+        copying its numeric columns.
+        """
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "eval.arrow")
+            write_ipc(self.evaluation, path)
+
+            allocated = pyarrow.total_allocated_bytes()
+            result = read_ipc(path)
+            self.assertEqual(pyarrow.total_allocated_bytes(), allocated)
+
+            self.assertEqual(result.get_eval_id(), 12)
+            assert_frame_equal(result.get_df(), self.df)
+
+    @unittest.skipIf(shared_memory is None, "shared_memory is not supported")
+    def test_shared_evaluation(self):
+        """
+        SharedEvaluation.attach() should return the Evaluation shared using
+        SharedEvaluation.create(), in this process and in worker processes.
+        """
+        with SharedEvaluation.create(self.evaluation) as shared:
+            try:
+                with SharedEvaluation.attach(shared.name) as attached:
+                    result = attached.get_evaluation()
+                self.assertEqual(result.get_eval_id(), 12)
+                assert_frame_equal(result.get_df(), self.df)
+
+                with multiprocessing.Pool(2) as pool:
+                    sums = pool.map(sum_shared_lut, [shared.name] * 2)
+                self.assertEqual(sums, [int(self.df["lut"].sum())] * 2)
+            finally:
+                shared.unlink()
@@ -0,0 +1,162 @@
+# pylint: disable=invalid-name
+
+""" Tests for EvaluationStore """
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+import requests_mock
+from pandas.testing import assert_frame_equal, assert_series_equal
+
+from ftpvl.evaluation import Evaluation
+from ftpvl.fetchers import HydraFetcher
+from ftpvl.store import EvaluationStore
+
+
+class TestEvaluationStore(unittest.TestCase):
+    """
+    Testing by partition:
+        put(), get_evaluation()
+            new columns, replacing an evaluation, missing eval_id
+            reserved columns, column names that differ only in case
+        get_eval_ids(last)
+        query(eval_ids, last, columns, **filters)
+            scalar and list filters, unknown columns
+        ingest(fetcher, eval_nums)
+            absolute eval_nums already stored are not fetched
+    """
+
+    def setUp(self):
+        self.store = EvaluationStore(":memory:")
+        self.df = pd.DataFrame({
+            "project": ["blinky", "ibex", "blinky"],
+            "toolchain": ["vpr", "vpr", "vivado"],
+            "lut": [10, 20, 30],
+            "freq": [12.5, None, 40.25]
+        })
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_put_get_evaluation(self):
+        """
+        get_evaluation() should return the Evaluation stored using put(),
+        including columns added by later Evaluations.
+        """
+        self.store.put(Evaluation(self.df, eval_id=1))
+        self.store.put(Evaluation(self.df.assign(dff=[1, 2, 3]), eval_id=2))
+
+        result = self.store.get_evaluation(1)
+        self.assertEqual(result.get_eval_id(), 1)
+        assert_frame_equal(result.get_df(), self.df)
+
+        result = self.store.get_evaluation(2)
+        assert_frame_equal(result.get_df(), self.df.assign(dff=[1, 2, 3]))
+        self.assertEqual(self.store.get_columns(), ["project", "toolchain", "lut", "freq", "dff"])
+
+        # replacing an evaluation removes its old results
+        self.store.put(Evaluation(self.df.iloc[:1], eval_id=1))
+        assert_frame_equal(self.store.get_evaluation(1).get_df(), self.df.iloc[:1])
+
+        with self.assertRaises(ValueError):
+            self.store.get_evaluation(3)
+        with self.assertRaises(ValueError):
+            self.store.put(Evaluation(self.df))
+
+    def test_put_column_case(self):
+        """
+        put() should reject column names that SQLite would treat as the same
+        column, without storing the Evaluation.
+        """
+        self.store.put(Evaluation(self.df, eval_id=1))
+        bad_dfs = [
+            self.df.assign(LUT=[1, 2, 3]),
+            pd.DataFrame({"Project": ["blinky"]}),
+            pd.DataFrame({"new": [1], "NEW": [2]}),
+            pd.DataFrame({"Eval_ID": [1]}),
+        ]
+        for df in bad_dfs:
+            with self.subTest(columns=list(df.columns)):
+                with self.assertRaises(ValueError):
+                    self.store.put(Evaluation(df, eval_id=2))
+        self.assertEqual(self.store.get_eval_ids(), [1])
+        self.assertEqual(self.store.get_columns(), ["project", "toolchain", "lut", "freq"])
+
+    def test_persistence(self):
+        """
+        Evaluations should be stored in the database file.
+        """
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "history.db")
+            with EvaluationStore(path) as store:
+                store.put(Evaluation(self.df, eval_id=1))
+            with EvaluationStore(path) as store:
+                self.assertEqual(store.get_eval_ids(), [1])
+                assert_frame_equal(store.get_evaluation(1).get_df(), self.df)
+
+    def test_query(self):
+        """
+        query() should return the matching results of the selected
+        evaluations, ordered by eval_id.
+        """
+        for eval_id in [5, 3, 4, 6]:
+            self.store.put(Evaluation(self.df.assign(lut=self.df["lut"] + eval_id), eval_id))
+        self.assertEqual(self.store.get_eval_ids(), [3, 4, 5, 6])
+        self.assertEqual(self.store.get_eval_ids(last=2), [5, 6])
+
+        result = self.store.query(project="blinky", last=2, columns=["toolchain", "lut"])
+        expected = pd.DataFrame({
+            "eval_id": pd.Categorical([5, 5, 6, 6]),
+            "toolchain": ["vpr", "vivado", "vpr", "vivado"],
+            "lut": [15, 35, 16, 36]
+        })
+        assert_frame_equal(result.get_df(), expected)
+        self.assertIsNone(result.get_eval_id())
+
+        # the eval_id column is the same as that of concatenated Evaluations
+        concatenated = Evaluation.concat([self.store.get_evaluation(x) for x in [5, 6]])
+        assert_series_equal(
+            self.store.query(eval_ids=[5, 6]).get_df()["eval_id"],
+            concatenated.get_df()["eval_id"]
+        )
+
+        result = self.store.query(eval_ids=[4], toolchain=["vivado", "yosys"])
+        self.assertEqual(result.get_eval_id(), 4)
+        self.assertEqual(result.get_df()["lut"].tolist(), [34])
+
+        with self.assertRaises(ValueError):
+            self.store.query(board="arty")
+        with self.assertRaises(ValueError):
+            self.store.query(columns=["bram"])
+
+    def test_ingest(self):
+        """
+        ingest() should store the Evaluations fetched by a HydraFetcher,
+        without fetching evaluations that are already stored.
+        """
+        with requests_mock.Mocker() as m:
+            evals_url = 'https://hydra.vtr.tools/jobset/dusty/fpga-tool-perf/evals'
+            m.get(evals_url, json={
+                "evals": [{"id": 12, "builds": [0, 1]}, {"id": 11, "builds": [2]}],
+                "last": "?page=1"
+            })
+            with open('tests/sample_data/build.small.json', "r") as f:
+                json_data = f.read()
+            for build_num in range(3):
+                m.get(f'https://hydra.vtr.tools/build/{build_num}', text=json_data)
+                meta_url = f'https://hydra.vtr.tools/build/{build_num}/download/5/meta.json'
+                m.get(meta_url, json={"build_num": build_num})
+
+            fetcher = HydraFetcher("dusty", "fpga-tool-perf", absolute_eval_num=True)
+            self.assertEqual(self.store.ingest(fetcher, [11]), [11])
+            m.reset_mock()
+            self.assertEqual(self.store.ingest(fetcher, [11, 12]), [12])
+            build_urls = [x.url for x in m.request_history if "/build/" in x.url]
+            self.assertNotIn('https://hydra.vtr.tools/build/2', build_urls)
+
+        self.assertEqual(self.store.get_eval_ids(), [11, 12])
+        assert_frame_equal(
+            self.store.get_evaluation(12).get_df(),
+            pd.DataFrame({"build_num": [0, 1]})
+        )
@@ -0,0 +1,127 @@
+# pylint: disable=invalid-name
+
+""" Tests for SyntheticFetcher """
+import tempfile
+import unittest
+
+from pandas.testing import assert_frame_equal
+
+from ftpvl.fetchers import LocalDirectoryFetcher
+from ftpvl.synthetic import SyntheticFetcher
+
+
+class TestSyntheticFetcher(unittest.TestCase):
+    """
+    Testing by partition.
+
+    SyntheticFetcher:
+        __init__()
+            invalid num_results, unsupported board
+        get_evaluation()
+            same seed, different seed
+            mapping, hydra_clock_names, legacy icebreaker
+            boards, toolchains, num_projects, sparsity
+        get_meta_jsons(), write_tree()
+            matches get_evaluation()
+    """
+
+    def test_syntheticfetcher_init_invalid(self):
+        """
+        Invalid parameters should raise a ValueError.
+        """
+        with self.assertRaises(ValueError):
+            SyntheticFetcher(num_results=0)
+        with self.assertRaises(ValueError):
+            SyntheticFetcher(boards=["icebreaker"], toolchains=["vivado"])
+
+    def test_syntheticfetcher_seed(self):
+        """
+        The same seed should generate the same results, and a different seed
+        should generate different results.
+        """
+        df = SyntheticFetcher(num_results=200, seed=1).get_evaluation().get_df()
+        assert_frame_equal(df, SyntheticFetcher(num_results=200, seed=1).get_evaluation().get_df())
+        self.assertFalse(df.equals(SyntheticFetcher(num_results=200, seed=2).get_evaluation().get_df()))
+        self.assertEqual(len(df), 200)
+
+    def test_syntheticfetcher_mapping(self):
+        """
+        get_evaluation() should preprocess the results like HydraFetcher,
+        converting the frequency of each result to MHz.
+        """
+        mapping = {
+            "project": "project",
+            "toolchain": "toolchain",
+            "board": "board",
+            "date": "date",
+            "resources.LUT": "lut",
+            "resources.BRAM": "bram",
+            "runtime.total": "total_runtime",
+        }
+        fetcher = SyntheticFetcher(
+            num_results=500, mapping=mapping, hydra_clock_names=["sys_clk", "clk"]
+        )
+        df = fetcher.get_evaluation().get_df()
+        self.assertEqual(
+            list(df.columns)[:8],
+            ["project", "toolchain", "board", "date", "lut", "bram", "total_runtime", "freq"]
+        )
+        self.assertTrue(all(x.startswith("versions.") for x in df.columns[8:]))
+        self.assertTrue(df["freq"].dropna().between(20, 250).all())
+        self.assertGreater(df["freq"].notna().sum(), 0)
+        self.assertTrue(df["lut"].str.isdigit().all())
+
+        # legacy icebreaker results are reported in MHz, and others in Hz
+        raw = fetcher._download()
+        legacy = (raw["board"] == "icebreaker") & (raw["date"] < "2020-07-31")
+        self.assertGreater(legacy.sum(), 0)
+        self.assertTrue(raw.loc[legacy, "max_freq.clk.actual"].dropna().lt(1000).all())
+        self.assertTrue(raw.loc[~legacy, "max_freq.clk.actual"].dropna().gt(1e6).all())
+
+    def test_syntheticfetcher_parameters(self):
+        """
+        Results should only use the given boards, toolchains and projects,
+        and sparse resources should be missing at about the sparsity rate.
+        """
+        fetcher = SyntheticFetcher(
+            num_results=2000,
+            num_projects=20,
+            boards=["arty", "icebreaker"],
+            toolchains=["vivado", "nextpnr-ice40"],
+            sparsity=0.5
+        )
+        df = fetcher.get_evaluation().get_df()
+        self.assertEqual(set(df["board"]), {"arty", "icebreaker"})
+        self.assertEqual(
+            set(zip(df["board"], df["toolchain"])),
+            {("arty", "vivado"), ("icebreaker", "nextpnr-ice40")}
+        )
+        self.assertEqual(df["project"].nunique(), 20)
+        self.assertIn("project19", set(df["project"]))
+        self.assertAlmostEqual(df["resources.BRAM"].isna().mean(), 0.5, delta=0.05)
+        self.assertFalse(df["resources.LUT"].isna().any())
+
+        df = SyntheticFetcher(num_results=2000, sparsity=0).get_evaluation().get_df()
+        self.assertFalse(df["resources.BRAM"].isna().any())
+
+    def test_syntheticfetcher_write_tree(self):
+        """
+        The meta.json files written by write_tree() should be loaded by
+        LocalDirectoryFetcher as the same Evaluation.
+        """
+        fetcher = SyntheticFetcher(num_results=50, seed=3)
+        meta_jsons = fetcher.get_meta_jsons()
+        self.assertEqual(len(meta_jsons), 50)
+        self.assertIsInstance(meta_jsons[0]["max_freq"], dict)
+        self.assertNotIn(None, meta_jsons[0]["resources"].values())
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            paths = fetcher.write_tree(tmpdir)
+            self.assertEqual(len(paths), 50)
+            result = LocalDirectoryFetcher(tmpdir).get_evaluation().get_df()
+        expected = fetcher.get_evaluation().get_df()
+        assert_frame_equal(
+            result.reindex(columns=sorted(result.columns)),
+            expected.reindex(columns=sorted(expected.columns)),
+            check_dtype=False
+        )
@@ -0,0 +1,149 @@
+# pylint: disable=invalid-name
+
+""" Tests for the HydraServer stand-in """
+import tempfile
+import time
+import unittest
+
+import requests
+
+from ftpvl.cache import BuildCache
+from ftpvl.fetchers import HydraFetcher
+from ftpvl.mirror import HydraMirror
+from ftpvl.testing import HydraServer
+
+
+class TestHydraServer(unittest.TestCase):
+    """
+    Testing by partition:
+        synthetic(), from_mirror()
+        HydraFetcher(base_url)
+            relative and absolute eval_num, pagination, failed builds
+        evals ETag revalidation
+        latency, bandwidth, error_rate
+        latency longer than the fetcher timeout
+        missing resources
+    """
+
+    def test_synthetic_fetch(self):
+        """
+        A HydraFetcher using the server's base_url should fetch the generated
+        jobset, skipping failed builds.
+        """
+        with HydraServer.synthetic(
+            num_evals=5, builds_per_eval=4, failure_rate=0.25, page_size=2, seed=1
+        ) as server:
+            expected = [
+                build_num for build_num in range(8, 12) if build_num in server.meta_jsons
+            ]
+            fetcher = HydraFetcher(
+                "dusty", "fpga-tool-perf", eval_num=3, absolute_eval_num=True,
+                base_url=server.base_url, max_workers=4
+            )
+            result = fetcher.get_evaluation()
+            self.assertEqual(result.get_df()["build_num"].tolist(), expected)
+            self.assertEqual(result.get_eval_id(), 3)
+            self.assertTrue(result.get_df()["freq"].between(20, 250).all())
+
+            fetcher = HydraFetcher("dusty", "fpga-tool-perf", eval_num=4, base_url=server.base_url)
+            self.assertEqual(fetcher.get_evaluation().get_eval_id(), 1)
+
+            stats = server.get_stats()
+            self.assertEqual(stats["build"], 8)
+            self.assertEqual(stats["errors"], 0)
+
+            resp = requests.get(server.base_url + "/build/1000")
+            self.assertEqual(resp.status_code, 404)
+            resp = requests.get(server.base_url + "/build/0/download/2/meta.json")
+            self.assertEqual(resp.status_code, 404)
+
+    def test_etag(self):
+        """
+        The evals listing should be revalidated using its ETag.
+        """
+        with HydraServer.synthetic(num_evals=2, builds_per_eval=2) as server, \
+                tempfile.TemporaryDirectory() as tmpdir:
+            cache = BuildCache(tmpdir)
+            for _ in range(2):
+                fetcher = HydraFetcher(
+                    "dusty", "fpga-tool-perf", cache=cache, base_url=server.base_url
+                )
+                fetcher.get_evaluation()
+            stats = server.get_stats()
+            self.assertEqual(stats["evals"], 2)
+            self.assertEqual(stats["not_modified"], 1)
+            self.assertEqual(stats["build"], 2)
+
+    def test_knobs(self):
+        """
+        Latency and bandwidth should slow down responses, and errors should be
+        injected at the error rate and retried by the fetcher.
+        """
+        meta_json = {"build_num": 0, "padding": "x" * 20000}
+        server = HydraServer(
+            [{"id": 1, "builds": [0]}],
+            {0: {"finished": 1, "buildstatus": 0, "buildproducts": {"1": {"name": "meta.json"}}}},
+            {0: meta_json},
+            latency=0.05,
+            bandwidth=200000,
+        )
+        with server:
+            start = time.perf_counter()
+            resp = requests.get(
+                server.base_url + "/build/0/download/1/meta.json",
+                headers={"Accept-Encoding": "identity"}
+            )
+            self.assertGreaterEqual(time.perf_counter() - start, 0.15)
+            self.assertEqual(resp.json(), meta_json)
+
+        with HydraServer.synthetic(
+            num_evals=1, builds_per_eval=10, error_rate=0.3, seed=2
+        ) as server:
+            fetcher = HydraFetcher(
+                "dusty", "fpga-tool-perf", base_url=server.base_url,
+                retries=10, backoff_factor=0
+            )
+            self.assertEqual(len(fetcher.get_evaluation().get_df()), 10)
+            self.assertGreater(server.get_stats()["errors"], 0)
+
+    def test_timeout(self):
+        """
+        A request that takes longer than the fetcher's timeout should be
+        retried, and the timeout raised once all retries have timed out.
+        """
+        with HydraServer.synthetic(num_evals=1, builds_per_eval=2, latency=0.5) as server:
+            fetcher = HydraFetcher(
+                "dusty", "fpga-tool-perf", base_url=server.base_url,
+                retries=1, backoff_factor=0, timeout=0.1
+            )
+            start = time.perf_counter()
+            with self.assertRaises(requests.exceptions.Timeout):
+                fetcher.get_evaluation()
+            self.assertLess(time.perf_counter() - start, 0.5)
+
+            # let the server finish the requests that timed out
+            time.sleep(0.6)
+            self.assertEqual(server.get_stats()["evals"], 2)
+
+            server.latency = 0.05
+            fetcher = HydraFetcher(
+                "dusty", "fpga-tool-perf", base_url=server.base_url, timeout=0.5
+            )
+            self.assertEqual(len(fetcher.get_evaluation().get_df()), 2)
+
+    def test_from_mirror(self):
+        """
+        from_mirror() should replay a jobset recorded in a HydraMirror.
+        """
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with HydraServer.synthetic(num_evals=3, builds_per_eval=2) as server:
+                HydraMirror(tmpdir, "dusty", "fpga-tool-perf", base_url=server.base_url).sync()
+                expected = HydraFetcher(
+                    "dusty", "fpga-tool-perf", eval_num=1, base_url=server.base_url
+                ).get_evaluation().get_df()
+
+            with HydraServer.from_mirror(tmpdir, "dusty", "fpga-tool-perf", page_size=1) as server:
+                result = HydraFetcher(
+                    "dusty", "fpga-tool-perf", eval_num=1, base_url=server.base_url
+                ).get_evaluation().get_df()
+            self.assertTrue(result.equals(expected))